@@ -3,6 +3,9 @@ import json
 import pandas as pd
 from datetime import datetime
 from main import research_brella
+from dataclasses import asdict
+from tools.research_jobs import ACTIVE_STATUSES, ResearchJobs
+from tools.research_result import SECTIONS
 import os
 from dotenv import load_dotenv
 
@@ -16,6 +19,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_research_jobs():
+    """Background research jobs, shared by every session and kept across reruns"""
+    return ResearchJobs(research_brella)
+
+research_jobs = get_research_jobs()
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -76,6 +86,16 @@ with st.sidebar:
         index=0
     )
     
+    mode = st.radio(
+        "⚡ Research Mode",
+        ["full", "fast"],
+        format_func=lambda value: "Full (five agents)" if value == "full" else "Fast (one agent)",
+        horizontal=True
+    )
+    
+    refresh = st.checkbox("♻️ Force refresh", value=False,
+                          help="Ignore cached results and run the research again")
+    
     st.markdown("---")
     
     # Credentials status
@@ -91,18 +111,88 @@ with st.sidebar:
         st.warning("⚠️ Public Access Only")
         st.info("Add BRELLA_EMAIL & BRELLA_PASSWORD to .env for authenticated access")
 
+# Tab label, heading and empty message of each section
+TABS = {
+    "events": ("🎯 Events", "### 🎯 Events Information", "No events data available"),
+    "companies": ("🏢 Companies", "### 🏢 Companies Information", "No companies data available"),
+    "networking": ("🤝 Networking", "### 🤝 Networking Opportunities", "No networking data available"),
+    "founders": ("👨‍💼 Founders", "### 👨‍💼 Founders Information", "No founders data available"),
+    "attendees": ("👥 Attendees", "### 👥 Event Attendees", "No attendees data available"),
+}
+
+def record_table(records):
+    """Table rows for typed records, with their extra fields as additional columns"""
+    rows = []
+    for record in records:
+        row = {key: value for key, value in asdict(record).items() if key != "extra" and value}
+        row.update({key: value if isinstance(value, (str, int, float, bool)) else json.dumps(value)
+                    for key, value in record.extra.items()})
+        rows.append(row)
+    return rows
+
+def render_tabs(sections, pending=()):
+    """Show the parsed result sections in tabs; sections in pending are still running"""
+    tabs = st.tabs([TABS[name][0] for name in SECTIONS])
+    for tab, name in zip(tabs, SECTIONS):
+        _, heading, empty_message = TABS[name]
+        section = sections.get(name)
+        with tab:
+            st.markdown(heading)
+            if name in pending or section is None:
+                st.info("⏳ Still researching...")
+            elif section.records:
+                st.dataframe(record_table(section.records), use_container_width=True)
+                with st.expander("Raw output"):
+                    st.text(section.text)
+            elif section.status == "error":
+                st.error(section.text)
+            elif section.text:
+                st.markdown(section.text)
+            else:
+                st.info(empty_message)
+
+@st.fragment(run_every=1)
+def show_running_job(job_id):
+    """Poll a background job, filling each tab as soon as its task finishes"""
+    job = research_jobs.get(job_id)
+    snapshot = job.snapshot() if job else None
+    if snapshot is None or snapshot["status"] not in ACTIVE_STATUSES:
+        st.rerun()  # show the finished result with the full page
+    
+    params = snapshot["params"]
+    st.markdown("---")
+    if snapshot["status"] == "queued":
+        st.info(f"⏳ Waiting for a free research worker for '{params['search_term']}' ({snapshot['elapsed']}s)")
+        return
+    st.info(f"🔍 Researching '{params['search_term']}' for {params['attendee_type']}... "
+            f"{len(snapshot['sections'])}/{len(SECTIONS)} sections ready ({snapshot['elapsed']}s)")
+    render_tabs(snapshot["sections"], pending=[name for name in SECTIONS if name not in snapshot["sections"]])
+
 # Main content
+# Research runs as a background job. A rerun finds it in the session state and a
+# browser refresh through the job id in the URL.
+job = research_jobs.get(st.query_params.get("job") or st.session_state.get("job_id"))
+
 if st.button("🚀 Start Research", use_container_width=True):
     if not search_term:
         st.error("Please enter a search term")
     else:
-        with st.spinner(f"🔍 Researching '{search_term}' for {attendee_type}..."):
-            try:
-                result = research_brella(search_term, category, attendee_type)
-                st.session_state.last_result = result
-                st.success("✅ Research completed!")
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+        job = research_jobs.submit(search_term, category, attendee_type, refresh, mode)
+        st.session_state.job_id = job.id
+        st.query_params["job"] = job.id
+        st.session_state.pop('last_result', None)
+
+if job is not None:
+    snapshot = job.snapshot()
+    if snapshot["status"] in ACTIVE_STATUSES:
+        show_running_job(job.id)
+    elif st.session_state.get("shown_job") != job.id:
+        st.session_state.shown_job = job.id
+        if snapshot["status"] == "done":
+            st.session_state.last_result = snapshot["result"]
+            st.success("✅ Research completed!")
+        else:
+            st.error(f"❌ Error: {snapshot['error']}")
 
 # Results display
 if 'last_result' in st.session_state:
@@ -110,76 +200,11 @@ if 'last_result' in st.session_state:
     
     st.markdown("---")
     st.markdown("## 📋 Research Results")
+    if result.cached:
+        st.caption(f"♻️ Cached result from {result.timestamp} "
+                   f"({result.cache_age_seconds // 60} min old) - tick Force refresh to run it again")
     
-    # Create tabs for different result types
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎯 Events", "🏢 Companies", "🤝 Networking", "👨‍💼 Founders", "👥 Attendees"])
-    
-    with tab1:
-        st.markdown("### 🎯 Events Information")
-        if result.get('events') and result['events'] != 'Not available':
-            try:
-                events_data = json.loads(result['events']) if isinstance(result['events'], str) else result['events']
-                if isinstance(events_data, dict) and 'events' in events_data:
-                    events_df = pd.DataFrame(events_data['events'])
-                    st.dataframe(events_df, use_container_width=True)
-                else:
-                    st.json(events_data)
-            except:
-                st.text(result['events'])
-        else:
-            st.info("No events data available")
-    
-    with tab2:
-        st.markdown("### 🏢 Companies Information")
-        if result.get('companies') and result['companies'] != 'Not available':
-            try:
-                companies_data = json.loads(result['companies']) if isinstance(result['companies'], str) else result['companies']
-                if isinstance(companies_data, list):
-                    companies_df = pd.DataFrame(companies_data)
-                    st.dataframe(companies_df, use_container_width=True)
-                else:
-                    st.json(companies_data)
-            except:
-                st.text(result['companies'])
-        else:
-            st.info("No companies data available")
-    
-    with tab3:
-        st.markdown("### 🤝 Networking Opportunities")
-        if result.get('networking') and result['networking'] != 'Not available':
-            st.markdown(result['networking'])
-        else:
-            st.info("No networking data available")
-    
-    with tab4:
-        st.markdown("### 👨‍💼 Founders Information")
-        if result.get('founders') and result['founders'] != 'Not available':
-            try:
-                founders_data = json.loads(result['founders']) if isinstance(result['founders'], str) else result['founders']
-                if isinstance(founders_data, list) and founders_data:
-                    founders_df = pd.DataFrame(founders_data)
-                    st.dataframe(founders_df, use_container_width=True)
-                else:
-                    st.json(founders_data)
-            except:
-                st.text(result['founders'])
-        else:
-            st.info("No founders data available")
-    
-    with tab5:
-        st.markdown("### 👥 Event Attendees")
-        if result.get('attendees') and result['attendees'] != 'Not available':
-            try:
-                attendees_data = json.loads(result['attendees']) if isinstance(result['attendees'], str) else result['attendees']
-                if isinstance(attendees_data, list) and attendees_data:
-                    attendees_df = pd.DataFrame(attendees_data)
-                    st.dataframe(attendees_df, use_container_width=True)
-                else:
-                    st.json(attendees_data)
-            except:
-                st.text(result['attendees'])
-        else:
-            st.info("No attendees data available")
+    render_tabs(result.sections())
     
     # Download results
     st.markdown("---")
@@ -189,7 +214,7 @@ if 'last_result' in st.session_state:
         if st.button("📥 Download JSON", use_container_width=True):
             st.download_button(
                 label="💾 Download Results",
-                data=json.dumps(result, indent=2),
+                data=json.dumps(result.to_dict(), indent=2),
                 file_name=f"brella_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
@@ -198,14 +223,14 @@ if 'last_result' in st.session_state:
         if st.button("📊 Export to CSV", use_container_width=True):
             # Create a simplified CSV export
             csv_data = {
-                'Search Term': [result.get('search_term', '')],
-                'Category': [result.get('category', '')],
-                'Attendee Type': [result.get('attendee_type', '')],
-                'Timestamp': [result.get('timestamp', '')],
-                'Events Found': ['Yes' if result.get('events') != 'Not available' else 'No'],
-                'Companies Found': ['Yes' if result.get('companies') != 'Not available' else 'No'],
-                'Founders Found': ['Yes' if result.get('founders') != 'Not available' else 'No'],
-                'Attendees Found': ['Yes' if result.get('attendees') != 'Not available' else 'No']
+                'Search Term': [result.search_term],
+                'Category': [result.category],
+                'Attendee Type': [result.attendee_type],
+                'Timestamp': [result.timestamp],
+                'Events Found': ['Yes' if result.events.found else 'No'],
+                'Companies Found': ['Yes' if result.companies.found else 'No'],
+                'Founders Found': ['Yes' if result.founders.found else 'No'],
+                'Attendees Found': ['Yes' if result.attendees.found else 'No']
             }
             csv_df = pd.DataFrame(csv_data)
             st.download_button(
@@ -219,6 +244,8 @@ if 'last_result' in st.session_state:
         if st.button("🔄 Clear Results", use_container_width=True):
             if 'last_result' in st.session_state:
                 del st.session_state.last_result
+            st.session_state.pop('job_id', None)
+            st.query_params.clear()
             st.rerun()
 
 # Footer
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Construction cost per research row: a new BrellaResearchCrew per call vs a CrewPool.
+
+Only builds crews (no LLM calls are made), so a placeholder OPENAI_API_KEY is enough.
+
+Usage:
+    python benchmarks/bench_crew_build.py [--rows 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "placeholder")
+
+from crew import BrellaResearchCrew, CrewPool
+
+
+def build_rows(acquire, rows):
+    start = time.perf_counter()
+    for _ in range(rows):
+        acquire().crew()
+    return (time.perf_counter() - start) / rows * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark crew construction per row')
+    parser.add_argument('--rows', type=int, default=50, help='Research rows to simulate')
+    args = parser.parse_args()
+
+    BrellaResearchCrew().crew()  # warm up imports and crewai's lazy singletons
+
+    new_ms = build_rows(BrellaResearchCrew, args.rows)
+    pool = CrewPool(BrellaResearchCrew)
+    pool_ms = build_rows(pool.acquire, args.rows)
+
+    print(f"{'strategy':<26}{'per row':>12}")
+    print(f"{'new crew per row':<26}{new_ms:>10.1f}ms")
+    print(f"{'CrewPool.acquire()':<26}{pool_ms:>10.1f}ms")
+    print(f"speedup: {new_ms / pool_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Peak Python heap of process_csv for growing CSV sizes, with research stubbed out.
+
+No crews run, so a placeholder OPENAI_API_KEY is enough. Peak memory should stay
+about the same whatever the number of rows.
+
+Usage:
+    python benchmarks/bench_csv_memory.py [--rows 1000 10000 100000] [--workers 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "placeholder")
+os.environ["BRELLA_JSONL_FSYNC"] = "never"
+
+import main
+from tools.research_result import ResearchResult, parse_section
+
+
+def research(term, category, attendee_type, refresh=False, mode="full"):
+    sections = {name: parse_section(name, f"Found {name} for {term}" * 20)
+                for name in ("events", "companies", "networking", "founders", "attendees")}
+    return ResearchResult(term, category, attendee_type, **sections)
+
+
+def run(rows, workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, "rows.csv")
+        with open(csv_file, "w", encoding="utf-8") as f:
+            f.write("Search Term,Category,Attendee Type\n")
+            for i in range(rows):
+                f.write(f"Event {i},all,founders\n")
+
+        output = os.path.join(tmp, "out.json")
+        tracemalloc.start()
+        start = time.perf_counter()
+        main.process_csv(csv_file, output, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak / 1024 / 1024, elapsed
+
+
+def main_():
+    parser = argparse.ArgumentParser(description='Benchmark process_csv peak memory')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='CSV sizes to run')
+    parser.add_argument('--workers', type=int, default=8, help='Worker threads')
+    args = parser.parse_args()
+
+    main.research_brella = research
+    main.print = lambda *a, **k: None  # keep per-row progress lines out of the measurement
+
+    print(f"{'rows':>8}{'peak heap':>14}{'time':>10}")
+    for rows in args.rows:
+        peak_mb, elapsed = run(rows, args.workers)
+        print(f"{rows:>8}{peak_mb:>12.1f}MB{elapsed:>9.1f}s")
+
+
+if __name__ == "__main__":
+    main_()
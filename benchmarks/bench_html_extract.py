@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: single-pass lxml extraction vs the BeautifulSoup helpers it replaced.
+
+The helpers are kept here as the reference implementation; test_html_extract.py
+checks that extract_page returns the same fields.
+
+Usage:
+    python benchmarks/bench_html_extract.py [--iterations 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from tools.html_extract import extract_page
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CASES = [
+    ("brella_home.html", "mashup"),
+    ("brella_event.html", "Mashup 2025"),
+]
+
+
+def extract_meta_description(soup):
+    """Extract meta description from the page"""
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc:
+        return meta_desc.get('content', '')
+    return "No description available"
+
+
+def extract_features(soup):
+    """Extract features or key points from the Brella.io homepage"""
+    features = []
+
+    feature_sections = soup.select('.feature, .features, .benefits, .services')
+    if feature_sections:
+        for section in feature_sections:
+            feature_items = section.select('h2, h3, h4')
+            for item in feature_items:
+                features.append(item.text.strip())
+
+    if not features:
+        list_items = soup.select('ul li, ol li')
+        for item in list_items[:10]:
+            features.append(item.text.strip())
+
+    return features if features else ["No specific features extracted"]
+
+
+def find_relevant_links(soup, search_term):
+    """Find links that might be relevant to the search term"""
+    relevant_links = []
+    search_term_lower = search_term.lower()
+
+    for a_tag in soup.find_all('a', href=True):
+        href = a_tag.get('href', '')
+        text = a_tag.text.strip().lower()
+
+        if search_term_lower in text or search_term_lower in href.lower():
+            relevant_links.append(href)
+
+    return relevant_links
+
+
+def extract_content_summary(soup, search_term):
+    """Extract a summary of the content, focusing on parts relevant to the search term"""
+    search_term_lower = search_term.lower()
+    summary = []
+
+    paragraphs = soup.find_all('p')
+    for p in paragraphs:
+        text = p.text.strip()
+        if search_term_lower in text.lower():
+            summary.append(text)
+
+    if summary:
+        return summary[:3]
+
+    return [p.text.strip() for p in paragraphs[:3] if p.text.strip()]
+
+
+def soup_helpers(html, search_term):
+    """The pre-engine extraction path: html.parser plus one sweep per helper"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return {
+        "title": soup.title.text if soup.title else None,
+        "description": extract_meta_description(soup),
+        "features": extract_features(soup),
+        "links": find_relevant_links(soup, search_term),
+        "content_summary": extract_content_summary(soup, search_term)
+    }
+
+
+def time_it(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML extraction')
+    parser.add_argument('--iterations', type=int, default=50, help='Runs per case')
+    args = parser.parse_args()
+
+    print(f"{'fixture':<22}{'size':>10}{'soup helpers':>16}{'extract_page':>16}{'speedup':>10}")
+    for fixture, search_term in CASES:
+        with open(os.path.join(FIXTURES, fixture), encoding='utf-8') as f:
+            html = f.read()
+
+        legacy_ms = time_it(lambda: soup_helpers(html, search_term), args.iterations)
+        engine_ms = time_it(lambda: extract_page(html, search_term), args.iterations)
+        print(f"{fixture:<22}{len(html) // 1024:>8}KB{legacy_ms:>14.2f}ms{engine_ms:>14.2f}ms"
+              f"{legacy_ms / engine_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
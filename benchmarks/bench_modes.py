@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Latency comparison: full five-agent crew vs the single-agent fast crew.
+
+Runs real crews (OPENAI_API_KEY and SERPER_API_KEY required) on a fixed set of
+queries with the result cache bypassed, and reports wall time per query and mode.
+
+Usage:
+    python benchmarks/bench_modes.py [--runs 1] [--terms "Slush" "Web Summit"]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = [
+    ("Mashup 2025", "events", "founders"),
+    ("Slush", "people", "investors"),
+    ("Web Summit", "companies", "founders"),
+]
+MODES = ("full", "fast")
+
+
+def sections_found(result):
+    return sum(1 for section in result.sections().values() if section.found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark full vs fast research mode')
+    parser.add_argument('--runs', type=int, default=1, help='Runs per query and mode')
+    parser.add_argument('--terms', nargs='*', help='Search terms to use instead of the fixed set')
+    args = parser.parse_args()
+
+    os.environ["BRELLA_RESULT_CACHE"] = "0"
+    from main import research_brella
+
+    queries = [(term, "all", "founders") for term in args.terms] if args.terms else QUERIES
+    totals = {mode: [] for mode in MODES}
+    rows = []
+    for term, category, attendee_type in queries:
+        row = [term]
+        for mode in MODES:
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                result = research_brella(term, category, attendee_type, refresh=True, mode=mode)
+                timings.append(time.perf_counter() - start)
+            seconds = statistics.median(timings)
+            totals[mode].append(seconds)
+            row += [seconds, sections_found(result)]
+        rows.append(row)
+
+    print(f"\n{'query':<22}{'full':>10}{'sections':>10}{'fast':>10}{'sections':>10}{'speedup':>10}")
+    for term, full_s, full_found, fast_s, fast_found in rows:
+        print(f"{term:<22}{full_s:>9.1f}s{full_found:>10}{fast_s:>9.1f}s{fast_found:>10}{full_s / fast_s:>9.1f}x")
+    full_total, fast_total = sum(totals["full"]), sum(totals["fast"])
+    print(f"{'total':<22}{full_total:>9.1f}s{'':>10}{fast_total:>9.1f}s{'':>10}{full_total / fast_total:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Startup cost of the CLI and the Streamlit app, each measured in fresh interpreters.
+
+Reports the median wall time of `python main.py --help` and of `import main` and
+`import app` (the app's cold start: its script run once in Streamlit's bare mode,
+without clicking anything), followed by the slowest imports of each according to
+`python -X importtime`.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "main.py --help": ["main.py", "--help"],
+    "import main": ["-c", "import main"],
+    "app cold start": ["-c", "import app"],
+}
+
+
+def wall_time(args, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def slowest_imports(args, top):
+    """Modules imported directly by main or app, by cumulative time, from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nesting adds two spaces; main/app sit at one space, their own imports at three
+        if len(name) - len(name.lstrip()) == 3:
+            imports.append((int(cumulative) / 1000, name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI and app startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per measurement')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list per target')
+    args = parser.parse_args()
+
+    print(f"{'target':<20}{'median':>12}")
+    for name, target in TARGETS.items():
+        print(f"{name:<20}{wall_time(target, args.runs):>10.0f}ms")
+
+    for name, target in TARGETS.items():
+        if name == "main.py --help":
+            continue
+        print(f"\nSlowest imports for {name}:")
+        for cumulative_ms, module in slowest_imports(target, args.top):
+            print(f"  {cumulative_ms:>8.1f}ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
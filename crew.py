@@ -1,18 +1,113 @@
-from crewai import Agent, Task, Crew, Process
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from crewai import Agent, Task, Crew, Process, LLM
+from crewai.constants import DEFAULT_LLM_MODEL
+from crewai.llms.hooks.base import BaseInterceptor
 from typing import List, Dict, Any
 from tools.brella_scraper import BrellaScraper
+from tools.call_memo import CallMemo
 from tools.brella_auth_scraper import BrellaAuthScraper
+from tools.rate_limiter import get_rate_limiter
+
+
+class RateLimitInterceptor(BaseInterceptor):
+    """Passes every OpenAI request of an LLM through the shared "openai" token bucket"""
+    
+    def __init__(self, bucket):
+        self.bucket = bucket
+    
+    def on_outbound(self, message):
+        self.bucket.acquire()
+        return message
+    
+    def on_inbound(self, message):
+        self.bucket.on_response(message.status_code, message.headers.get("Retry-After"))
+        return message
+    
+    async def aon_outbound(self, message):
+        await self.bucket.aacquire()
+        return message
+    
+    async def aon_inbound(self, message):
+        return self.on_inbound(message)
+
+
+def build_llm():
+    """
+    Build the LLM used by the crews' agents, rate limited by the "openai" bucket.
+    
+    Returns:
+        An LLM, or None to let crewai build its default one (limiting disabled with
+        BRELLA_RATE_OPENAI=0, or a model whose provider does not support interceptors)
+    """
+    bucket = get_rate_limiter().bucket("openai")
+    if bucket is None:
+        return None
+    model = os.getenv("MODEL") or os.getenv("MODEL_NAME") or os.getenv("OPENAI_MODEL_NAME") or DEFAULT_LLM_MODEL
+    try:
+        return LLM(model=model, interceptor=RateLimitInterceptor(bucket))
+    except Exception as e:
+        print(f"OpenAI rate limiting disabled for model {model}: {str(e)}")
+        return None
+
+
+class ParallelCrew:
+    """Runs independent one-task crews concurrently on a bounded thread pool"""
+    
+    def __init__(self, crews, max_concurrency):
+        self.crews = crews
+        self.max_concurrency = max_concurrency
+    
+    @property
+    def tasks(self):
+        return [task for crew in self.crews for task in crew.tasks]
+    
+    def kickoff(self, inputs=None):
+        """
+        Kick off every crew with the same inputs.
+        
+        Returns:
+            List of CrewOutput, in crew order
+        """
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(lambda crew: crew.kickoff(inputs=dict(inputs or {})), self.crews))
+
+
+class CrewPool:
+    """
+    One crew per worker thread, built on first use and reset with new_run() for every later call.
+    
+    Agents, tools and their LLM clients are therefore built once per worker instead of once per
+    research call, while tasks, outputs and the call memo stay per run.
+    """
+    
+    def __init__(self, factory):
+        self.factory = factory
+        self._local = threading.local()
+    
+    def acquire(self):
+        crew_instance = getattr(self._local, "crew", None)
+        if crew_instance is None:
+            crew_instance = self._local.crew = self.factory()
+        else:
+            crew_instance.new_run()
+        return crew_instance
+
 
 class BrellaResearchCrew:
     """Brella Research Crew for finding information on Brella.io website"""
     
     def __init__(self):
-        # Create agents
+        self.llm = build_llm()
+        
+        # Create agents (built once, reused by every run of this crew)
         self.event_agent = Agent(
             role="Brella Event Specialist",
             goal="Find event information on Brella.io",
             backstory="Expert in discovering and analyzing networking events on Brella.io platform.",
             tools=[BrellaScraper()],
+            llm=self.llm,
             verbose=True
         )
         
@@ -21,6 +116,7 @@ class BrellaResearchCrew:
             goal="Research companies participating in Brella events",
             backstory="Analyst specialized in gathering information about companies using the Brella platform.",
             tools=[BrellaScraper()],
+            llm=self.llm,
             verbose=True
         )
         
@@ -29,6 +125,7 @@ class BrellaResearchCrew:
             goal="Analyze networking opportunities on Brella.io",
             backstory="Expert in identifying valuable networking connections and opportunities on Brella.",
             tools=[BrellaScraper()],
+            llm=self.llm,
             verbose=True
         )
         
@@ -37,6 +134,7 @@ class BrellaResearchCrew:
             goal="Find startup founders and their companies at Brella events",
             backstory="Specialist in identifying startup founders, their companies, and business fields at networking events.",
             tools=[BrellaScraper()],
+            llm=self.llm,
             verbose=True
         )
         
@@ -45,9 +143,25 @@ class BrellaResearchCrew:
             goal="Find specific types of people (founders, investors, executives) at specific Brella events",
             backstory="Expert in researching event attendees, their roles, companies, and professional backgrounds at Brella events.",
             tools=[BrellaScraper(), BrellaAuthScraper()],
+            llm=self.llm,
             verbose=True
         )
         
+        self.new_run()
+    
+    def new_run(self):
+        """
+        Reset per-run state so the agents, tools and LLM clients can serve another research call.
+        
+        Gives the tools a fresh call memo and creates new tasks. Also called from __init__, so
+        this is the only place a memo is created.
+        """
+        # One memo per run: identical tool calls from different agents share a single request
+        self.memo = CallMemo()
+        for agent in self.agents():
+            for tool in agent.tools:
+                tool.memo = self.memo
+        
         # Create tasks
         self.event_task = Task(
             description="Search Brella.io for information about events related to {search_term}. Use category 'events'.",
@@ -79,23 +193,62 @@ class BrellaResearchCrew:
             agent=self.attendee_agent
         )
     
-    def crew(self):
-        """Creates the Brella research crew"""
+    def agents(self):
+        return [
+            self.event_agent,
+            self.company_agent,
+            self.networking_agent,
+            self.founder_agent,
+            self.attendee_agent
+        ]
+    
+    def section_tasks(self):
+        """Tasks by the result section they fill"""
+        return {
+            "events": self.event_task,
+            "companies": self.company_task,
+            "networking": self.networking_task,
+            "founders": self.founder_task,
+            "attendees": self.attendee_task
+        }
+    
+    def tasks(self):
+        return [
+            self.event_task,
+            self.company_task,
+            self.networking_task,
+            self.founder_task,
+            self.attendee_task
+        ]
+    
+    def crew(self, parallel=None, max_concurrency=None):
+        """
+        Creates the Brella research crew
+        
+        The five tasks do not depend on each other. In parallel mode each task runs in
+        its own one-task crew, at most max_concurrency at a time, so wall time is close to
+        the slowest task instead of the sum. Every task's .output is filled as before.
+        
+        Args:
+            parallel: Run the tasks concurrently.
+                      If None, will look for BRELLA_CREW_PARALLEL (default off).
+            max_concurrency: Tasks running at the same time in parallel mode.
+                             If None, will look for BRELLA_CREW_CONCURRENCY (default 5).
+        """
+        if parallel is None:
+            parallel = os.getenv("BRELLA_CREW_PARALLEL", "0").lower() in ("1", "true", "yes")
+        
+        if parallel:
+            max_concurrency = max(1, int(max_concurrency or os.getenv("BRELLA_CREW_CONCURRENCY", 5)))
+            return ParallelCrew(
+                [Crew(agents=[task.agent], tasks=[task], process=Process.sequential, verbose=True)
+                 for task in self.tasks()],
+                max_concurrency
+            )
+        
         return Crew(
-            agents=[
-                self.event_agent,
-                self.company_agent,
-                self.networking_agent,
-                self.founder_agent,
-                self.attendee_agent
-            ],
-            tasks=[
-                self.event_task,
-                self.company_task,
-                self.networking_task,
-                self.founder_task,
-                self.attendee_task
-            ],
+            agents=self.agents(),
+            tasks=self.tasks(),
             process=Process.sequential,
             verbose=True
         )
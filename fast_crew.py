@@ -1,28 +1,104 @@
+import json
+import re
 from crewai import Agent, Task, Crew, Process
+from crew import build_llm
 from tools.brella_scraper import BrellaScraper
+from tools.call_memo import CallMemo
+
+SECTIONS = ("events", "companies", "networking", "founders", "attendees")
+HEADING = re.compile(r"^\s*(?:#{1,6}\s*|\*\*)(.+?)(?:\*\*)?:?\s*$")
 
 class FastBrellaResearchCrew:
     """Fast single-agent Brella Research Crew"""
-    
+
     def __init__(self):
+        self.memo = CallMemo()
         self.research_agent = Agent(
             role="Brella Research Specialist",
             goal="Quickly find comprehensive information on Brella.io",
             backstory="Expert researcher who efficiently gathers events, companies, and networking data from Brella.io in one go.",
-            tools=[BrellaScraper()],
+            tools=[BrellaScraper(memo=self.memo)],
+            llm=build_llm(),
             verbose=False
         )
-        
+        self.new_run()
+
+    def new_run(self):
+        """Fresh call memo and task for the next run; the agent and its tool are reused"""
+        self.memo = CallMemo()
+        for tool in self.research_agent.tools:
+            tool.memo = self.memo
+
         self.research_task = Task(
-            description="Search Brella.io for ALL information about {search_term} including events, companies, and networking opportunities. Provide a comprehensive report covering all aspects.",
-            expected_output="A complete JSON report with events, companies, and networking information all in one response.",
+            description="Search Brella.io for ALL information about {search_term} including events, companies, networking opportunities, startup founders and {attendee_type} attending the events. Provide a comprehensive report covering all aspects.",
+            expected_output="A single JSON object with the keys \"events\", \"companies\", \"networking\", \"founders\" and \"attendees\", each holding the information found for that aspect.",
             agent=self.research_agent
         )
-    
+
     def crew(self):
         return Crew(
             agents=[self.research_agent],
             tasks=[self.research_task],
             process=Process.sequential,
             verbose=False
-        )
\ No newline at end of file
+        )
+
+
+def split_report(report):
+    """
+    Split the fast crew's single report into the sections the full crew produces.
+
+    Args:
+        report: Raw output of the research task
+
+    Returns:
+        Dict with events, companies, networking, founders and attendees. JSON values are
+        kept decoded, for parse_section; sections missing from the report are "Not available". Reports that
+        are not JSON are split on markdown headings naming a section, and a report with no
+        recognizable sections is kept whole under "events".
+    """
+    sections = _split_json(report) or _split_headings(report)
+    if not sections:
+        sections = {"events": report.strip()} if report and report.strip() else {}
+    return {name: sections.get(name) or "Not available" for name in SECTIONS}
+
+
+def _section_name(key):
+    key = key.strip().lower()
+    for name in SECTIONS:
+        if key.startswith(name):
+            return name
+    return None
+
+
+def _split_json(report):
+    start, end = report.find("{"), report.rfind("}")
+    if start == -1 or end < start:
+        return {}
+    try:
+        data = json.loads(report[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    sections = {}
+    for key, value in data.items():
+        name = _section_name(str(key))
+        if name and value not in (None, "", [], {}):
+            sections[name] = value
+    return sections
+
+
+def _split_headings(report):
+    sections = {}
+    current = None
+    for line in report.splitlines():
+        match = HEADING.match(line)
+        name = _section_name(match.group(1).lstrip("0123456789. ")) if match else None
+        if name:
+            current = name
+            sections.setdefault(name, [])
+        elif current:
+            sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "".join(lines).strip()}
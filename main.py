@@ -1,4 +1,5 @@
-# Fix SQLite compatibility issue for ChromaDB
+# Fix SQLite compatibility issue for ChromaDB. This has to run before anything imports
+# sqlite3, including the job manifest and caches in tools/
 try:
     __import__('pysqlite3')
     import sys
@@ -9,93 +10,185 @@ except ImportError:
 import os
 os.environ["ALLOW_RESET"] = "TRUE"
 
-from crew import BrellaResearchCrew
 import json, csv, argparse
 import os
+import sys
+import threading
 from dotenv import load_dotenv
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tools.google_sheets_exporter import GoogleSheetsExporter
-
-load_dotenv()
-
-if not os.getenv("OPENAI_API_KEY"):
-    print("Error: OPENAI_API_KEY not found in environment variables")
-    sys.exit(1)
-
-if not os.getenv("SERPER_API_KEY"):
-    print("Warning: SERPER_API_KEY not found in environment variables")
-
-# Check for Brella authentication credentials
-if os.getenv("BRELLA_EMAIL") and os.getenv("BRELLA_PASSWORD"):
-    print("Brella authentication credentials found - authenticated scraping enabled")
-else:
-    print("Note: Set BRELLA_EMAIL and BRELLA_PASSWORD in .env for authenticated portal access")
-
-sheets_exporter = None
-if os.getenv("GOOGLE_SPREADSHEET_URL"):
-    sheets_exporter = GoogleSheetsExporter(spreadsheet_url=os.getenv("GOOGLE_SPREADSHEET_URL"))
-    print(f"Using Google Spreadsheet URL: {os.getenv('GOOGLE_SPREADSHEET_URL')}")
-elif os.getenv("GOOGLE_CREDENTIALS_PATH"):
-    if os.path.exists(os.getenv("GOOGLE_CREDENTIALS_PATH")):
-        sheets_exporter = GoogleSheetsExporter(credentials_file=os.getenv("GOOGLE_CREDENTIALS_PATH"))
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import ExitStack
+from itertools import islice
+from tools.call_memo import CallMemo
+from tools.http_client import get_http_client
+from tools.job_manifest import JobManifest, csv_version, manifest_path_for, parse_shard, worker_id
+from tools.jsonl_writer import JsonlWriter, write_json_array
+from tools.research_result import ResearchResult, error_result, parse_section
+from tools.response_cache import get_response_cache
+from tools.rate_limiter import get_rate_limiter
+from tools.result_cache import get_result_cache
+from tools.serper_cache import get_serper_cache
+
+# crewai (and through it ChromaDB), gspread, oauth2client and pandas take seconds to
+# import, so they are loaded on first use: importing this module, e.g. from app.py or
+# for --help, stays cheap and has no side effects.
+
+def init_environment():
+    """
+    Load .env and report missing credentials; called by the CLI before it runs.
+
+    Returns:
+        False if OPENAI_API_KEY is missing
+    """
+    load_dotenv()
+    
+    if not os.getenv("OPENAI_API_KEY"):
+        print("Error: OPENAI_API_KEY not found in environment variables")
+        return False
+    
+    if not os.getenv("SERPER_API_KEY"):
+        print("Warning: SERPER_API_KEY not found in environment variables")
+    
+    # Check for Brella authentication credentials
+    if os.getenv("BRELLA_EMAIL") and os.getenv("BRELLA_PASSWORD"):
+        print("Brella authentication credentials found - authenticated scraping enabled")
     else:
+        print("Note: Set BRELLA_EMAIL and BRELLA_PASSWORD in .env for authenticated portal access")
+    return True
+
+def create_sheets_exporter(spreadsheet_url=None):
+    """
+    Build a GoogleSheetsExporter from spreadsheet_url, GOOGLE_SPREADSHEET_URL or
+    GOOGLE_CREDENTIALS_PATH, importing gspread and pandas only now.
+
+    Returns:
+        The exporter, or None if nothing is configured
+    """
+    from tools.google_sheets_exporter import GoogleSheetsExporter
+    
+    if spreadsheet_url:
+        return GoogleSheetsExporter(spreadsheet_url=spreadsheet_url)
+    if os.getenv("GOOGLE_SPREADSHEET_URL"):
+        print(f"Using Google Spreadsheet URL: {os.getenv('GOOGLE_SPREADSHEET_URL')}")
+        return GoogleSheetsExporter()
+    if os.getenv("GOOGLE_CREDENTIALS_PATH"):
+        if os.path.exists(os.getenv("GOOGLE_CREDENTIALS_PATH")):
+            return GoogleSheetsExporter(credentials_file=os.getenv("GOOGLE_CREDENTIALS_PATH"))
         print(f"Warning: Google credentials file not found at {os.getenv('GOOGLE_CREDENTIALS_PATH')}")
         print("Results will not be exported to Google Sheets")
-else:
+        return None
     print("Note: Neither GOOGLE_SPREADSHEET_URL nor GOOGLE_CREDENTIALS_PATH set in environment variables")
     print("To export to Google Sheets, use --spreadsheet-url parameter")
+    return None
+
+# Agents and tools are built once per worker thread and reused across research calls
+_crew_pools = None
+_crew_pools_lock = threading.Lock()
+
+def get_crew_pool(mode):
+    """
+    Return the CrewPool for a research mode, importing crewai on first use.
+    """
+    global _crew_pools
+    if _crew_pools is None:
+        with _crew_pools_lock:
+            if _crew_pools is None:
+                from crew import BrellaResearchCrew, CrewPool
+                from fast_crew import FastBrellaResearchCrew
+                _crew_pools = {
+                    "full": CrewPool(BrellaResearchCrew),
+                    "fast": CrewPool(FastBrellaResearchCrew)
+                }
+    return _crew_pools[mode]
 
-def research_brella(search_term, category="all", attendee_type="founders"):
+def research_brella(search_term, category="all", attendee_type="founders", refresh=False, mode="full",
+                    on_section=None):
     """
     Research information on Brella.io based on search term and category
+
+    mode "full" runs the five-agent BrellaResearchCrew; "fast" runs the single-agent
+    FastBrellaResearchCrew and splits its report into the same keys.
+    Results younger than BRELLA_RESULT_CACHE_TTL are returned from the result cache
+    unless refresh is True. Every result carries "cached" and "cache_age_seconds".
+
+    Each task output is parsed once into the ResearchResult's sections. In full mode,
+    on_section(name, section) is called from the crew's thread as soon as the task
+    filling that section (events, companies, ...) finishes.
+
+    Returns:
+        ResearchResult
     """
-    print(f"Researching '{search_term}' in category '{category}' on Brella.io...")
+    result_cache = get_result_cache()
+    if result_cache and not refresh:
+        cached, age = result_cache.get(search_term, category, attendee_type, mode)
+        if cached is not None:
+            print(f"Using cached research for '{search_term}' in category '{category}' ({int(age)}s old)")
+            cached = ResearchResult.from_dict(cached)
+            cached.cached = True
+            cached.cache_age_seconds = int(age)
+            return cached
+
+    print(f"Researching '{search_term}' in category '{category}' on Brella.io ({mode} mode)...")
     
     try:
-        crew_instance = BrellaResearchCrew()
-        crew = crew_instance.crew()
-        
         search_with_category = f"{search_term} (category: {category})"
-        
-        result = crew.kickoff(inputs={
+        inputs = {
             "search_term": search_with_category,
             "attendee_type": attendee_type
-        })
-        
-        output = {
-            "search_term": search_term,
-            "category": category,
-            "attendee_type": attendee_type,
-            "events": crew_instance.event_task.output.raw if hasattr(crew_instance.event_task, 'output') else "Not available",
-            "companies": crew_instance.company_task.output.raw if hasattr(crew_instance.company_task, 'output') else "Not available",
-            "networking": crew_instance.networking_task.output.raw if hasattr(crew_instance.networking_task, 'output') else "Not available",
-            "founders": crew_instance.founder_task.output.raw if hasattr(crew_instance.founder_task, 'output') else "Not available",
-            "attendees": crew_instance.attendee_task.output.raw if hasattr(crew_instance.attendee_task, 'output') else "Not available",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
+        if mode == "fast":
+            from fast_crew import split_report
+            
+            crew_instance = get_crew_pool("fast").acquire()
+            crew_instance.crew().kickoff(inputs=inputs)
+            task_output = getattr(crew_instance.research_task, 'output', None)
+            sections = {name: parse_section(name, value)
+                        for name, value in split_report(task_output.raw if task_output else "").items()}
+        else:
+            crew_instance = get_crew_pool("full").acquire()
+            sections = {}
+            
+            def task_finished(name, task_output):
+                sections[name] = parse_section(name, task_output.raw)
+                if on_section:
+                    on_section(name, sections[name])
+            
+            for name, task in crew_instance.section_tasks().items():
+                task.callback = lambda task_output, name=name: task_finished(name, task_output)
+            crew_instance.crew().kickoff(inputs=inputs)
+            for name, task in crew_instance.section_tasks().items():
+                if name not in sections:
+                    sections[name] = parse_section(name, task.output.raw if getattr(task, 'output', None) else None)
+        
+        output = ResearchResult(
+            search_term,
+            category,
+            attendee_type,
+            **sections,
+            mode=mode,
+            deduplicated_calls=crew_instance.memo.stats()["deduplicated"],
+            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+        
+        if result_cache:
+            result_cache.put(search_term, category, attendee_type, output.to_dict(), mode)
         return output
     except Exception as e:
         print(f"Error researching '{search_term}' on Brella.io: {str(e)}")
-        return {
-            "search_term": search_term,
-            "category": category,
-            "attendee_type": attendee_type,
-            "events": f"Error: {str(e)}",
-            "companies": f"Error: {str(e)}",
-            "networking": f"Error: {str(e)}",
-            "founders": f"Error: {str(e)}",
-            "attendees": f"Error: {str(e)}",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        return error_result(search_term, category, attendee_type, mode, str(e),
+                            datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+def jsonl_path_for(output_file):
+    """Path of the JSONL stream that backs a JSON output file"""
+    if output_file.endswith('.jsonl'):
+        return output_file
+    return os.path.splitext(output_file)[0] + '.jsonl'
 
-def process_csv(csv_file, output_file, max_workers=3):
+def iter_csv_rows(csv_file):
     """
-    Process a CSV file with search terms and categories
+    Read (search_term, category, attendee_type) rows from a CSV file one at a time
     """
-    search_items = []
-    
     with open(csv_file, 'r', encoding='utf-8') as file:
         reader = csv.reader(file)
         header = next(reader)  
@@ -108,40 +201,194 @@ def process_csv(csv_file, output_file, max_workers=3):
             if len(row) > term_idx:
                 category = row[category_idx] if len(row) > category_idx else "all"
                 attendee_type = row[attendee_idx] if len(row) > attendee_idx else "founders"
-                search_items.append((row[term_idx], category, attendee_type))
+                yield (row[term_idx], category, attendee_type)
+
+def run_rows(manifest, rows, item, refresh, mode, owner, lease_seconds):
+    """Research one planned crew run, leasing the CSV rows it serves in the manifest while it runs"""
+    with ExitStack() as leases:
+        for row in rows:
+            manifest.mark_running(row[0], owner, lease_seconds)
+            leases.enter_context(manifest.hold_lease(row[0], owner, lease_seconds))
+        return research_brella(*item, refresh, mode)
+
+def record_row(manifest, writer, key, item, result, owner=None):
+    """Store a finished row's copy of its run's result in the manifest and the JSONL stream"""
+    term, category, attendee_type = item
+    row = result.for_row(term, category, attendee_type).to_dict()
+    status = manifest.mark_finished(key, row, owner)
+    if status is None:
+        print(f"Dropping result for '{term}': its lease expired and another worker took the row")
+        return
+    writer.write(row)
     
-    results = []
+    if status == "done":
+        print(f"Completed research for '{term}' in category '{category}' for {attendee_type}")
+    else:
+        print(f"Research failed for '{term}' in category '{category}' for {attendee_type}")
+
+def record_run(manifest, writer, rows, future):
+    """Copy a finished crew run's result to every CSV row it serves"""
+    for key, *item in rows:
+        try:
+            record_row(manifest, writer, key, item, future.result())
+        except Exception as e:
+            manifest.mark_failed(key)
+            print(f"Error processing '{item[0]}' in category '{item[1]}' for {item[2]}: {str(e)}")
+
+def process_csv(csv_file, output_file, max_workers=3, refresh=False, mode="full", compact=True,
+                resume=False, max_retries=2, queue=False, shard=None, lease_seconds=None):
+    """
+    Process a CSV file with search terms and categories
+
+    Each completed row is appended to a JSONL file next to output_file as it finishes,
+    and its status (pending/running/done/failed) is kept in a job manifest next to it.
+    With resume, rows already done are skipped and failed rows are retried until they
+    have had 1 + max_retries attempts. With compact, the latest result of every row is
+    finally written as a JSON array to output_file (skipped when it ends in .jsonl).
+
+    Rows are planned before they run (see JobManifest.plan_runs): rows that only differ
+    in case or spacing, or whose attendee type is covered by an "all" row for the same
+    term and category, share one crew run whose result is copied to each of them.
+
+    Memory use does not grow with the CSV: rows are streamed into the manifest in chunks
+    of BRELLA_CSV_CHUNK_ROWS (default 1000), the plan is read back in pages, at most
+    BRELLA_CSV_WINDOW crew runs (default 2 * max_workers) are submitted at a time, and
+    results go to disk as they finish.
+
+    Several processes can share one manifest, on one host or on hosts sharing the
+    output directory. With queue, every worker thread claims rows under a lease of
+    lease_seconds (BRELLA_LEASE_SECONDS, default 900) that is renewed while the row
+    runs; rows whose worker died are picked up again once the lease expires. shard
+    (index, count) statically limits a process to rows whose CSV position % count ==
+    index. In both cases the manifest is never reset, only rows left over from a
+    different CSV are detached, each process streams to its own JSONL part, and
+    whichever process finishes last writes the merged output_file. Rows run without
+    queue are leased too, so queue workers sharing the manifest leave them alone.
+
+    Returns:
+        Row counts by status (pending, running, done, failed); read the results with
+        iter_results(output_file)
+    """
+    shared = queue or shard is not None
+    version = csv_version(csv_file)
+    manifest = JobManifest(manifest_path_for(output_file))
+    if not resume and not shared:
+        manifest.reset()
+    elif resume and not shared:
+        manifest.detach_rows()
+    else:
+        # Other workers may be adding the same CSV right now: only detach rows of other CSVs
+        manifest.detach_rows(keep_version=version)
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_search = {
-            executor.submit(research_brella, term, category, attendee_type): (term, category, attendee_type) 
-            for term, category, attendee_type in search_items
-        }
-        
-        for future in as_completed(future_to_search):
-            term, category, attendee_type = future_to_search[future]
-            try:
-                result = future.result()
-                results.append(result)
-                
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2)
+    chunk_rows = max(1, int(os.getenv("BRELLA_CSV_CHUNK_ROWS", 1000)))
+    rows = iter_csv_rows(csv_file)
+    start = 0
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            break
+        manifest.add_rows(chunk, start, version)
+        start += len(chunk)
+    
+    todo, run_count = manifest.plan_runs(max_retries, shard)
+    print(f"Plan: {todo} rows to run need {run_count} crew runs ({todo - run_count} saved by merging duplicate rows)")
+    if resume or shard is not None:
+        print(f"{start - todo} of {start} rows finished, out of retries or in other shards")
+    owner = worker_id()
+    lease_seconds = float(lease_seconds or os.getenv("BRELLA_LEASE_SECONDS", 900))
+    
+    jsonl_file = jsonl_path_for(output_file)
+    if shared:
+        jsonl_file = os.path.splitext(jsonl_file)[0] + f".{owner}.jsonl"
+    print(f"Streaming results to {jsonl_file}")
+    
+    with JsonlWriter(jsonl_file, append=resume or shared) as writer:
+        if queue:
+            # Rows are claimed one at a time, so duplicate rows claimed by this process at the
+            # same time share a run through the memo. Results are not kept in it, which would
+            # grow with the CSV; later duplicates are served by the result cache.
+            runs = CallMemo()
+            
+            def queue_worker(thread_owner):
+                while True:
+                    job = manifest.claim(thread_owner, lease_seconds, max_retries, shard)
+                    if job is None:
+                        return
+                    key, item = job[0], tuple(job[1:])
+                    try:
+                        run_key, run_item = manifest.run_for(key)
+                        with manifest.hold_lease(key, thread_owner, lease_seconds):
+                            result = runs.call(run_key, lambda: research_brella(*run_item, refresh, mode),
+                                               keep=lambda result: False)
+                        record_row(manifest, writer, key, item, result, thread_owner)
+                    except Exception as e:
+                        manifest.mark_failed(key, thread_owner)
+                        print(f"Error processing '{item[0]}' in category '{item[1]}' for {item[2]}: {str(e)}")
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for thread_number in range(max_workers):
+                    executor.submit(queue_worker, f"{owner}-{thread_number}")
+            print(f"Crew runs saved by merging duplicate rows in this worker: {runs.stats()['deduplicated']}")
+        else:
+            window = max(1, int(os.getenv("BRELLA_CSV_WINDOW", 2 * max_workers)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                in_flight = {}
+                for item, run in manifest.iter_runs():
+                    if len(in_flight) >= window:
+                        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            record_run(manifest, writer, in_flight.pop(future), future)
+                    in_flight[executor.submit(run_rows, manifest, run, item, refresh, mode, owner, lease_seconds)] = run
                 
-                print(f"Completed research for '{term}' in category '{category}' for {attendee_type}")
-            except Exception as e:
-                print(f"Error processing '{term}' in category '{category}' for {attendee_type}: {str(e)}")
+                for future in as_completed(in_flight):
+                    record_run(manifest, writer, in_flight[future], future)
+    
+    counts = manifest.counts()
+    print(f"Rows: {counts['done']} done, {counts['failed']} failed, {counts['pending'] + counts['running']} not run")
+    remaining = manifest.unfinished() if shared else 0
     
-    return results
+    if remaining:
+        print(f"{remaining} rows are still pending or running in other workers; "
+              f"the last worker to finish writes {output_file} (or run with --merge)")
+    elif compact and not output_file.endswith('.jsonl'):
+        write_json_array(manifest.iter_results(), output_file)
+    manifest.close()
+    
+    return counts
+
+def iter_results(output_file):
+    """
+    Iterate the latest result of every row recorded in the job manifest of output_file,
+    as ResearchResult in CSV order, without loading them all at once.
+    """
+    manifest = JobManifest(manifest_path_for(output_file))
+    try:
+        for row in manifest.iter_results():
+            yield ResearchResult.from_dict(row)
+    finally:
+        manifest.close()
+
+def merge_results(output_file):
+    """
+    Write the latest result of every row in the job manifest to output_file as a JSON array.
+    """
+    manifest = JobManifest(manifest_path_for(output_file))
+    counts = manifest.counts()
+    print(f"Merging rows ({counts['done']} done, {counts['failed']} failed, "
+          f"{counts['pending'] + counts['running']} not run)")
+    written = write_json_array(manifest.iter_results(), output_file)
+    manifest.close()
+    return written
 
 def main():
-    global sheets_exporter
-    
     parser = argparse.ArgumentParser(description='Research information on Brella.io')
     
     # Create a mutually exclusive group for input methods
     input_group = parser.add_mutually_exclusive_group(required=True)
     input_group.add_argument('--csv', type=str, help='CSV file with search terms and categories')
     input_group.add_argument('--term', type=str, help='Search term')
+    input_group.add_argument('--merge', action='store_true',
+                             help='Only merge the results recorded in the job manifest of --output into --output')
     
     parser.add_argument('--category', type=str, default='all', 
                         choices=['all', 'events', 'companies', 'people', 'networking', 'founders'],
@@ -155,33 +402,64 @@ def main():
     parser.add_argument('--spreadsheet', type=str, default='Brella Research Results', help='Google Spreadsheet name (when not using URL)')
     parser.add_argument('--spreadsheet-url', type=str, help='Direct URL to a Google Spreadsheet')
     parser.add_argument('--worksheet', type=str, help='Google Worksheet name (defaults to current date)')
+    parser.add_argument('--no-compact', action='store_true',
+                        help='With --csv, keep only the JSONL stream instead of also writing the JSON array')
+    parser.add_argument('--resume', action='store_true',
+                        help='With --csv, skip rows the previous run finished and retry its failed rows')
+    parser.add_argument('--max-retries', type=int, default=2,
+                        help='With --resume, extra attempts allowed for a failed row (default: 2)')
+    parser.add_argument('--queue', action='store_true',
+                        help='With --csv, claim rows from the shared job manifest so several processes or hosts can work on one CSV')
+    parser.add_argument('--shard', type=str,
+                        help='With --csv, only run rows whose position modulo n equals i (format: i/n)')
+    parser.add_argument('--lease', type=float,
+                        help='With --queue, seconds a claimed row is reserved before another worker may take it over (default: 900)')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached results and run the research again')
+    parser.add_argument('--mode', type=str, default='full', choices=['full', 'fast'],
+                        help='full: five specialised agents; fast: one agent, one combined report (default: full)')
+    parser.add_argument('--parallel', action='store_true', help='Run the five research tasks of each search concurrently')
     
     args = parser.parse_args()
     
-    if args.csv:
-        results = process_csv(args.csv, args.output, args.workers)
+    if not init_environment():
+        sys.exit(1)
+    
+    if args.parallel:
+        os.environ["BRELLA_CREW_PARALLEL"] = "1"
+    
+    if args.shard:
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    if args.merge:
+        merge_results(args.output)
+        results = lambda: iter_results(args.output)
+    elif args.csv:
+        process_csv(args.csv, args.output, args.workers, args.refresh, args.mode,
+                    compact=not args.no_compact, resume=args.resume, max_retries=args.max_retries,
+                    queue=args.queue, shard=args.shard, lease_seconds=args.lease)
+        # Read back from the manifest on each use instead of holding every row in memory
+        results = lambda: iter_results(args.output)
     else: 
-        result = research_brella(args.term, args.category, getattr(args, 'attendee_type', 'founders'))
-        results = [result]
+        result = research_brella(args.term, args.category, getattr(args, 'attendee_type', 'founders'), args.refresh, args.mode)
+        results = lambda: [result]
         
         with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+            json.dump([result.to_dict()], f, indent=2)
     
-    print(f"Research completed. Results saved to {args.output}")
+    saved_to = jsonl_path_for(args.output) if args.csv and args.no_compact else args.output
+    print(f"Research completed. Results saved to {saved_to}")
     
-    should_export_to_sheets = args.sheets or (sheets_exporter is not None and os.getenv("GOOGLE_SPREADSHEET_URL"))
+    should_export_to_sheets = args.sheets or os.getenv("GOOGLE_SPREADSHEET_URL")
     
     if should_export_to_sheets:
+        sheets_exporter = create_sheets_exporter(args.spreadsheet_url)
         if args.spreadsheet_url:
-            if not sheets_exporter:
-                sheets_exporter = GoogleSheetsExporter(spreadsheet_url=args.spreadsheet_url)
-            else:
-                sheets_exporter.spreadsheet_url = args.spreadsheet_url
-                sheets_exporter.spreadsheet_id = sheets_exporter._extract_spreadsheet_id(args.spreadsheet_url)
-            
             print(f"Exporting results to Google Sheets at URL: {args.spreadsheet_url}")
         elif sheets_exporter:
-            print(f"Exporting results to Google Sheets using URL from .env file")
+            print(f"Exporting results to Google Sheets using settings from .env file")
         else:
             print("Error: No Google Sheets URL or credentials provided.")
             print("Use --spreadsheet-url parameter or set GOOGLE_SPREADSHEET_URL in .env file")
@@ -190,7 +468,7 @@ def main():
         if sheets_exporter:
             if sheets_exporter.authenticate():
                 spreadsheet_url = sheets_exporter.export_to_sheet(
-                    results, 
+                    list(results()), 
                     args.spreadsheet, 
                     args.worksheet
                 )
@@ -203,14 +481,37 @@ def main():
                 print("Failed to authenticate with Google Sheets API")
     
     print("\nSummary:")
-    for result in results:
-        attendee_type = result.get('attendee_type', 'founders')
-        print(f"- '{result['search_term']}' in '{result['category']}' ({attendee_type}): " +
-              f"Events: {'Found' if result['events'] != 'Not available' else 'Not found'}, " +
-              f"Companies: {'Found' if result['companies'] != 'Not available' else 'Not found'}, " +
-              f"Networking: {'Found' if result['networking'] != 'Not available' else 'Not found'}, " +
-              f"Founders: {'Found' if result['founders'] != 'Not available' else 'Not found'}, " +
-              f"Attendees: {'Found' if result.get('attendees', 'Not available') != 'Not available' else 'Not found'}")
+    deduplicated = 0
+    for result in results():
+        if not result.cached:
+            deduplicated += result.deduplicated_calls
+        found = ", ".join(f"{name.capitalize()}: {'Found' if section.found else 'Not found'}"
+                          for name, section in result.sections().items())
+        print(f"- '{result.search_term}' in '{result.category}' ({result.attendee_type}): {found}" +
+              (f" [cached, {result.cache_age_seconds}s old]" if result.cached else ""))
+    
+    print(f"Tool calls deduplicated: {deduplicated}")
+    
+    http_stats = get_http_client().stats()
+    print(f"HTTP: {http_stats['requests']} requests, {http_stats['connections_opened']} connections opened, " +
+          f"{http_stats['connections_reused']} reused")
+    
+    response_cache = get_response_cache()
+    if response_cache:
+        cache_stats = response_cache.stats()
+        print(f"Page cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, " +
+              f"{cache_stats['misses']} misses ({cache_stats['entries']} entries, {cache_stats['bytes'] // 1024} KB)")
+    
+    serper_cache = get_serper_cache()
+    if serper_cache:
+        serper_stats = serper_cache.stats()
+        print(f"Serper cache: {serper_stats['hits']} hits, {serper_stats['misses']} misses " +
+              f"({serper_stats['entries']} entries)")
+    
+    for name, limiter_stats in get_rate_limiter().stats().items():
+        if limiter_stats['requests']:
+            print(f"Rate limit {name}: {limiter_stats['requests']} requests, {limiter_stats['throttled']} throttled (429), " +
+                  f"{limiter_stats['waited_seconds']:.1f}s waited, now {limiter_stats['rate']}/s")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
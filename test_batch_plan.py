@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+import time
+
+from tools.job_manifest import JobManifest
+from tools.research_result import ResearchResult, parse_section
+
+ITEMS = [
+    ("Mashup 2025", "events", "founders"),
+    ("  mashup   2025 ", "Events", "Founders"),
+    ("Slush", "people", "investors"),
+    ("Slush", "people", "all"),
+    ("Slush", "events", "investors"),
+    ("Web Summit", "", ""),
+]
+
+
+def test_duplicate_and_covered_rows_share_a_run(tmp_path):
+    manifest = JobManifest(str(tmp_path / "out.manifest.sqlite"))
+    keys = manifest.add_rows(ITEMS[:3]) + manifest.add_rows(ITEMS[3:], start=3)
+    assert len(set(keys)) == 6
+
+    assert manifest.plan_runs() == (6, 4)
+    runs = list(manifest.iter_runs(page_size=3))
+    assert [item for item, rows in runs] == [
+        ("Mashup 2025", "events", "founders"),
+        ("Slush", "people", "all"),
+        ("Slush", "events", "investors"),
+        ("Web Summit", "all", "founders"),
+    ]
+    assert [[row[0] for row in rows] for item, rows in runs] == [keys[:2], keys[2:4], [keys[4]], [keys[5]]]
+    assert manifest.run_for(keys[2]) == (("slush", "people", "all"), ("Slush", "people", "all"))
+
+
+def test_process_csv_streams_with_a_bounded_window(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("BRELLA_CSV_CHUNK_ROWS", "7")
+    monkeypatch.setenv("BRELLA_CSV_WINDOW", "2")
+    import main
+
+    csv_file = tmp_path / "rows.csv"
+    csv_file.write_text("Search Term,Category,Attendee Type\n" +
+                        "".join(f"Event {i % 40},all,founders\n" for i in range(50)))
+    output = tmp_path / "out.json"
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def research(term, category, attendee_type, refresh=False, mode="full"):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+        return ResearchResult(term, category, attendee_type, events=parse_section("events", "Found"))
+
+    monkeypatch.setattr(main, "research_brella", research)
+    counts = main.process_csv(str(csv_file), str(output), max_workers=4)
+
+    assert counts["done"] == 50
+    assert active["peak"] <= 2
+    rows = json.loads(output.read_text())
+    assert [row["search_term"] for row in rows] == [f"Event {i % 40}" for i in range(50)]
+    assert rows == [result.to_dict() for result in main.iter_results(str(output))]
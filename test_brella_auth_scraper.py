@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import tools.brella_auth_scraper as brella_auth_scraper
+import tools.session_store as session_store
+from tools.brella_auth_scraper import BrellaAuthScraper
+
+
+class FakePortalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == "/login":
+            self._send(200, "<form><input type='hidden' name='_token' value='abc'></form>")
+        elif self.server.revoked_token and f"session={self.server.revoked_token}" in self.headers.get("Cookie", ""):
+            self._send(403, "Forbidden")
+        elif f"session={self.server.valid_token}" not in self.headers.get("Cookie", ""):
+            self._send(302, "", {"Location": "/login"})
+        elif path == "/dashboard":
+            self._send(200, "<div class='attendee'><h3>Ada</h3><span class='role'>Founder</span></div> Mashup"
+                            "<a href='/events/mashup-2025'>Mashup 2025</a><a href='/events/other'>Other event</a>"
+                            + self.server.extra_links,
+                       {"Set-Cookie": "seen=1; Path=/"})
+        elif path == "/events/mashup-vip":
+            self._send(403, "Forbidden")
+        elif path == "/events/mashup-2025":
+            page = int(query.split("=")[1]) if query else 1
+            people = "".join(f"<div class='attendee'><h3>Person {page}-{i}</h3></div>" for i in range(10))
+            next_link = f"<a rel='next' href='?page={page + 1}'>Next</a>" if page < 5 else ""
+            self._send(200, f"<h1>Mashup 2025</h1>{people}{next_link}")
+        else:
+            self._send(200, "<h1>Other event</h1><div class='attendee'><h3>Nobody</h3></div>")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.logins += 1
+            self.server.valid_token = f"t{self.server.logins}"
+        self._send(200, "Welcome to your dashboard", {"Set-Cookie": f"session={self.server.valid_token}; Path=/"})
+
+    def _send(self, status, body, headers=None):
+        body = body.encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def portal(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakePortalHandler)
+    server.lock = threading.Lock()
+    server.logins = 0
+    server.valid_token = None
+    server.revoked_token = None
+    server.extra_links = ""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setattr(brella_auth_scraper, "PORTAL_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(session_store, "_store", session_store.SessionStore(str(tmp_path / "sessions")))
+    monkeypatch.setenv("BRELLA_EMAIL", "ada@example.com")
+    monkeypatch.setenv("BRELLA_PASSWORD", "secret")
+    yield server
+    server.shutdown()
+
+
+def test_parallel_calls_share_one_login(portal):
+    scraper = BrellaAuthScraper()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: scraper._run("Mashup"), range(8)))
+
+    assert portal.logins == 1
+    assert all(json.loads(result)[0]["attendees"][0]["name"] == "Ada" for result in results)
+
+
+def test_crawl_follows_pagination_and_event_links(portal):
+    result = json.loads(BrellaAuthScraper(crawl_workers=3)._run("Mashup"))
+
+    names = [person["name"] for event in result for person in event["attendees"]]
+    assert len(names) == 51
+    assert "Person 5-9" in names
+    assert "Nobody" not in names
+
+
+def test_crawl_respects_page_and_record_limits(portal):
+    by_records = json.loads(BrellaAuthScraper(max_records=15)._run("Mashup"))
+    by_pages = json.loads(asyncio.run(BrellaAuthScraper(max_pages=4)._arun("Mashup")))
+
+    assert sum(len(event["attendees"]) for event in by_records) == 15
+    assert sum(len(event["attendees"]) for event in by_pages) == 21
+
+
+def test_cookies_survive_a_new_run_and_are_private(portal, tmp_path):
+    BrellaAuthScraper()._run("Mashup")
+    session_store._store = session_store.SessionStore(str(tmp_path / "sessions"))
+
+    BrellaAuthScraper()._run("Mashup")
+
+    assert portal.logins == 1
+    cookie_files = [name for name in os.listdir(tmp_path / "sessions") if name.endswith(".json")]
+    assert len(cookie_files) == 1
+    assert os.stat(tmp_path / "sessions" / cookie_files[0]).st_mode & 0o077 == 0
+
+
+def test_expired_session_logs_in_again(portal):
+    scraper = BrellaAuthScraper()
+    scraper._run("Mashup")
+    portal.valid_token = "rotated"
+
+    result = asyncio.run(scraper._arun("Mashup"))
+
+    assert portal.logins == 2
+    assert json.loads(result)[0]["attendees"][0]["name"] == "Ada"
+
+
+def test_forbidden_detail_page_is_skipped(portal):
+    portal.extra_links = "<a href='/events/mashup-vip'>Mashup VIP</a>"
+
+    result = json.loads(BrellaAuthScraper()._run("Mashup"))
+
+    assert portal.logins == 1
+    assert result[0]["attendees"][0]["name"] == "Ada"
+    assert all("mashup-vip" not in event["url"] for event in result)
+
+
+def test_forbidden_start_page_logs_in_again(portal):
+    scraper = BrellaAuthScraper()
+    scraper._run("Mashup")
+    portal.revoked_token = portal.valid_token
+
+    result = json.loads(scraper._run("Mashup"))
+
+    assert portal.logins == 2
+    assert result[0]["attendees"][0]["name"] == "Ada"
+
+
+def test_async_crawl_saves_refreshed_cookies(portal, tmp_path):
+    asyncio.run(BrellaAuthScraper()._arun("Mashup"))
+
+    stored = session_store.SessionStore(str(tmp_path / "sessions"))._load("ada@example.com")
+    assert {cookie["name"] for cookie in stored["cookies"]} == {"session", "seen"}
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import tools.brella_scraper as brella_scraper
+from tools.brella_scraper import BrellaScraper
+from tools.call_memo import CallMemo
+from tools.http_client import get_http_client
+
+PAGES = {
+    "/": "<html><head><title>Brella</title><meta name='description' content='Event networking'></head>"
+         "<body><div class='features'><h3>Matchmaking</h3><h3>Meetings</h3></div>"
+         "<a href='/events/mashup'>Mashup 2025</a><a href='/about'>About</a></body></html>",
+    "/events/mashup": "<html><head><title>Mashup</title></head><body><main>"
+                      "<p>Mashup 2025 brings founders together.</p><p>Agenda</p></main></body></html>",
+    "/long": "<html><body><nav><p>Menu</p></nav><article>"
+             + "".join(f"<p>Paragraph {i} about Mashup 2025.</p>" for i in range(500))
+             + "</article></body></html>",
+    "/slow/brella.io": "<html><body><article><p>Late page</p></article></body></html>",
+}
+
+
+class FakeBrellaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._send(PAGES.get(self.path.split("?")[0], "<html><body><p>Not here</p></body></html>"), "text/html")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        organic = [
+            {"title": "Mashup", "link": f"{base}/events/mashup?brella.io", "snippet": "Founders event"},
+            {"title": "Elsewhere", "link": "https://example.com/", "snippet": "Skipped"},
+            {"title": "Late", "link": f"{base}/slow/brella.io", "snippet": "Slow page"},
+        ]
+        self._send(json.dumps({"organic": organic}), "application/json")
+
+    def _send(self, body, content_type):
+        body = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_brella(monkeypatch):
+    monkeypatch.setenv("BRELLA_HTTP_CACHE", "0")
+    monkeypatch.setenv("BRELLA_SERPER_CACHE", "0")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBrellaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(brella_scraper, "MAIN_URL", base + "/")
+    monkeypatch.setattr(brella_scraper, "SERPER_URL", base + "/search")
+    yield base
+    server.shutdown()
+
+
+def test_sync_and_async_direct_scrape_match(fake_brella, monkeypatch):
+    monkeypatch.delenv("SERPER_API_KEY", raising=False)
+    scraper = BrellaScraper()
+
+    sync_result = scraper._run("Mashup 2025", "events")
+    async_result = asyncio.run(scraper._arun("Mashup 2025", "events"))
+
+    assert sync_result == async_result
+    data = json.loads(sync_result)
+    assert data["main_site_info"]["features"] == ["Matchmaking", "Meetings"]
+    assert data["search_results"][0]["content_summary"] == ["Mashup 2025 brings founders together."]
+
+
+def test_sync_and_async_serper_search_match(fake_brella, monkeypatch):
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    scraper = BrellaScraper()
+
+    sync_result = scraper._run("Mashup 2025", "events")
+    async_result = asyncio.run(scraper._arun("Mashup 2025", "events"))
+
+    assert sync_result == async_result
+    data = json.loads(sync_result)
+    assert [entry["title"] for entry in data] == ["Mashup", "Late"]
+    assert data[0]["content"] == "Mashup 2025 brings founders together.\n\nAgenda"
+
+
+# Stub fetch delays: pages finish in reverse order and one outlasts the budget
+DELAYS = {"https://a.test/": 0.2, "https://b.test/": 0.1, "https://slow.test/": 3.0, "https://c.test/": 0.0}
+
+
+def stub_fetch(self, url):
+    if url == "https://broken.test/":
+        raise ValueError("bad page")
+    time.sleep(DELAYS[url])
+    return f"content of {url}"
+
+
+async def stub_afetch(self, url):
+    if url == "https://broken.test/":
+        raise ValueError("bad page")
+    await asyncio.sleep(DELAYS[url])
+    return f"content of {url}"
+
+
+def test_page_fetches_keep_url_order_and_stop_at_the_budget(monkeypatch):
+    monkeypatch.setattr(BrellaScraper, "_get_page_content", stub_fetch)
+    monkeypatch.setattr(BrellaScraper, "_aget_page_content", stub_afetch)
+    scraper = BrellaScraper(fetch_workers=5, fetch_budget=0.5)
+    urls = list(DELAYS) + ["https://broken.test/"]
+    expected = ["content of https://a.test/", "content of https://b.test/", brella_scraper.FETCH_TIMEOUT_CONTENT,
+                "content of https://c.test/", "Error retrieving content: bad page"]
+
+    start = time.monotonic()
+    assert scraper._fetch_pages(urls) == expected
+    assert time.monotonic() - start < 1.0
+
+    start = time.monotonic()
+    assert asyncio.run(scraper._afetch_pages(urls)) == expected
+    assert time.monotonic() - start < 1.0
+
+
+def test_page_content_download_is_capped(fake_brella):
+    scraper = BrellaScraper(max_page_bytes=300)
+
+    content = scraper._get_page_content(fake_brella + "/long")
+
+    assert content.startswith("Paragraph 0 about Mashup 2025.")
+    assert "Menu" not in content
+    assert "Paragraph 20 " not in content
+
+
+def test_shared_memo_coalesces_identical_calls(fake_brella, monkeypatch):
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    http = get_http_client()
+    memo = CallMemo()
+    scrapers = [BrellaScraper(memo=memo) for _ in range(5)]
+
+    before = http.stats()["requests"]
+    single = BrellaScraper()._run("Mashup 2025", "events")
+    single_requests = http.stats()["requests"] - before
+
+    before = http.stats()["requests"]
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        terms = ["Mashup 2025", "mashup  2025", "Mashup 2025 (category: events)", "MASHUP 2025", "Mashup 2025"]
+        results = list(executor.map(lambda pair: pair[0]._run(pair[1], "events"), zip(scrapers, terms)))
+    results.append(asyncio.run(scrapers[0]._arun("Mashup 2025", "events")))
+
+    assert http.stats()["requests"] - before == single_requests
+    assert all(result == single for result in results)
+    assert memo.stats() == {"calls": 6, "executed": 1, "deduplicated": 5}
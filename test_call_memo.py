@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tools.call_memo import CallMemo
+
+
+def test_concurrent_identical_calls_run_once():
+    memo = CallMemo()
+    runs = []
+
+    def slow():
+        runs.append(threading.get_ident())
+        time.sleep(0.2)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: memo.call("key", slow), range(8)))
+
+    assert results == ["result"] * 8
+    assert len(runs) == 1
+    assert memo.stats() == {"calls": 8, "executed": 1, "deduplicated": 7}
+
+
+def test_async_callers_share_sync_entries():
+    memo = CallMemo()
+    memo.call("key", lambda: "sync")
+
+    async def never():
+        raise AssertionError("should be memoized")
+
+    assert asyncio.run(memo.acall("key", never)) == "sync"
+
+
+def test_rejected_results_and_exceptions_are_not_memoized():
+    memo = CallMemo()
+    assert memo.call("key", lambda: "Error: down", keep=lambda r: not r.startswith("Error")) == "Error: down"
+    assert memo.call("key", lambda: "ok") == "ok"
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        memo.call("other", fail)
+    assert memo.call("other", lambda: "recovered") == "recovered"
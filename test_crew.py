@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import pytest
+from crewai import Agent
+
+
+@pytest.fixture
+def research_crew(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    running = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def execute_task(agent, task, context=None, tools=None):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(1)
+        with lock:
+            running["now"] -= 1
+        return f"{agent.role} for {task.description[:20]}"
+
+    monkeypatch.setattr(Agent, "execute_task", execute_task)
+    from crew import BrellaResearchCrew
+    return BrellaResearchCrew(), running
+
+
+def test_parallel_mode_runs_each_task_in_its_own_crew(research_crew):
+    crew_instance, _ = research_crew
+    crew = crew_instance.crew(parallel=True, max_concurrency=2)
+
+    assert [len(task_crew.tasks) for task_crew in crew.crews] == [1, 1, 1, 1, 1]
+    assert crew.tasks == crew_instance.tasks()
+    assert crew.max_concurrency == 2
+
+
+def test_parallel_kickoff_fills_every_task_output(research_crew):
+    crew_instance, running = research_crew
+    crew_instance.crew(parallel=True, max_concurrency=3).kickoff(
+        inputs={"search_term": "Mashup", "attendee_type": "founders"}
+    )
+
+    assert running["peak"] == 3
+    assert [task.output.raw.split(" for ")[0] for task in crew_instance.tasks()] == [
+        "Brella Event Specialist", "Brella Company Analyst", "Brella Networking Specialist",
+        "Startup Founder Researcher", "Event Attendee Researcher"
+    ]
+
+
+def test_crew_pool_reuses_agents_with_fresh_run_state(research_crew):
+    from concurrent.futures import ThreadPoolExecutor
+    from crew import BrellaResearchCrew, CrewPool
+
+    pool = CrewPool(BrellaResearchCrew)
+    first = pool.acquire()
+    first_task, first_memo = first.event_task, first.memo
+    second = pool.acquire()
+
+    assert second is first
+    assert second.event_task is not first_task
+    assert second.memo is not first_memo
+    assert all(tool.memo is second.memo for agent in second.agents() for tool in agent.tools)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(pool.acquire).result() is not first
+
+
+def test_new_crew_builds_a_single_call_memo(research_crew, monkeypatch):
+    import crew
+    built = []
+    monkeypatch.setattr(crew, "CallMemo", lambda: built.append(object()) or built[-1])
+
+    crew_instance = crew.BrellaResearchCrew()
+
+    assert len(built) == 1
+    assert all(tool.memo is built[0] for agent in crew_instance.agents() for tool in agent.tools)
+
+
+def test_research_brella_reports_each_section_as_its_task_finishes(research_crew, monkeypatch):
+    monkeypatch.setenv("BRELLA_RESULT_CACHE", "0")
+    import main
+
+    finished = []
+    result = main.research_brella("Mashup", on_section=lambda name, section: finished.append((name, section)))
+
+    assert [name for name, _ in finished] == ["events", "companies", "networking", "founders", "attendees"]
+    assert all(result.sections()[name] is section for name, section in finished)
+    assert all(section.found and section.text for _, section in finished)
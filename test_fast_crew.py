@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+from fast_crew import split_report
+
+
+def test_json_report_is_split_into_full_crew_keys():
+    report = '```json\n{"Events": [{"name": "Mashup 2025"}], "companies": "Acme", "founders": [], "attendees_found": [{"name": "Ada"}]}\n```'
+    sections = split_report(report)
+
+    assert sections["events"] == [{"name": "Mashup 2025"}]
+    assert sections["companies"] == "Acme"
+    assert sections["networking"] == "Not available"
+    assert sections["founders"] == "Not available"
+    assert sections["attendees"] == [{"name": "Ada"}]
+
+
+def test_markdown_report_is_split_on_headings():
+    report = "# Brella report\n## 1. Events\nMashup 2025 in Helsinki\n**Networking:**\nMatchmaking\n### Founders\nAda, Acme"
+    sections = split_report(report)
+
+    assert sections["events"] == "Mashup 2025 in Helsinki"
+    assert sections["networking"] == "Matchmaking"
+    assert sections["founders"] == "Ada, Acme"
+    assert sections["companies"] == "Not available"
+
+
+def test_unstructured_report_is_kept_under_events():
+    assert split_report("Nothing structured here")["events"] == "Nothing structured here"
+    assert split_report("")["events"] == "Not available"
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+
+import gspread
+
+import tools.google_sheets_exporter as google_sheets_exporter
+from tools.google_sheets_exporter import GoogleSheetsExporter
+from tools.rate_limiter import RateLimiter
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {"Retry-After": "0"}
+        self.text = ""
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+
+
+class FakeWorksheet:
+    def __init__(self, title, rows=1000, cols=20, failures=0, header=()):
+        self.title = title
+        self.shape = (rows, cols)
+        self.calls = []
+        self.writes = []
+        self.appended = []
+        self.header = list(header)
+        self.failures = failures
+        self._lock = threading.Lock()
+
+    @property
+    def col_count(self):
+        return self.shape[1]
+
+    def row_values(self, row):
+        self.calls.append(f"row_values {row}")
+        return self.header
+
+    def update(self, values, range_name):
+        self.calls.append(f"update {range_name}")
+        self.header = values[0]
+
+    def append_rows(self, values, insert_data_option=None, table_range=None):
+        if self.failures:
+            self.failures -= 1
+            raise gspread.exceptions.APIError(FakeResponse(503))
+        self.calls.append(f"append_rows {len(values)}")
+        self.appended.extend(values)
+
+    def clear(self):
+        self.calls.append("clear")
+
+    def resize(self, rows=None, cols=None):
+        self.calls.append("resize")
+        self.shape = (rows or self.shape[0], cols or self.shape[1])
+
+    def batch_update(self, data):
+        with self._lock:
+            if self.failures:
+                self.failures -= 1
+                raise gspread.exceptions.APIError(FakeResponse(429))
+            self.writes.extend(data)
+
+
+class FakeSpreadsheet:
+    url = "https://docs.google.com/spreadsheets/d/test"
+
+    def __init__(self, worksheets=()):
+        self.worksheets = {worksheet.title: worksheet for worksheet in worksheets}
+
+    def worksheet(self, title):
+        if title not in self.worksheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.worksheets[title]
+
+    def add_worksheet(self, title, rows, cols):
+        self.worksheets[title] = FakeWorksheet(title, rows, cols)
+        return self.worksheets[title]
+
+
+def exporter(spreadsheet, monkeypatch, rate="100", **kwargs):
+    if rate is None:
+        monkeypatch.delenv("BRELLA_RATE_SHEETS", raising=False)
+        monkeypatch.delenv("BRELLA_RATE_SHEETS_BURST", raising=False)
+    else:
+        monkeypatch.setenv("BRELLA_RATE_SHEETS", rate)
+    limiter = RateLimiter()
+    monkeypatch.setattr(google_sheets_exporter, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setenv("GOOGLE_SHEETS_BACKOFF", "0.01")
+    sheets = GoogleSheetsExporter(spreadsheet_url=spreadsheet.url, **kwargs)
+    sheets.client = type("Client", (), {"open_by_key": lambda self, key: spreadsheet})()
+    return sheets
+
+
+def test_new_worksheet_is_sized_to_the_data_and_written_in_chunks(monkeypatch):
+    spreadsheet = FakeSpreadsheet()
+    rows = [{"search_term": f"Event {i}", "events": "Found", "tags": ["ai"] if i == 0 else None} for i in range(25)]
+
+    sheets = exporter(spreadsheet, monkeypatch, chunk_cells=30, workers=3)
+    assert sheets.export_to_sheet(rows, worksheet_name="Today") == spreadsheet.url
+
+    worksheet = spreadsheet.worksheets["Today"]
+    assert worksheet.shape == (26, 3)
+    assert sorted(write["range"] for write in worksheet.writes) == ["A11:C20", "A1:C10", "A21:C26"]
+    writes = sorted(worksheet.writes, key=lambda write: int(write["range"].split(":")[0][1:]))
+    values = [row for write in writes for row in write["values"]]
+    assert values[:2] == [["search_term", "events", "tags"], ["Event 0", "Found", '["ai"]']]
+    assert values[-1] == ["Event 24", "Found", ""]
+
+
+class SlowWorksheet(FakeWorksheet):
+    def batch_update(self, data):
+        time.sleep(0.2)
+        super().batch_update(data)
+
+
+def test_chunks_are_written_in_parallel_within_the_default_sheets_quota(monkeypatch):
+    rows = [{"search_term": f"Event {i}"} for i in range(15)]
+    elapsed = {}
+    for workers in (1, 4):
+        spreadsheet = FakeSpreadsheet([SlowWorksheet("Today")])
+        # Default sheets bucket: 1 write/s with a burst of 20, so 8 chunks need not queue
+        sheets = exporter(spreadsheet, monkeypatch, rate=None, chunk_cells=2, workers=workers)
+        start = time.monotonic()
+        assert sheets.export_to_sheet(rows, worksheet_name="Today")
+        elapsed[workers] = time.monotonic() - start
+        assert len(spreadsheet.worksheets["Today"].writes) == 8
+
+    assert elapsed[1] >= 1.6
+    assert elapsed[4] < elapsed[1] / 3
+
+
+def test_existing_worksheet_is_resized_once_and_throttled_chunks_retried(monkeypatch):
+    worksheet = FakeWorksheet("Today", failures=2)
+    spreadsheet = FakeSpreadsheet([worksheet])
+
+    sheets = exporter(spreadsheet, monkeypatch, chunk_cells=1000)
+    assert sheets.export_to_sheet([{"search_term": "Slush", "events": "Found"}], worksheet_name="Today")
+
+    assert worksheet.calls == ["clear", "resize"]
+    assert worksheet.shape == (2, 2)
+    assert worksheet.writes == [{"range": "A1:B2", "values": [["search_term", "events"], ["Slush", "Found"]]}]
+    assert google_sheets_exporter.get_rate_limiter().stats()["sheets"]["throttled"] == 2
+
+
+def test_export_gives_up_after_the_retries(monkeypatch):
+    worksheet = FakeWorksheet("Today", failures=3)
+    sheets = exporter(FakeSpreadsheet([worksheet]), monkeypatch, max_retries=2)
+
+    assert sheets.export_to_sheet([{"search_term": "Slush"}], worksheet_name="Today") is None
+    assert worksheet.writes == []
+
+
+def test_append_reads_only_the_header_and_sends_only_the_new_rows(monkeypatch):
+    worksheet = FakeWorksheet("Today", cols=2, failures=1, header=["search_term", "events"])
+    spreadsheet = FakeSpreadsheet([worksheet])
+    rows = [{"events": "Found", "search_term": f"Event {i}", "mode": "fast"} for i in range(5)]
+
+    sheets = exporter(spreadsheet, monkeypatch, chunk_cells=9)
+    assert sheets.append_to_sheet(rows, worksheet_name="Today") == spreadsheet.url
+
+    # A new column is added to the header; rows follow the header's column order
+    assert worksheet.calls == ["row_values 1", "resize", "update A1", "append_rows 3", "append_rows 2"]
+    assert worksheet.header == ["search_term", "events", "mode"]
+    assert worksheet.appended[0] == ["Event 0", "Found", "fast"]
+    assert len(worksheet.appended) == 5
+
+
+def test_append_to_an_empty_or_missing_worksheet_writes_the_header(monkeypatch):
+    worksheet = FakeWorksheet("Today")
+    spreadsheet = FakeSpreadsheet([worksheet])
+
+    sheets = exporter(spreadsheet, monkeypatch)
+    assert sheets.append_to_sheet([{"search_term": "Slush"}], worksheet_name="Today")
+    assert worksheet.calls == ["row_values 1", "update A1", "append_rows 1"]
+    assert worksheet.appended == [["Slush"]]
+
+    assert sheets.append_to_sheet([{"search_term": "Slush"}], worksheet_name="Tomorrow")
+    created = spreadsheet.worksheets["Tomorrow"]
+    assert created.shape == (2, 1)
+    assert created.writes == [{"range": "A1:A2", "values": [["search_term"], ["Slush"]]}]
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import os
+
+import pytest
+
+from benchmarks.bench_html_extract import soup_helpers
+from tools.html_extract import extract_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "benchmarks", "fixtures")
+
+
+@pytest.mark.parametrize("fixture, search_term", [
+    ("brella_home.html", "mashup"),
+    ("brella_home.html", "no such term"),
+    ("brella_event.html", "Mashup 2025"),
+])
+def test_extract_page_matches_soup_helpers(fixture, search_term):
+    with open(os.path.join(FIXTURES, fixture), encoding="utf-8") as f:
+        html = f.read()
+    assert extract_page(html, search_term) == soup_helpers(html, search_term)
+
+
+def test_extract_page_handles_empty_documents():
+    page = extract_page("", "mashup")
+
+    assert page["title"] is None
+    assert page["description"] == "No description available"
+    assert page["features"] == ["No specific features extracted"]
+    assert page["links"] == []
+    assert page["content_summary"] == []
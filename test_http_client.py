@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import tools.response_cache as response_cache
+from tools.async_http import AsyncHttpClient
+from tools.http_client import HttpClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def respond(self):
+        Handler.hits[(self.command, self.path)] = Handler.hits.get((self.command, self.path), 0) + 1
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        status = int(self.path.split("/")[2]) if self.path.startswith("/status/") else 200
+        body = self.server.bodies.get(self.path, b"ok")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.bodies = {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_requests_to_one_host_reuse_a_pooled_connection(server):
+    _, url = server
+    client = HttpClient(max_retries=0)
+
+    for _ in range(3):
+        assert client.get(f"{url}/page").text == "ok"
+
+    stats = client.stats()
+    assert (stats["requests"], stats["errors"]) == (3, 0)
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+    assert list(stats["hosts"].values()) == [{"connections_opened": 1, "requests": 3}]
+
+
+def test_server_errors_are_retried_for_get_but_not_post(server):
+    _, url = server
+    client = HttpClient(max_retries=2, backoff_factor=0)
+
+    assert client.get(f"{url}/status/500").status_code == 500
+    assert client.post(f"{url}/status/500", data=b"search").status_code == 500
+    assert Handler.hits == {("GET", "/status/500"): 3, ("POST", "/status/500"): 1}
+
+
+def test_async_client_retries_server_errors_for_get_but_not_post(server):
+    _, url = server
+    client = AsyncHttpClient(max_retries=2, backoff_factor=0)
+
+    assert asyncio.run(client.get(f"{url}/status/503")).status_code == 503
+    assert asyncio.run(client.post(f"{url}/status/503", content=b"search")).status_code == 503
+    assert Handler.hits == {("GET", "/status/503"): 3, ("POST", "/status/503"): 1}
+
+
+def test_download_cap_only_flags_bodies_longer_than_the_cap(server):
+    httpd, url = server
+    httpd.bodies = {"/exact": b"x" * 100, "/over": b"x" * 101}
+    client = HttpClient(max_retries=0)
+    async_client = AsyncHttpClient(max_retries=0)
+
+    for path, truncated in (("/exact", False), ("/over", True)):
+        _, content, flag = client.download(f"{url}{path}", max_bytes=100)
+        assert (len(content), flag) == (100, truncated)
+        _, content, flag = asyncio.run(async_client.download(f"{url}{path}", max_bytes=100))
+        assert (len(content), flag) == (100, truncated)
+
+
+def test_async_backoff_does_not_hold_the_concurrency_slot(server):
+    _, url = server
+    client = AsyncHttpClient(max_concurrency=1, max_retries=1, backoff_factor=0.5)
+    finished = []
+
+    async def fetch(path):
+        await client.get(f"{url}{path}")
+        finished.append(path)
+
+    async def run():
+        retried = asyncio.ensure_future(fetch("/status/503"))
+        await asyncio.sleep(0.1)  # let the first request fail and start backing off
+        await asyncio.gather(retried, fetch("/page"))
+
+    asyncio.run(run())
+    assert finished == ["/page", "/status/503"]
+
+
+@pytest.mark.parametrize("cache", ["0", "1"])
+def test_capped_pages_without_a_content_type_get_the_default_encoding(server, monkeypatch, tmp_path, cache):
+    httpd, url = server
+    httpd.bodies = {"/plain": "Mashup 2025 – Helsinki".encode()}
+    monkeypatch.setenv("BRELLA_HTTP_CACHE", cache)
+    monkeypatch.setattr(response_cache, "_cache", response_cache.ResponseCache(str(tmp_path / "responses.sqlite")))
+
+    response = HttpClient(max_retries=0).get_cached(f"{url}/plain", max_bytes=1000)
+    assert (response.encoding, response.text) == ("utf-8", "Mashup 2025 – Helsinki")
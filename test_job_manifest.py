@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+import json
+
+from tools.job_manifest import JobManifest
+from tools.research_result import ResearchResult, error_result, parse_section
+
+ITEMS = [("Mashup 2025", "events", "founders"), ("Slush", "people", "investors"), ("mashup  2025", "Events", "founders")]
+
+
+def ok(term):
+    return ResearchResult(term, **{section: parse_section(section, "Found") for section in ("events", "companies", "networking", "founders", "attendees")})
+
+
+def failed(term):
+    return error_result(term, "all", "founders", "full", "down", "")
+
+
+def planned(manifest, max_retries=0, shard=None):
+    """Row keys of each run planned for the current CSV"""
+    manifest.plan_runs(max_retries, shard)
+    return [[row[0] for row in rows] for item, rows in manifest.iter_runs()]
+
+
+def test_row_keys_follow_content_and_occurrence(tmp_path):
+    manifest = JobManifest(str(tmp_path / "out.manifest.sqlite"))
+    keys = manifest.add_rows(ITEMS)
+    assert len(set(keys)) == 3
+    # Dropping the first row keeps the identity of the others
+    assert manifest.add_rows(ITEMS[1:]) == [keys[1], keys[0]]
+
+
+def test_done_rows_are_skipped_and_failed_rows_retried_up_to_the_limit(tmp_path):
+    manifest = JobManifest(str(tmp_path / "out.manifest.sqlite"))
+    keys = manifest.add_rows(ITEMS)
+    assert planned(manifest) == [[keys[0], keys[2]], [keys[1]]]
+
+    manifest.mark_running(keys[0])
+    manifest.mark_running(keys[1])
+    manifest.mark_finished(keys[0], ok("a").to_dict())
+    assert manifest.mark_finished(keys[1], failed("b").to_dict()) == "failed"
+
+    assert planned(manifest, max_retries=0) == [[keys[2]]]
+    assert planned(manifest, max_retries=1) == [[keys[1]], [keys[2]]]
+    assert manifest.counts() == {"pending": 1, "running": 0, "done": 1, "failed": 1}
+    assert [result["search_term"] for result in manifest.iter_results()] == ["a", "b"]
+
+
+def test_process_csv_resumes_an_interrupted_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    import main
+
+    csv_file = tmp_path / "rows.csv"
+    csv_file.write_text("Search Term,Category,Attendee Type\n" + "".join(f"{t},{c},{a}\n" for t, c, a in ITEMS))
+    output = tmp_path / "out.json"
+    calls = []
+    attempts = {}
+
+    def flaky(term, category, attendee_type, refresh=False, mode="full"):
+        calls.append(term)
+        attempts[term] = attempts.get(term, 0) + 1
+        return failed(term) if term == "Slush" and attempts[term] == 1 else ok(term)
+
+    monkeypatch.setattr(main, "research_brella", flaky)
+    main.process_csv(str(csv_file), str(output), max_workers=2)
+    # The two Mashup rows only differ in case and spacing and share one run
+    assert sorted(calls) == ["Mashup 2025", "Slush"]
+
+    calls.clear()
+    counts = main.process_csv(str(csv_file), str(output), max_workers=2, resume=True, max_retries=1)
+    assert calls == ["Slush"]
+    assert counts["done"] == 3
+    results = list(main.iter_results(str(output)))
+    assert [result.events.text for result in results] == ["Found"] * 3
+    assert [result.search_term for result in results] == [item[0] for item in ITEMS]
+    assert json.loads(output.read_text()) == [result.to_dict() for result in results]
+
+
+def test_expired_leases_are_reclaimed_and_late_results_dropped(tmp_path):
+    manifest = JobManifest(str(tmp_path / "out.manifest.sqlite"))
+    keys = manifest.add_rows(ITEMS[:2])
+
+    first = manifest.claim("worker-a", lease_seconds=60)
+    second = manifest.claim("worker-b", lease_seconds=0)
+    assert (first[0], second[0]) == (keys[0], keys[1])
+    assert manifest.claim("worker-c", lease_seconds=60)[0] == keys[1]
+    assert manifest.claim("worker-c", lease_seconds=60) is None
+
+    assert manifest.mark_finished(keys[1], ok("late").to_dict(), owner="worker-b") is None
+    assert manifest.mark_finished(keys[1], ok("b").to_dict(), owner="worker-c") == "done"
+    assert manifest.renew(keys[0], "worker-a", 60)
+    assert manifest.unfinished() == 1
+
+
+def test_claims_respect_shards(tmp_path):
+    manifest = JobManifest(str(tmp_path / "out.manifest.sqlite"))
+    keys = manifest.add_rows(ITEMS)
+
+    assert manifest.claim("w", 60, shard=(1, 2))[0] == keys[1]
+    assert manifest.claim("w", 60, shard=(1, 2)) is None
+    assert planned(manifest, shard=(0, 2)) == [[keys[0], keys[2]]]
+    assert planned(manifest, shard=(1, 2)) == [[keys[1]]]
+
+
+def test_claims_skip_rows_missing_from_the_current_csv(tmp_path):
+    manifest = JobManifest(str(tmp_path / "out.manifest.sqlite"))
+    keys = manifest.add_rows(ITEMS[:2], version="v1")
+    manifest.detach_rows(keep_version="v2")
+    manifest.add_rows(ITEMS[1:2], version="v2")
+
+    assert manifest.claim("w", 60)[0] == keys[1]
+    assert manifest.claim("w", 60) is None
+    assert manifest.unfinished() == 1
+
+
+def test_rows_running_outside_the_queue_are_leased(tmp_path):
+    manifest = JobManifest(str(tmp_path / "out.manifest.sqlite"))
+    keys = manifest.add_rows(ITEMS[:1])
+    manifest.mark_running(keys[0], "batch", lease_seconds=60)
+
+    assert manifest.claim("queue-worker", 60) is None
+    assert manifest.renew(keys[0], "batch", 60)
+
+
+def test_queue_run_on_an_edited_csv_leaves_out_dropped_rows(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    import main
+
+    monkeypatch.setattr(main, "research_brella", lambda term, category, attendee_type, refresh=False, mode="full": ok(term))
+    csv_file = tmp_path / "rows.csv"
+    output = tmp_path / "out.json"
+    csv_file.write_text("Search Term,Category,Attendee Type\n" + "".join(f"{t},{c},{a}\n" for t, c, a in ITEMS[:2]))
+    main.process_csv(str(csv_file), str(output), max_workers=2, queue=True)
+
+    csv_file.write_text("Search Term,Category,Attendee Type\nSlush,people,investors\nArctic15,all,founders\n")
+    counts = main.process_csv(str(csv_file), str(output), max_workers=2, queue=True)
+
+    assert counts["done"] == 2
+    assert [row["search_term"] for row in json.loads(output.read_text())] == ["Slush", "Arctic15"]
+
+
+WORKER = """
+import sys, time, main
+from tools.research_result import ResearchResult, parse_section
+main.research_brella = lambda term, category, attendee_type, refresh, mode: (time.sleep(0.1), ResearchResult(
+    term, category, attendee_type, events=parse_section("events", "Found")))[1]
+main.process_csv(sys.argv[1], sys.argv[2], max_workers=2, queue=True)
+"""
+
+
+def test_queue_workers_in_separate_processes_split_the_rows(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    csv_file = tmp_path / "rows.csv"
+    csv_file.write_text("Search Term,Category,Attendee Type\n" + "".join(f"Event {i},all,founders\n" for i in range(12)))
+    output = tmp_path / "out.json"
+    env = dict(os.environ, OPENAI_API_KEY="test", PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER, str(csv_file), str(output)], env=env,
+                                stdout=subprocess.DEVNULL, cwd=tmp_path) for _ in range(3)]
+    assert all(worker.wait(timeout=120) == 0 for worker in workers)
+
+    parts = [line for part in tmp_path.glob("out.*.jsonl") for line in part.read_text().splitlines()]
+    assert len(parts) == 12
+    assert [row["search_term"] for row in json.loads(output.read_text())] == [f"Event {i}" for i in range(12)]
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import json
+
+import pytest
+
+from tools.jsonl_writer import JsonlWriter, write_json_array
+
+
+@pytest.mark.parametrize("policy", ["always", "interval", "never"])
+def test_rows_are_appended_one_per_line(tmp_path, policy):
+    path = tmp_path / "results.jsonl"
+    with JsonlWriter(str(path), fsync=policy) as writer:
+        writer.write({"search_term": "Mashup", "events": "Found"})
+        writer.write({"search_term": "Slush", "events": "Not available"})
+
+    assert [json.loads(line)["search_term"] for line in path.read_text().splitlines()] == ["Mashup", "Slush"]
+
+
+def test_json_array_is_streamed_with_the_json_dump_layout(tmp_path):
+    rows = [{"search_term": "Mashup", "events": {"status": "found", "text": "Found"}}, {"search_term": "Slush"}]
+    json_path = tmp_path / "results.json"
+
+    assert write_json_array((row for row in rows), str(json_path)) == 2
+    assert json_path.read_text() == json.dumps(rows, indent=2)
+
+    assert write_json_array(iter(()), str(json_path)) == 0
+    assert json_path.read_text() == "[]"
+    assert [path.name for path in tmp_path.iterdir()] == ["results.json"]
+
+
+def test_unknown_fsync_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        JsonlWriter(str(tmp_path / "results.jsonl"), fsync="sometimes")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_importing_main_is_cheap_and_side_effect_free():
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    script = ("import sys, main; "
+              "print(sorted(name for name in ('crewai', 'gspread', 'oauth2client', 'pandas') if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=HERE, env=env, capture_output=True, text=True, timeout=60)
+
+    # No sys.exit for the missing key, no banners, no heavy imports
+    assert result.returncode == 0
+    assert result.stdout == "[]\n"
+
+
+def test_tools_use_the_patched_sqlite3():
+    pytest.importorskip("pysqlite3")
+    script = "import sys, main, tools.cache_store; print(tools.cache_store.sqlite3.__name__)"
+    result = subprocess.run([sys.executable, "-c", script], cwd=HERE, capture_output=True, text=True, timeout=60)
+    assert result.stdout == "pysqlite3\n"
+
+
+def test_help_does_not_need_credentials():
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    result = subprocess.run([sys.executable, "main.py", "--help"], cwd=HERE, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0
+    assert "--csv" in result.stdout
+
+
+@pytest.mark.parametrize("flags, exported", [([], False), (["--sheets"], True)])
+def test_spreadsheet_url_alone_does_not_export(tmp_path, monkeypatch, flags, exported):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.delenv("GOOGLE_SPREADSHEET_URL", raising=False)
+    import main
+    from tools.research_result import ResearchResult
+
+    created = []
+    monkeypatch.setattr(main, "research_brella", lambda *args: ResearchResult(args[0]))
+    monkeypatch.setattr(main, "create_sheets_exporter", lambda url=None: created.append(url))
+    monkeypatch.setattr(sys, "argv", ["main.py", "--term", "Mashup", "--output", str(tmp_path / "out.json"),
+                                      "--spreadsheet-url", "https://docs.google.com/spreadsheets/d/x"] + flags)
+    main.main()
+
+    assert created == (["https://docs.google.com/spreadsheets/d/x"] if exported else [])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import tools.http_client as http_client
+import tools.rate_limiter as rate_limiter
+from tools.rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+def test_bucket_spreads_requests_over_the_rate():
+    bucket = TokenBucket("test", rate=20, burst=1)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: bucket.acquire(), range(11)))
+    # One token in the burst, the other ten at 20 per second
+    assert 0.45 <= time.monotonic() - start < 1.0
+    assert bucket.stats()["requests"] == 11
+
+
+def test_async_callers_share_the_bucket():
+    bucket = TokenBucket("test", rate=20, burst=1)
+
+    async def run():
+        await asyncio.gather(*(bucket.aacquire() for _ in range(6)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert 0.2 <= time.monotonic() - start < 0.6
+
+
+def test_429_halves_rate_and_honors_retry_after():
+    bucket = TokenBucket("test", rate=100)
+    bucket.on_response(429, "0.3")
+    assert bucket.rate == 50
+
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.25
+    assert bucket.stats()["throttled"] == 1
+
+    for _ in range(20):
+        bucket.on_response(200)
+    assert bucket.rate == 100
+
+
+def test_callers_queued_during_a_block_are_spaced_after_it():
+    bucket = TokenBucket("test", rate=20, burst=1)
+    bucket.on_response(429, "2")
+    start = time.monotonic()
+
+    def acquire(_):
+        bucket.acquire()
+        return time.monotonic() - start
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        woke = sorted(executor.map(acquire, range(5)))
+
+    # The rate is halved to 10/s, so after the block callers leave 0.1s apart, not together
+    assert 2.0 <= woke[0] < 2.3
+    assert all(0.08 <= later - earlier < 0.2 for earlier, later in zip(woke, woke[1:]))
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_urls_map_to_their_upstream(monkeypatch):
+    monkeypatch.setenv("BRELLA_RATE_SERPER", "0")
+    limiter = RateLimiter()
+    assert limiter.bucket_for_url("https://api.openai.com/v1/chat/completions").name == "openai"
+    assert limiter.bucket_for_url("https://next.brella.io/events/x").name == "brella"
+    assert limiter.bucket_for_url("https://google.serper.dev/search") is None
+    assert limiter.bucket_for_url("https://notbrella.io/") is None
+
+
+def test_http_client_retries_429_through_the_bucket(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "UPSTREAMS", {"example": ("BRELLA_RATE_EXAMPLE", 50.0, None, ("example.test",))})
+    limiter = RateLimiter()
+    monkeypatch.setattr(http_client, "get_rate_limiter", lambda: limiter)
+
+    client = http_client.HttpClient(max_retries=2)
+    responses = [FakeResponse(429, {"Retry-After": "0.2"}), FakeResponse(200)]
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kwargs: responses.pop(0))
+
+    start = time.monotonic()
+    assert client.get("https://example.test/search").status_code == 200
+    assert time.monotonic() - start >= 0.15
+    assert limiter.stats()["example"]["throttled"] == 1
+    assert limiter.stats()["example"]["requests"] == 2
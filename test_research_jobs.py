@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+
+from tools.research_jobs import ResearchJobs
+from tools.research_result import ResearchResult, Section, parse_section
+
+
+def wait_for(job, status="done", timeout=5):
+    deadline = time.time() + timeout
+    while job.snapshot()["status"] != status and time.time() < deadline:
+        time.sleep(0.01)
+    return job.snapshot()
+
+
+def test_sections_fill_in_while_the_job_runs():
+    release = threading.Event()
+    calls = []
+
+    def runner(search_term, category, attendee_type, refresh, mode, on_section=None):
+        calls.append(search_term)
+        on_section("events", parse_section("events", "events found"))
+        release.wait(5)
+        return ResearchResult(search_term, events=parse_section("events", "events found"),
+                              companies=parse_section("companies", "companies found"))
+
+    jobs = ResearchJobs(runner)
+    job = jobs.submit("Mashup 2025", "people")
+    deadline = time.time() + 5
+    while "events" not in job.snapshot()["sections"] and time.time() < deadline:
+        time.sleep(0.01)
+
+    snapshot = job.snapshot()
+    assert snapshot["status"] == "running"
+    assert snapshot["sections"] == {"events": Section("found", text="events found")}
+    # The same research while it runs reattaches instead of starting another job
+    assert jobs.submit("mashup  2025", "people") is job
+    assert jobs.get(job.id) is job
+
+    release.set()
+    snapshot = wait_for(job)
+    assert snapshot["sections"]["companies"].text == "companies found"
+    assert not snapshot["sections"]["attendees"].found
+    assert snapshot["result"].search_term == "Mashup 2025"
+    assert calls == ["Mashup 2025"]
+    assert jobs.submit("Mashup 2025", "people") is not job
+
+
+def test_refresh_does_not_reattach_to_a_cached_run():
+    release = threading.Event()
+    calls = []
+
+    def runner(search_term, category, attendee_type, refresh, mode, on_section=None):
+        calls.append(refresh)
+        release.wait(5)
+        return ResearchResult(search_term, cached=not refresh)
+
+    jobs = ResearchJobs(runner)
+    cached = jobs.submit("Mashup 2025")
+    refreshed = jobs.submit("Mashup 2025", refresh=True)
+    assert refreshed is not cached
+    assert jobs.submit("mashup 2025", refresh=True) is refreshed
+
+    release.set()
+    assert wait_for(refreshed)["result"].cached is False
+    assert sorted(calls) == [False, True]
+
+
+def test_failed_jobs_report_the_error_and_expire():
+    def runner(**params):
+        raise RuntimeError("boom")
+
+    jobs = ResearchJobs(runner, ttl=0)
+    job = jobs.submit("Slush")
+    assert wait_for(job, "failed")["error"] == "boom"
+
+    time.sleep(0.01)
+    jobs.submit("Other")
+    assert jobs.get(job.id) is None
+
+
+def test_jobs_waiting_for_a_worker_are_queued():
+    release = threading.Event()
+
+    def runner(search_term, category, attendee_type, refresh, mode, on_section=None):
+        release.wait(5)
+        return ResearchResult(search_term)
+
+    jobs = ResearchJobs(runner, max_workers=1)
+    first = jobs.submit("Mashup 2025")
+    second = jobs.submit("Slush")
+    wait_for(first, "running")
+
+    assert second.snapshot()["status"] == "queued"
+    assert jobs.submit("slush") is second
+
+    release.set()
+    assert wait_for(second)["status"] == "done"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+from tools.research_result import (SECTIONS, CompanyRecord, EventRecord, PersonRecord, ResearchResult,
+                                   error_result, parse_section)
+
+
+def test_json_records_are_parsed_into_typed_records_next_to_the_raw_output():
+    output = '```json\n{"events": [{"Event Name": "Mashup 2025", "dates": "May 5", "city": "Helsinki", "capacity": 300}]}\n```'
+    section = parse_section("events", output)
+
+    assert section.found
+    assert section.records == [EventRecord(name="Mashup 2025", date="May 5", location="Helsinki", extra={"capacity": 300})]
+    assert section.text == output
+    assert section.summary() == "Mashup 2025 (May 5, Helsinki)"
+
+    people = parse_section("founders", [{"full_name": "Ada", "position": "CEO", "startup": "Acme"}, "Grace"])
+    assert people.records == [PersonRecord(name="Ada", role="CEO", company="Acme"), PersonRecord(name="Grace")]
+    assert parse_section("companies", {"company_name": "Acme", "sector": "AI"}).records == [CompanyRecord(name="Acme", industry="AI")]
+
+
+def test_json_inside_prose_or_mixed_objects_is_kept_as_text_only():
+    prose = 'Mashup 2025 is the main event. Details: [{"name": "Mashup 2025"}]. Slush and Web Summit also have founder tracks.'
+    mixed = '{"events": [{"name": "Mashup 2025"}], "note": "Registration closes in May"}'
+
+    for output in (prose, mixed):
+        section = parse_section("events", output)
+        assert (section.status, section.records, section.text) == ("found", [], output)
+
+
+def test_only_explicit_markers_set_the_status():
+    assert parse_section("networking", '{"tips": ["Book meetings early"]}').text == '{"tips": ["Book meetings early"]}'
+    assert parse_section("companies", "Error-tracking startups: Sentry, Rollbar").found
+    assert parse_section("events", "Not available").status == "not_available"
+    assert parse_section("events", "[]").status == "not_available"
+    assert error_result("Slush", "all", "founders", "fast", "down", "").failed
+
+
+def test_results_round_trip_and_legacy_rows_load():
+    result = ResearchResult("Mashup", "events", events=parse_section("events", '[{"name": "Mashup 2025"}]'),
+                            networking=parse_section("networking", "Matchmaking"))
+    assert ResearchResult.from_dict(result.to_dict()) == result
+
+    legacy = ResearchResult.from_dict({"search_term": "Slush", "events": '[{"name": "Slush 2025"}]',
+                                       "founders": "Not available", "networking": "Error codes: none",
+                                       "summary": "dropped"})
+    assert legacy.events.records == [EventRecord(name="Slush 2025")]
+    assert not legacy.founders.found
+    assert legacy.networking.found
+    assert legacy.to_row()["events"] == "Slush 2025"
+
+    # Old error rows repeat the same error in every section
+    failed = ResearchResult.from_dict({"search_term": "Slush", **dict.fromkeys(SECTIONS, "Error: down")})
+    assert failed.failed and failed.events.text == "Error: down"
+
+
+def test_rows_sharing_a_run_get_their_own_identity():
+    result = ResearchResult("Slush", "people", "all", events=parse_section("events", "Found"))
+    row = result.for_row("slush ", "people", "investors")
+
+    assert (row.search_term, row.attendee_type, row.events) == ("slush ", "investors", result.events)
+    assert result.attendee_type == "all"
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import time
+
+from tools.response_cache import ResponseCache
+
+
+def test_fresh_entry_is_served_from_cache(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.sqlite"), ttl=60)
+    cache.resolve("https://www.brella.io/", None, 200, b"<p>home</p>", "utf-8", {"ETag": '"v1"'})
+
+    entry, fresh = cache.lookup("https://www.brella.io/")
+
+    assert fresh
+    assert entry.text == "<p>home</p>"
+    assert entry.from_cache
+
+
+def test_stale_entry_is_revalidated_with_validators(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.sqlite"), ttl=0)
+    cache.resolve("https://www.brella.io/", None, 200, b"<p>home</p>", "utf-8",
+                  {"ETag": '"v1"', "Last-Modified": "Mon, 01 Sep 2025 00:00:00 GMT"})
+
+    entry, fresh = cache.lookup("https://www.brella.io/")
+    assert not fresh
+    assert cache.conditional_headers(entry) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Sep 2025 00:00:00 GMT"
+    }
+
+    revalidated = cache.resolve("https://www.brella.io/", entry, 304, b"", None, {})
+    assert revalidated.text == "<p>home</p>"
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.sqlite"), ttl=60, max_bytes=25)
+    cache.resolve("https://www.brella.io/a", None, 200, b"a" * 10, "utf-8", {})
+    time.sleep(0.01)
+    cache.resolve("https://www.brella.io/b", None, 200, b"b" * 10, "utf-8", {})
+    time.sleep(0.01)
+    cache.record_hit("https://www.brella.io/a")
+    cache.resolve("https://www.brella.io/c", None, 200, b"c" * 10, "utf-8", {})
+
+    assert cache.lookup("https://www.brella.io/b")[0] is None
+    assert cache.lookup("https://www.brella.io/a")[0] is not None
+    assert cache.stats()["evicted"] == 1
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+from tools.result_cache import ResultCache
+
+
+def test_results_are_keyed_on_normalized_research(tmp_path):
+    cache = ResultCache(path=str(tmp_path / "results.sqlite"), ttl=60)
+    cache.put("Mashup 2025", "people", "founders", {"events": "found"})
+    cache.put("Mashup 2025", "people", "founders", {"events": "quick"}, mode="fast")
+
+    result, age = cache.get("  mashup 2025 ", "People", "founders")
+    assert result == {"events": "found"}
+    assert 0 <= age < 60
+    assert cache.get("mashup 2025", "people", "investors") == (None, None)
+    assert cache.get("mashup 2025", "people", "founders", "fast")[0] == {"events": "quick"}
+    assert cache.stats() == {"hits": 2, "misses": 1, "entries": 2}
+
+
+def test_expired_results_are_misses_and_pruned(tmp_path):
+    cache = ResultCache(path=str(tmp_path / "results.sqlite"), ttl=0)
+    cache.put("Mashup 2025", "all", "founders", {"events": "found"})
+
+    assert cache.get("Mashup 2025", "all", "founders") == (None, None)
+    cache.prune()
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+from tools.serper_cache import SerperCache, normalize_query
+
+
+def test_normalize_query_drops_category_suffix():
+    assert normalize_query("  Mashup   2025 (category: people)") == "mashup 2025"
+    assert normalize_query("MASHUP 2025") == "mashup 2025"
+
+
+def test_near_identical_queries_share_an_entry(tmp_path):
+    cache = SerperCache(path=str(tmp_path / "serper.sqlite"), ttl=60)
+    cache.put("Mashup 2025 (category: all)", "events", {"organic": [{"link": "https://www.brella.io/x"}]})
+
+    assert cache.get("mashup  2025", "events") == {"organic": [{"link": "https://www.brella.io/x"}]}
+    assert cache.get("mashup 2025", "people") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_expired_and_excess_entries_are_dropped(tmp_path):
+    cache = SerperCache(path=str(tmp_path / "serper.sqlite"), ttl=60, max_entries=2)
+    for term in ("one", "two", "three"):
+        cache.put(term, "all", {"q": term})
+
+    assert cache.get("one", "all") is None
+    assert cache.stats()["entries"] == 2
+
+    cache.ttl = 0
+    assert cache.get("three", "all") is None
+    assert cache.stats()["entries"] == 1
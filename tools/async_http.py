@@ -0,0 +1,224 @@
+import asyncio
+import os
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+import httpx
+from tools.http_client import DEFAULT_HEADERS, IDEMPOTENT_METHODS, RETRY_STATUSES
+from tools.rate_limiter import get_rate_limiter, parse_retry_after
+from tools.response_cache import CachedResponse, get_response_cache
+
+MAX_REDIRECTS = 10
+
+
+class AsyncHttpClient:
+    """
+    Async HTTP client that owns one event loop and one connection pool for the whole process.
+
+    Requests always execute on the client's background loop, so coroutines running on
+    any other loop (crew agents, asyncio.run in worker threads) share the same pool and
+    the same concurrency limit.
+    """
+
+    def __init__(self, max_concurrency=None, max_connections=None, max_retries=None,
+                 backoff_factor=None, timeout=None):
+        """
+        Initialize the async HTTP client and start its event loop thread.
+
+        Args:
+            max_concurrency: Requests allowed in flight at once.
+                             If None, will look for BRELLA_ASYNC_CONCURRENCY (default 20).
+            max_connections: Connection pool size.
+                             If None, will look for BRELLA_HTTP_POOL_MAXSIZE (default 20).
+            max_retries: Retries on connection errors and 429/5xx responses; 5xx only for
+                         idempotent methods, as in HttpClient.
+                         If None, will look for BRELLA_HTTP_RETRIES (default 3).
+            backoff_factor: Exponential backoff factor between retries.
+                            If None, will look for BRELLA_HTTP_BACKOFF (default 0.5).
+            timeout: Default request timeout in seconds.
+                     If None, will look for BRELLA_HTTP_TIMEOUT (default 10).
+        """
+        self.max_concurrency = int(max_concurrency or os.getenv("BRELLA_ASYNC_CONCURRENCY", 20))
+        self.max_connections = int(max_connections or os.getenv("BRELLA_HTTP_POOL_MAXSIZE", 20))
+        self.max_retries = int(max_retries if max_retries is not None else os.getenv("BRELLA_HTTP_RETRIES", 3))
+        self.backoff_factor = float(backoff_factor if backoff_factor is not None else os.getenv("BRELLA_HTTP_BACKOFF", 0.5))
+        self.timeout = float(timeout or os.getenv("BRELLA_HTTP_TIMEOUT", 10))
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="brella-async-http", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._error_count = 0
+
+    async def _setup(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Cookies are tracked per caller (see request), never on the shared client
+        no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            cookies=no_cookies,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            transport=httpx.AsyncHTTPTransport(retries=self.max_retries)
+        )
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the shared loop from synchronous code.
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def request(self, method, url, cookies=None, **kwargs):
+        """
+        Send a request through the shared pool. Can be awaited from any event loop.
+
+        Args:
+            method: HTTP method
+            url: Target URL
+            cookies: Optional httpx.Cookies jar, read before and updated after every hop
+            **kwargs: Passed through to httpx.AsyncClient.build_request
+
+        Returns:
+            httpx.Response with its body already read
+        """
+        response, _, _ = await asyncio.wrap_future(self.submit(self._request(method, url, cookies, None, **kwargs)))
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def download(self, url, max_bytes=None, cookies=None, **kwargs):
+        """
+        Async version of HttpClient.download.
+
+        Returns:
+            Tuple of (httpx.Response, body bytes, truncated)
+        """
+        return await asyncio.wrap_future(self.submit(self._request('GET', url, cookies, max_bytes, **kwargs)))
+
+    async def get_cached(self, url, max_bytes=None, **kwargs):
+        """
+        Async version of HttpClient.get_cached, sharing the same on-disk cache.
+
+        Returns:
+            CachedResponse
+        """
+        cache = get_response_cache()
+        if cache is None:
+            response, content, _ = await self.download(url, max_bytes, **kwargs)
+            return CachedResponse(url, response.status_code, content,
+                                  response.encoding, dict(response.headers))
+
+        entry, fresh = cache.lookup(url)
+        if fresh:
+            cache.record_hit(url)
+            return entry
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(cache.conditional_headers(entry))
+        response, content, truncated = await self.download(url, max_bytes, headers=headers, **kwargs)
+        return cache.resolve(url, entry, response.status_code, content,
+                             response.encoding, response.headers, cacheable=not truncated)
+
+    async def _request(self, method, url, cookies, max_bytes, **kwargs):
+        with self._lock:
+            self._request_count += 1
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with self._semaphore:
+                    result = await self._send_following_redirects(method, url, cookies, max_bytes, **kwargs)
+                status = result[0].status_code
+                # A 429 was rejected before doing anything; 5xx are only repeated for
+                # idempotent methods, so a login or a paid search POST is sent once
+                retry = status == 429 or (status in RETRY_STATUSES and method.upper() in IDEMPOTENT_METHODS)
+                if not retry or attempt == self.max_retries:
+                    return result
+                if status == 429 and get_rate_limiter().bucket_for_url(result[0].url):
+                    continue  # the bucket now holds the next request back until Retry-After
+                # Backoff runs outside the semaphore, so waiting retries do not block other requests
+                await asyncio.sleep(self._retry_delay(result[0], attempt))
+        except Exception:
+            with self._lock:
+                self._error_count += 1
+            raise
+
+    async def _send_following_redirects(self, method, url, cookies, max_bytes, **kwargs):
+        request = self._client.build_request(method, url, **kwargs)
+        for redirects in range(MAX_REDIRECTS + 1):
+            if cookies is not None:
+                request.headers.pop('Cookie', None)
+                cookies.set_cookie_header(request)
+            bucket = get_rate_limiter().bucket_for_url(request.url)
+            if bucket:
+                await bucket.aacquire()
+            response = await self._client.send(request, follow_redirects=False, stream=True)
+            if bucket:
+                bucket.on_response(response.status_code, response.headers.get('Retry-After'))
+            if cookies is not None:
+                cookies.extract_cookies(response)
+            if response.next_request is None or redirects == MAX_REDIRECTS:
+                break
+            await response.aclose()
+            request = response.next_request
+        return await self._read_body(response, max_bytes)
+
+    async def _read_body(self, response, max_bytes):
+        if not max_bytes:
+            return response, await response.aread(), False
+
+        chunks = []
+        size = 0
+        truncated = False
+        try:
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                # Read past the cap, so a body of exactly max_bytes is not reported as cut off
+                if size > max_bytes:
+                    truncated = True
+                    break
+        finally:
+            await response.aclose()
+        return response, b"".join(chunks)[:max_bytes], truncated
+
+    def _retry_delay(self, response, attempt):
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is not None:
+            return delay
+        return self.backoff_factor * (2 ** attempt)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self._request_count,
+                "errors": self._error_count
+            }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_async_http_client():
+    """
+    Return the process-wide AsyncHttpClient, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AsyncHttpClient()
+    return _client
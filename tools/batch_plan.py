@@ -0,0 +1,19 @@
+from tools.serper_cache import normalize_query
+
+
+def clean_term(search_term):
+    """Search term with surrounding and repeated whitespace removed, as it is researched"""
+    return " ".join((search_term or "").split())
+
+
+def row_identity(search_term, category, attendee_type):
+    """
+    Normalized (search term, category, attendee type) of a CSV row.
+
+    Terms are case-folded with whitespace collapsed; an empty category means "all"
+    and an empty attendee type "founders", as in process_csv.
+    """
+    return (normalize_query(search_term),
+            (category or "").strip().lower() or "all",
+            (attendee_type or "").strip().lower() or "founders")
+
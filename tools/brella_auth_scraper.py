@@ -1,13 +1,86 @@
 from crewai.tools import BaseTool
-import requests
+import asyncio
+import httpx
 import json
 from bs4 import BeautifulSoup
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlparse
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
+from typing import Any, Optional
+from tools.http_client import get_http_client
+from tools.async_http import get_async_http_client
+from tools.serper_cache import normalize_query
+from tools.session_store import SessionExpired, get_session_store
 
 load_dotenv()
 
+PORTAL_URL = "https://next.brella.io"
+
+LOGIN_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+PAGINATION_CLASS = re.compile(r'pagination|pager')
+EVENT_LINK_PATTERN = re.compile(r'/events?/[^/]+')
+ATTENDEE_PATH_PATTERN = re.compile(r'/(attendees|people|participants|members)\b')
+
+
+def is_portal_result(output) -> bool:
+    """Errors are not memoized, so a later identical call tries again"""
+    return not output.startswith('[{"error"')
+
+
+class _CrawlState:
+    """Frontier, limits and attendee de-duplication for one portal crawl"""
+
+    def __init__(self, start_urls, max_pages, max_records):
+        self.start_urls = set(start_urls)
+        self.frontier = deque(start_urls)
+        self.seen_urls = set(start_urls)
+        self.seen_people = set()
+        self.pages = 0
+        self.records = 0
+        self.max_pages = max_pages
+        self.max_records = max_records
+
+    def is_start(self, url):
+        return url in self.start_urls
+
+    def has_next(self):
+        return bool(self.frontier) and self.pages < self.max_pages
+
+    def next_url(self):
+        self.pages += 1
+        return self.frontier.popleft()
+
+    def finished(self, in_flight):
+        return self.records_exhausted() or not (in_flight or self.has_next())
+
+    def records_exhausted(self):
+        return self.records >= self.max_records
+
+    def add_page(self, people, links):
+        """Queue unseen links and return the page's new attendees within the record budget"""
+        for link in links:
+            if link not in self.seen_urls:
+                self.seen_urls.add(link)
+                self.frontier.append(link)
+        
+        attendees = []
+        for person in people:
+            key = (person['name'], person['company'], person['role'])
+            if key in self.seen_people or self.records_exhausted():
+                continue
+            self.seen_people.add(key)
+            self.records += 1
+            attendees.append(person)
+        return attendees
+
+
 class BrellaAuthScraperSchema(BaseModel):
     search_term: str = Field(..., description="The term to search for on authenticated Brella portal")
     category: str = Field(default="all", description="Category to filter results")
@@ -16,11 +89,26 @@ class BrellaAuthScraper(BaseTool):
     name: str = "Brella Authenticated Scraper"
     description: str = "Scrapes events and attendee data from authenticated Brella portal"
     args_schema: type[BaseModel] = BrellaAuthScraperSchema
+    max_pages: int = Field(default_factory=lambda: int(os.getenv("BRELLA_CRAWL_MAX_PAGES", 20)))
+    max_records: int = Field(default_factory=lambda: int(os.getenv("BRELLA_CRAWL_MAX_RECORDS", 200)))
+    crawl_workers: int = Field(default_factory=lambda: int(os.getenv("BRELLA_CRAWL_WORKERS", 4)))
+    memo: Optional[Any] = Field(default=None, exclude=True, description="CallMemo shared by the tools of one crew run")
     
     def _run(self, search_term: str, category: str = "all") -> str:
+        if self.memo is None:
+            return self.scrape_portal(search_term)
+        return self.memo.call((self.name, normalize_query(search_term)),
+                              lambda: self.scrape_portal(search_term), keep=is_portal_result)
+
+    async def _arun(self, search_term: str, category: str = "all") -> str:
+        if self.memo is None:
+            return await self.ascrape_portal(search_term)
+        return await self.memo.acall((self.name, normalize_query(search_term)),
+                                     lambda: self.ascrape_portal(search_term), keep=is_portal_result)
+
+    def scrape_portal(self, search_term: str) -> str:
         try:
-            session = requests.Session()
-            base_url = "https://next.brella.io"
+            base_url = PORTAL_URL
             
             email = os.getenv("BRELLA_EMAIL")
             password = os.getenv("BRELLA_PASSWORD")
@@ -28,83 +116,287 @@ class BrellaAuthScraper(BaseTool):
             if not email or not password:
                 return json.dumps([{"error": "Authentication credentials not found"}])
             
-            if self.perform_login(session, base_url, email, password):
-                return self.scrape_authenticated_events(session, base_url, search_term)
-            else:
-                return json.dumps([{"error": "Authentication failed"}])
+            store = get_session_store()
+            for attempt in range(2):
+                session, version = store.get_session(
+                    email, lambda new_session: self.perform_login(new_session, base_url, email, password)
+                )
+                if session is None:
+                    return json.dumps([{"error": "Authentication failed"}])
+                try:
+                    return self.scrape_authenticated_events(session, base_url, search_term)
+                except SessionExpired:
+                    store.invalidate(email, version)
+            
+            return json.dumps([{"error": "Authentication failed"}])
         except Exception as e:
             return json.dumps([{"error": f"Scraping error: {str(e)}"}])
 
-    def perform_login(self, session, base_url, email, password) -> bool:
+    async def ascrape_portal(self, search_term: str) -> str:
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+            base_url = PORTAL_URL
             
-            login_url = f"{base_url}/login"
-            response = session.get(login_url, headers=headers)
-            
-            if response.status_code != 200:
-                return False
+            email = os.getenv("BRELLA_EMAIL")
+            password = os.getenv("BRELLA_PASSWORD")
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            csrf_token = None
+            if not email or not password:
+                return json.dumps([{"error": "Authentication credentials not found"}])
             
-            csrf_inputs = soup.find_all('input', {'type': 'hidden'})
-            for inp in csrf_inputs:
-                name = inp.get('name', '').lower()
-                if 'csrf' in name or '_token' in name:
-                    csrf_token = inp.get('value')
-                    break
+            store = get_session_store()
+            for attempt in range(2):
+                # Logins are serialized by the store, so they run off the event loop
+                session, version = await asyncio.to_thread(
+                    store.get_session,
+                    email, lambda new_session: self.perform_login(new_session, base_url, email, password)
+                )
+                if session is None:
+                    return json.dumps([{"error": "Authentication failed"}])
+                
+                cookies = httpx.Cookies()
+                for cookie in session.cookies:
+                    cookies.set(cookie.name, cookie.value, domain=cookie.domain, path=cookie.path)
+                try:
+                    result = await self.ascrape_authenticated_events(cookies, base_url, search_term)
+                except SessionExpired:
+                    store.invalidate(email, version)
+                    continue
+                # The crawl updated the httpx jar, not the stored requests session
+                store.update_cookies(email, version, cookies.jar)
+                return result
             
-            login_data = {'email': email, 'password': password}
-            if csrf_token:
-                login_data['_token'] = csrf_token
+            return json.dumps([{"error": "Authentication failed"}])
+        except Exception as e:
+            return json.dumps([{"error": f"Scraping error: {str(e)}"}])
+
+    def perform_login(self, session, base_url, email, password) -> bool:
+        try:
+            login_url = f"{base_url}/login"
+            response = get_http_client().get(login_url, session=session, headers=LOGIN_HEADERS)
             
-            login_response = session.post(login_url, data=login_data, headers=headers)
+            if response.status_code != 200:
+                return False
             
-            if login_response.status_code == 200:
-                response_text = login_response.text.lower()
-                return any(indicator in response_text for indicator in ['dashboard', 'events', 'logout'])
+            login_data = self.build_login_data(response.content, email, password)
+            login_response = get_http_client().post(login_url, session=session, data=login_data, headers=LOGIN_HEADERS)
             
-            return False
+            return self.login_succeeded(login_response.status_code, login_response.text)
         except:
             return False
 
+    def build_login_data(self, login_page, email, password) -> dict:
+        soup = BeautifulSoup(login_page, 'html.parser')
+        csrf_token = None
+        
+        csrf_inputs = soup.find_all('input', {'type': 'hidden'})
+        for inp in csrf_inputs:
+            name = inp.get('name', '').lower()
+            if 'csrf' in name or '_token' in name:
+                csrf_token = inp.get('value')
+                break
+        
+        login_data = {'email': email, 'password': password}
+        if csrf_token:
+            login_data['_token'] = csrf_token
+        return login_data
+
+    def login_succeeded(self, status_code, response_text) -> bool:
+        if status_code == 200:
+            response_text = response_text.lower()
+            return any(indicator in response_text for indicator in ['dashboard', 'events', 'logout'])
+        
+        return False
+
     def scrape_authenticated_events(self, session, base_url, query: str) -> str:
         try:
-            events_data = []
-            endpoints = [f"{base_url}/dashboard", f"{base_url}/events"]
-            
-            for endpoint in endpoints:
-                try:
-                    response = session.get(endpoint)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        page_text = soup.get_text().lower()
-                        
-                        if query.lower() in page_text:
-                            attendees = self.extract_people_from_page(soup)
-                            events_data.append({
-                                'event': f'Event containing "{query}"',
-                                'attendees': attendees,
-                                'source': 'authenticated_portal',
-                                'url': endpoint
-                            })
-                except:
-                    continue
-            
-            if not events_data:
-                events_data = [{
-                    'message': f'Authenticated access successful for "{query}"',
-                    'status': 'logged_in',
-                    'attendees': []
-                }]
-            
-            return json.dumps(events_data, indent=2)
+            events_data = [
+                self.event_entry(url, attendees, query)
+                for url, attendees in self.crawl_attendees(session, base_url, query)
+            ]
+            return self.format_events(events_data, query)
+        except SessionExpired:
+            raise
+        except Exception as e:
+            return json.dumps([{"error": str(e)}])
+
+    async def ascrape_authenticated_events(self, cookies, base_url, query: str) -> str:
+        try:
+            events_data = [
+                self.event_entry(url, attendees, query)
+                async for url, attendees in self.acrawl_attendees(cookies, base_url, query)
+            ]
+            return self.format_events(events_data, query)
+        except SessionExpired:
+            raise
         except Exception as e:
             return json.dumps([{"error": str(e)}])
 
+    def crawl_attendees(self, session, base_url, query: str):
+        """
+        Crawl the portal for pages mentioning query, following pagination and event links.
+        
+        Up to crawl_workers pages are fetched at once, at most max_pages pages in total.
+        
+        Yields:
+            (page url, new attendee records on that page) as each page completes,
+            until max_records attendees have been yielded
+        """
+        crawl = _CrawlState(self.portal_endpoints(base_url), self.max_pages, self.max_records)
+        workers = max(1, self.crawl_workers)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        in_flight = {}
+        try:
+            while not crawl.finished(in_flight):
+                while len(in_flight) < workers and crawl.has_next():
+                    url = crawl.next_url()
+                    in_flight[executor.submit(self.fetch_portal_page, session, url, query, crawl.is_start(url))] = url
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    matched, people, links = future.result()
+                    attendees = crawl.add_page(people, links)
+                    if matched:
+                        yield url, attendees
+                    if crawl.records_exhausted():
+                        return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def acrawl_attendees(self, cookies, base_url, query: str):
+        """Async version of crawl_attendees"""
+        crawl = _CrawlState(self.portal_endpoints(base_url), self.max_pages, self.max_records)
+        workers = max(1, self.crawl_workers)
+        in_flight = {}
+        try:
+            while not crawl.finished(in_flight):
+                while len(in_flight) < workers and crawl.has_next():
+                    url = crawl.next_url()
+                    in_flight[asyncio.ensure_future(
+                        self.afetch_portal_page(cookies, url, query, crawl.is_start(url))
+                    )] = url
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = in_flight.pop(task)
+                    matched, people, links = task.result()
+                    attendees = crawl.add_page(people, links)
+                    if matched:
+                        yield url, attendees
+                    if crawl.records_exhausted():
+                        return
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def fetch_portal_page(self, session, url, query: str, start_page=False):
+        """
+        Fetch one portal page.
+        
+        Args:
+            start_page: Whether url is one of the portal_endpoints the crawl starts from
+        
+        Returns:
+            (whether the page mentions query, attendee records, links to crawl next)
+        """
+        try:
+            response = get_http_client().get(url, session=session)
+        except:
+            return False, [], []
+        return self.check_crawled_page(response, url, start_page, query)
+
+    async def afetch_portal_page(self, cookies, url, query: str, start_page=False):
+        """Async version of fetch_portal_page"""
+        try:
+            response = await get_async_http_client().get(url, cookies=cookies)
+        except:
+            return False, [], []
+        return self.check_crawled_page(response, url, start_page, query)
+
+    def check_crawled_page(self, response, url, start_page, query: str):
+        """
+        Raise SessionExpired on an auth failure; forbidden detail pages are logged and skipped.
+        """
+        if self.is_auth_failure(response.status_code, response.url, start_page):
+            raise SessionExpired(url)
+        if response.status_code in (401, 403):
+            print(f"Skipping portal page {url}: access forbidden ({response.status_code})")
+        return self.parse_crawled_page(response.status_code, response.content, str(response.url), query)
+
+    def parse_crawled_page(self, status_code, content, url, query: str):
+        try:
+            if status_code != 200:
+                return False, [], []
+            soup = BeautifulSoup(content, 'html.parser')
+            matched = query.lower() in soup.get_text().lower()
+            people = self.extract_people_from_page(soup) if matched else []
+            return matched, people, self.find_crawl_links(soup, url, query)
+        except:
+            return False, [], []
+
+    def find_crawl_links(self, soup, page_url, query: str) -> list:
+        """
+        Links worth following from a portal page: pagination, plus event detail and
+        attendee list pages that mention the query.
+        """
+        host = urlparse(page_url).netloc
+        query_lower = query.lower()
+        links = []
+        
+        for a_tag in soup.find_all('a', href=True):
+            url = urljoin(page_url, a_tag['href']).split('#')[0]
+            parsed = urlparse(url)
+            if parsed.netloc != host or not url:
+                continue
+            
+            rel = [value.lower() for value in a_tag.get('rel', [])]
+            classes = ' '.join(a_tag.get('class', [])).lower()
+            is_pagination = (
+                'next' in rel
+                or 'page' in classes
+                or 'page=' in parsed.query
+                or a_tag.find_parent(class_=PAGINATION_CLASS) is not None
+            )
+            text = a_tag.get_text().strip().lower()
+            is_event_link = (
+                EVENT_LINK_PATTERN.search(parsed.path) is not None
+                and (query_lower in text or query_lower in url.lower() or ATTENDEE_PATH_PATTERN.search(parsed.path))
+            )
+            
+            if is_pagination or is_event_link:
+                links.append(url)
+        
+        return links
+
+    def is_auth_failure(self, status_code, url, start_page=False) -> bool:
+        """
+        A redirect back to the login page, or a 401/403 on a start endpoint, means the
+        session has expired. Other pages can be forbidden to this account alone.
+        """
+        if start_page and status_code in (401, 403):
+            return True
+        return urlparse(str(url)).path.rstrip('/').endswith('/login')
+
+    def portal_endpoints(self, base_url) -> list:
+        return [f"{base_url}/dashboard", f"{base_url}/events"]
+
+    def event_entry(self, url, attendees, query: str) -> dict:
+        return {
+            'event': f'Event containing "{query}"',
+            'attendees': attendees,
+            'source': 'authenticated_portal',
+            'url': url
+        }
+
+    def format_events(self, events_data, query: str) -> str:
+        if not events_data:
+            events_data = [{
+                'message': f'Authenticated access successful for "{query}"',
+                'status': 'logged_in',
+                'attendees': []
+            }]
+        
+        return json.dumps(events_data, indent=2)
+
     def extract_people_from_page(self, soup) -> list:
         try:
             people = []
@@ -120,7 +412,7 @@ class BrellaAuthScraper(BaseTool):
                     if name:
                         people.append({'name': name, 'company': company, 'role': role})
             
-            return people[:20]
+            return people
         except:
             return []
 
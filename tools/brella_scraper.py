@@ -1,9 +1,22 @@
 from crewai.tools import BaseTool
-import requests
 from bs4 import BeautifulSoup
+import asyncio
 import os, time, json
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
+from tools.http_client import get_http_client, DEFAULT_HEADERS
+from tools.async_http import get_async_http_client
+from tools.serper_cache import get_serper_cache, normalize_query
+from tools.html_extract import extract_page, extract_main_content
+
+MAIN_URL = "https://www.brella.io/"
+SERPER_URL = "https://google.serper.dev/search"
+FETCH_TIMEOUT_CONTENT = "Timed out retrieving content"
+
+def _is_result(output) -> bool:
+    """Errors are not memoized, so a later identical call tries again"""
+    return not output.startswith("Error")
 
 class BrellaScraperSchema(BaseModel):
     search_term: str = Field(..., description="The term to search for on Brella.io")
@@ -13,6 +26,10 @@ class BrellaScraper(BaseTool):
     name: str = "Brella Scraper"
     description: str = "Scrapes Brella.io website for event and networking information."
     args_schema: type[BaseModel] = BrellaScraperSchema
+    fetch_workers: int = Field(default_factory=lambda: int(os.getenv("BRELLA_FETCH_WORKERS", 5)))
+    fetch_budget: float = Field(default_factory=lambda: float(os.getenv("BRELLA_FETCH_BUDGET", 20)))
+    max_page_bytes: int = Field(default_factory=lambda: int(os.getenv("BRELLA_MAX_PAGE_BYTES", 512 * 1024)))
+    memo: Optional[Any] = Field(default=None, exclude=True, description="CallMemo shared by the tools of one crew run")
     
     def _run(self, search_term: str, category: str = "all"):
         """
@@ -25,17 +42,29 @@ class BrellaScraper(BaseTool):
         Returns:
             Structured information from Brella.io
         """
+        category = self._resolve_category(search_term, category)
+        if self.memo is None:
+            return self._research(search_term, category)
+        return self.memo.call(self._memo_key(search_term, category),
+                              lambda: self._research(search_term, category), keep=_is_result)
+    
+    async def _arun(self, search_term: str, category: str = "all"):
+        """
+        Async version of _run built on the shared AsyncHttpClient.
         
-        if category == "all" and "category" in search_term.lower():
-            
-            if "category 'events'" in search_term.lower():
-                category = "events"
-            elif "category 'companies'" in search_term.lower():
-                category = "companies"
-            elif "category 'people'" in search_term.lower():
-                category = "people"
-            elif "category 'networking'" in search_term.lower():
-                category = "networking"
+        Returns the same output as _run.
+        """
+        category = self._resolve_category(search_term, category)
+        if self.memo is None:
+            return await self._aresearch(search_term, category)
+        return await self.memo.acall(self._memo_key(search_term, category),
+                                     lambda: self._aresearch(search_term, category), keep=_is_result)
+    
+    def _memo_key(self, search_term: str, category: str):
+        return (self.name, normalize_query(search_term), category)
+    
+    def _research(self, search_term: str, category: str) -> str:
+        """Serper search first, then a direct scrape of brella.io"""
         try:
             
             serper_api_key = os.getenv("SERPER_API_KEY")
@@ -54,63 +83,196 @@ class BrellaScraper(BaseTool):
             print(f"Error in Brella scraper: {str(e)}")
             return f"Error: Could not scrape Brella.io - {str(e)}"
     
+    async def _aresearch(self, search_term: str, category: str) -> str:
+        """Async version of _research"""
+        try:
+            
+            serper_api_key = os.getenv("SERPER_API_KEY")
+            if serper_api_key:
+                brella_info = await self._asearch_with_serper(search_term, category, serper_api_key)
+                if brella_info:
+                    return brella_info
+            
+            
+            brella_info = await self._ascrape_brella_directly(search_term, category)
+            if brella_info:
+                return brella_info
+            
+            return "No information found on Brella.io for the given search term."
+        except Exception as e:
+            print(f"Error in Brella scraper: {str(e)}")
+            return f"Error: Could not scrape Brella.io - {str(e)}"
+    
+    def _resolve_category(self, search_term: str, category: str) -> str:
+        """Pick up a category mentioned in the task text when none was passed"""
+        if category == "all" and "category" in search_term.lower():
+            
+            if "category 'events'" in search_term.lower():
+                category = "events"
+            elif "category 'companies'" in search_term.lower():
+                category = "companies"
+            elif "category 'people'" in search_term.lower():
+                category = "people"
+            elif "category 'networking'" in search_term.lower():
+                category = "networking"
+        return category
+    
+    def _serper_request(self, search_term: str, category: str, api_key: str):
+        """Build the Serper search payload and headers"""
+        payload = json.dumps({
+            "q": f"site:brella.io {search_term} {category}",
+            "gl": "us",
+            "hl": "en",
+            "num": 10
+        })
+        headers = {
+            'X-API-KEY': api_key,
+            'Content-Type': 'application/json'
+        }
+        return payload, headers
+    
+    def _parse_serper_results(self, data) -> List[Dict]:
+        """Turn organic Serper hits on brella.io into result entries, still without page content"""
+        results = []
+        
+        if 'organic' in data:
+            for result in data['organic']:
+                title = result.get('title', '')
+                link = result.get('link', '')
+                snippet = result.get('snippet', '')
+                
+                if 'brella.io' in link:
+                    results.append({
+                        "title": title,
+                        "url": link,
+                        "description": snippet,
+                        "content": None
+                    })
+        
+        return results
+    
     def _search_with_serper(self, search_term: str, category: str, api_key: str) -> Optional[str]:
         """Search using Serper API to find Brella.io content"""
         try:
-            url = "https://google.serper.dev/search"
-            payload = json.dumps({
-                "q": f"site:brella.io {search_term} {category}",
-                "gl": "us",
-                "hl": "en",
-                "num": 10
-            })
-            headers = {
-                'X-API-KEY': api_key,
-                'Content-Type': 'application/json'
-            }
+            serper_cache = get_serper_cache()
+            data = serper_cache.get(search_term, category) if serper_cache else None
             
-            response = requests.post(url, headers=headers, data=payload)
-            if response.status_code == 200:
-                data = response.json()
-                
-                results = []
+            if data is None:
+                payload, headers = self._serper_request(search_term, category, api_key)
+                response = get_http_client().post(SERPER_URL, headers=headers, data=payload)
+                if response.status_code != 200:
+                    return None
                 
-                if 'organic' in data:
-                    for result in data['organic']:
-                        title = result.get('title', '')
-                        link = result.get('link', '')
-                        snippet = result.get('snippet', '')
-                        
-                        if 'brella.io' in link:
-                           
-                            page_content = self._get_page_content(link)
-                            
-                            results.append({
-                                "title": title,
-                                "url": link,
-                                "description": snippet,
-                                "content": page_content
-                            })
+                data = response.json()
+                if serper_cache:
+                    serper_cache.put(search_term, category, data)
+            
+            results = self._parse_serper_results(data)
+            
+            page_contents = self._fetch_pages([result["url"] for result in results])
+            for result, page_content in zip(results, page_contents):
+                result["content"] = page_content
+            
+            if results:
+                return json.dumps(results, indent=2)
+            
+            return None
+        except Exception as e:
+            print(f"Serper API error: {str(e)}")
+            return None
+    
+    async def _asearch_with_serper(self, search_term: str, category: str, api_key: str) -> Optional[str]:
+        """Async version of _search_with_serper"""
+        try:
+            serper_cache = get_serper_cache()
+            data = serper_cache.get(search_term, category) if serper_cache else None
+            
+            if data is None:
+                payload, headers = self._serper_request(search_term, category, api_key)
+                response = await get_async_http_client().post(SERPER_URL, headers=headers, content=payload)
+                if response.status_code != 200:
+                    return None
                 
-                if results:
-                    return json.dumps(results, indent=2)
+                data = response.json()
+                if serper_cache:
+                    serper_cache.put(search_term, category, data)
+            
+            results = self._parse_serper_results(data)
+            
+            page_contents = await self._afetch_pages([result["url"] for result in results])
+            for result, page_content in zip(results, page_contents):
+                result["content"] = page_content
+            
+            if results:
+                return json.dumps(results, indent=2)
             
             return None
         except Exception as e:
             print(f"Serper API error: {str(e)}")
             return None
     
+    def _fetch_pages(self, urls: List[str]) -> List[str]:
+        """
+        Fetch page content for several URLs concurrently.
+        
+        At most fetch_workers pages are downloaded at once and the whole batch is
+        bounded by fetch_budget seconds. Pages that have not finished by then are
+        returned as a placeholder instead of holding up the call.
+        
+        Returns:
+            Page contents in the same order as urls
+        """
+        if not urls:
+            return []
+        
+        contents = [FETCH_TIMEOUT_CONTENT] * len(urls)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.fetch_workers, len(urls))))
+        try:
+            future_to_index = {executor.submit(self._get_page_content, url): i for i, url in enumerate(urls)}
+            done, _ = wait(future_to_index, timeout=self.fetch_budget)
+            for future in done:
+                try:
+                    contents[future_to_index[future]] = future.result()
+                except Exception as e:
+                    contents[future_to_index[future]] = f"Error retrieving content: {str(e)}"
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return contents
+    
+    async def _afetch_pages(self, urls: List[str]) -> List[str]:
+        """Async version of _fetch_pages with the same worker and time budget"""
+        if not urls:
+            return []
+        
+        contents = [FETCH_TIMEOUT_CONTENT] * len(urls)
+        semaphore = asyncio.Semaphore(max(1, self.fetch_workers))
+        
+        async def fetch(url):
+            async with semaphore:
+                return await self._aget_page_content(url)
+        
+        tasks = [asyncio.ensure_future(fetch(url)) for url in urls]
+        done, pending = await asyncio.wait(tasks, timeout=self.fetch_budget)
+        for task in pending:
+            task.cancel()
+        for i, task in enumerate(tasks):
+            if task in done:
+                try:
+                    contents[i] = task.result()
+                except Exception as e:
+                    contents[i] = f"Error retrieving content: {str(e)}"
+        
+        return contents
+    
     def _scrape_brella_directly(self, search_term: str, category: str) -> Optional[str]:
         """Directly scrape Brella.io website"""
         try:
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            headers = DEFAULT_HEADERS
             
           
-            main_url = "https://www.brella.io/"
-            main_response = requests.get(main_url, headers=headers)
+            main_response = get_http_client().get_cached(MAIN_URL, headers=headers)
             
             results = {
                 "main_site_info": {},
@@ -119,22 +281,9 @@ class BrellaScraper(BaseTool):
             
        
             if main_response.status_code == 200:
-                soup = BeautifulSoup(main_response.text, 'html.parser')
-                
-                results["main_site_info"] = {
-                    "title": soup.title.text if soup.title else "Brella.io",
-                    "description": self._extract_meta_description(soup),
-                    "features": self._extract_features(soup)
-                }
+                results["main_site_info"], links = self._parse_main_page(main_response.text, search_term)
                 
-                relevant_links = self._find_relevant_links(soup, search_term)
-                
-                for link in relevant_links[:5]: 
-                    if link.startswith('/'):
-                        link = main_url.rstrip('/') + link
-                    elif not link.startswith('http'):
-                        link = main_url.rstrip('/') + '/' + link
-                    
+                for link in links:
                     page_info = self._get_page_info(link, headers, search_term)
                     if page_info:
                         results["search_results"].append(page_info)
@@ -150,142 +299,169 @@ class BrellaScraper(BaseTool):
             print(f"Direct scraping error: {str(e)}")
             return None
     
-    def _extract_meta_description(self, soup):
-        """Extract meta description from the page"""
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            return meta_desc.get('content', '')
-        return "No description available"
+    async def _ascrape_brella_directly(self, search_term: str, category: str) -> Optional[str]:
+        """Async version of _scrape_brella_directly; linked pages are fetched concurrently"""
+        try:
+            main_response = await get_async_http_client().get_cached(MAIN_URL)
+            
+            results = {
+                "main_site_info": {},
+                "search_results": []
+            }
+            
+            if main_response.status_code == 200:
+                results["main_site_info"], links = self._parse_main_page(main_response.text, search_term)
+                
+                page_infos = await asyncio.gather(*[self._aget_page_info(link, search_term) for link in links])
+                results["search_results"].extend(page_info for page_info in page_infos if page_info)
+            
+            if not results["search_results"] and category != "all":
+                search_url = f"https://www.brella.io/search?q={search_term}&category={category}"
+                search_results = await self._aprocess_search_page(search_url)
+                if search_results:
+                    results["search_results"].extend(search_results)
+            
+            return json.dumps(results, indent=2)
+        except Exception as e:
+            print(f"Direct scraping error: {str(e)}")
+            return None
     
-    def _extract_features(self, soup):
-        """Extract features or key points from the Brella.io homepage"""
-        features = []
-        
-        feature_sections = soup.select('.feature, .features, .benefits, .services')
-        if feature_sections:
-            for section in feature_sections:
-                feature_items = section.select('h2, h3, h4')
-                for item in feature_items:
-                    features.append(item.text.strip())
+    def _parse_main_page(self, html, search_term):
+        """
+        Parse the Brella.io homepage.
         
-        if not features:
-            list_items = soup.select('ul li, ol li')
-            for item in list_items[:10]:  
-                features.append(item.text.strip())
+        Returns:
+            Tuple of (main site info dict, up to 5 absolute links relevant to the search term)
+        """
+        page = extract_page(html, search_term)
         
-        return features if features else ["No specific features extracted"]
-    
-    def _find_relevant_links(self, soup, search_term):
-        """Find links that might be relevant to the search term"""
-        relevant_links = []
-        search_term_lower = search_term.lower()
+        main_site_info = {
+            "title": page["title"] if page["title"] is not None else "Brella.io",
+            "description": page["description"],
+            "features": page["features"]
+        }
         
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag.get('href', '')
-            text = a_tag.text.strip().lower()
-            
-            if search_term_lower in text or search_term_lower in href.lower():
-                relevant_links.append(href)
+        links = []
+        for link in page["links"][:5]:
+            if link.startswith('/'):
+                link = MAIN_URL.rstrip('/') + link
+            elif not link.startswith('http'):
+                link = MAIN_URL.rstrip('/') + '/' + link
+            links.append(link)
         
-        return relevant_links
+        return main_site_info, links
     
     def _get_page_info(self, url, headers, search_term):
         """Get information from a specific page"""
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = get_http_client().get_cached(url, headers=headers, timeout=10)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                page_info = {
-                    "url": url,
-                    "title": soup.title.text if soup.title else "No title",
-                    "description": self._extract_meta_description(soup),
-                    "content_summary": self._extract_content_summary(soup, search_term)
-                }
-                
-                return page_info
+                return self._parse_page_info(response.text, url, search_term)
             return None
         except Exception as e:
             print(f"Error getting page info for {url}: {str(e)}")
             return None
     
-    def _extract_content_summary(self, soup, search_term):
-        """Extract a summary of the content, focusing on parts relevant to the search term"""
-        search_term_lower = search_term.lower()
-        summary = []
-        
-        paragraphs = soup.find_all('p')
-        for p in paragraphs:
-            text = p.text.strip()
-            if search_term_lower in text.lower():
-                summary.append(text)
+    async def _aget_page_info(self, url, search_term):
+        """Async version of _get_page_info"""
+        try:
+            response = await get_async_http_client().get_cached(url, timeout=10)
+            if response.status_code == 200:
+                return self._parse_page_info(response.text, url, search_term)
+            return None
+        except Exception as e:
+            print(f"Error getting page info for {url}: {str(e)}")
+            return None
+    
+    def _parse_page_info(self, html, url, search_term):
+        """Build the page info entry for a linked page"""
+        page = extract_page(html, search_term)
         
-        if summary:
-            return summary[:3]  
+        page_info = {
+            "url": url,
+            "title": page["title"] if page["title"] is not None else "No title",
+            "description": page["description"],
+            "content_summary": page["content_summary"]
+        }
         
-        return [p.text.strip() for p in paragraphs[:3] if p.text.strip()]
+        return page_info
     
     def _process_search_page(self, search_url, headers):
         """Process a search results page"""
         try:
-            response = requests.get(search_url, headers=headers, timeout=10)
+            response = get_http_client().get_cached(search_url, headers=headers, timeout=10)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                results = []
-               
-                result_items = soup.select('.search-result, .result-item, .card')
-                
-                for item in result_items:
-                    title_elem = item.select_one('h2, h3, .title')
-                    link_elem = item.select_one('a')
-                    desc_elem = item.select_one('p, .description')
-                    
-                    title = title_elem.text.strip() if title_elem else "No title"
-                    link = link_elem.get('href', '') if link_elem else ""
-                    description = desc_elem.text.strip() if desc_elem else "No description"
-                    
-                    if link.startswith('/'):
-                        link = "https://www.brella.io" + link
-                    
-                    results.append({
-                        "title": title,
-                        "url": link,
-                        "description": description
-                    })
-                
-                return results
+                return self._parse_search_page(response.text)
             return []
         except Exception as e:
             print(f"Error processing search page: {str(e)}")
             return []
     
+    async def _aprocess_search_page(self, search_url):
+        """Async version of _process_search_page"""
+        try:
+            response = await get_async_http_client().get_cached(search_url, timeout=10)
+            if response.status_code == 200:
+                return self._parse_search_page(response.text)
+            return []
+        except Exception as e:
+            print(f"Error processing search page: {str(e)}")
+            return []
+    
+    def _parse_search_page(self, html):
+        """Extract result entries from a search results page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        results = []
+       
+        result_items = soup.select('.search-result, .result-item, .card')
+        
+        for item in result_items:
+            title_elem = item.select_one('h2, h3, .title')
+            link_elem = item.select_one('a')
+            desc_elem = item.select_one('p, .description')
+            
+            title = title_elem.text.strip() if title_elem else "No title"
+            link = link_elem.get('href', '') if link_elem else ""
+            description = desc_elem.text.strip() if desc_elem else "No description"
+            
+            if link.startswith('/'):
+                link = "https://www.brella.io" + link
+            
+            results.append({
+                "title": title,
+                "url": link,
+                "description": description
+            })
+        
+        return results
+    
     def _get_page_content(self, url):
         """Get the main content from a page"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = get_http_client().get_cached(url, max_bytes=self.max_page_bytes, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                main_content = soup.select_one('main, #content, .content, article')
-                
-                if main_content:
-                    paragraphs = main_content.find_all('p')
-                    content = "\n\n".join([p.text.strip() for p in paragraphs if p.text.strip()])
-                    
-                    if content:
-                        return content[:1000] + "..." if len(content) > 1000 else content
-                
-                paragraphs = soup.find_all('p')
-                content = "\n\n".join([p.text.strip() for p in paragraphs[:5] if p.text.strip()])
-                
-                return content[:1000] + "..." if len(content) > 1000 else content
+                return self._parse_page_content(response.text)
+            
+            return "Could not retrieve page content"
+        except Exception as e:
+            print(f"Error getting page content: {str(e)}")
+            return f"Error retrieving content: {str(e)}"
+    
+    async def _aget_page_content(self, url):
+        """Async version of _get_page_content"""
+        try:
+            response = await get_async_http_client().get_cached(url, max_bytes=self.max_page_bytes, timeout=10)
+            
+            if response.status_code == 200:
+                return self._parse_page_content(response.text)
             
             return "Could not retrieve page content"
         except Exception as e:
             print(f"Error getting page content: {str(e)}")
-            return f"Error retrieving content: {str(e)}"
\ No newline at end of file
+            return f"Error retrieving content: {str(e)}"
+    
+    def _parse_page_content(self, html):
+        """Extract up to 1000 characters of main paragraph text from a page"""
+        return extract_main_content(html)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+def get_cache_dir():
+    """
+    Return the directory for on-disk caches, creating it if needed.
+
+    Uses BRELLA_CACHE_DIR, defaulting to .brella_cache in the working directory.
+    """
+    path = os.getenv("BRELLA_CACHE_DIR", ".brella_cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class SqliteStore:
+    """
+    Thread-safe SQLite database shared by the on-disk caches.
+    """
+
+    def __init__(self, path, schema, journal_mode="WAL"):
+        """
+        Open (or create) a database.
+
+        Args:
+            path: Database file. Relative names are placed in the cache directory.
+            schema: SQL script run on open to create tables and indexes
+            journal_mode: SQLite journal mode. WAL needs all processes on one host;
+                          use DELETE for files shared between hosts.
+        """
+        if not os.path.isabs(path) and not os.path.dirname(path):
+            path = os.path.join(get_cache_dir(), path)
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.execute("PRAGMA synchronous=NORMAL" if journal_mode.upper() == "WAL" else "PRAGMA synchronous=FULL")
+        self._conn.executescript(schema)
+
+    def execute(self, sql, params=()):
+        """
+        Run a single statement and return all rows.
+        """
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def executescript(self, script):
+        """
+        Run a SQL script, e.g. schema changes made after opening.
+        """
+        with self._lock:
+            self._conn.executescript(script)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several statements atomically, also across processes sharing the file.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
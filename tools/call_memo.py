@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class CallMemo:
+    """
+    Memo of tool calls shared by all tool instances of one crew run.
+
+    The first call for a key runs; identical calls made while it is still running
+    wait for its result instead of starting their own requests (singleflight), and
+    later ones get the memoized result. Sync and async callers share entries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"calls": 0, "executed": 0, "deduplicated": 0}
+
+    def call(self, key, func, keep=None):
+        """
+        Run func() once per key.
+
+        Args:
+            key: Hashable call identity, e.g. (tool name, normalized query, category)
+            func: Callable producing the result
+            keep: Optional predicate; results it rejects (e.g. errors) are handed to
+                  callers already waiting but not memoized for later calls
+
+        Returns:
+            The result of func() for this key
+        """
+        future, owner = self._claim(key)
+        if not owner:
+            return future.result()
+        try:
+            result = func()
+        except BaseException as e:
+            self._settle(key, future, exception=e)
+            raise
+        self._settle(key, future, result=result, keep=keep)
+        return result
+
+    async def acall(self, key, func, keep=None):
+        """
+        Async version of call(); func is a coroutine function.
+        """
+        future, owner = self._claim(key)
+        if not owner:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await func()
+        except BaseException as e:
+            self._settle(key, future, exception=e)
+            raise
+        self._settle(key, future, result=result, keep=keep)
+        return result
+
+    def _claim(self, key):
+        with self._lock:
+            self._stats["calls"] += 1
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats["deduplicated"] += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._stats["executed"] += 1
+            return future, True
+
+    def _settle(self, key, future, result=None, exception=None, keep=None):
+        if exception is not None or (keep is not None and not keep(result)):
+            with self._lock:
+                self._calls.pop(key, None)
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
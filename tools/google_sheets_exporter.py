@@ -1,17 +1,26 @@
 import gspread
+from gspread.utils import rowcol_to_a1
 from oauth2client.service_account import ServiceAccountCredentials
 import json
 import os
-import pandas as pd
+import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import re
+from tools.rate_limiter import get_rate_limiter
+from tools.research_result import SECTIONS, ResearchResult
+
+# API errors worth retrying: quota exhausted and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 class GoogleSheetsExporter:
     """
     A tool for exporting data to Google Sheets.
     """
     
-    def __init__(self, spreadsheet_url=None, credentials_file=None):
+    def __init__(self, spreadsheet_url=None, credentials_file=None, chunk_cells=None, workers=None,
+                 max_retries=None):
         """
         Initialize the Google Sheets exporter.
         
@@ -20,9 +29,19 @@ class GoogleSheetsExporter:
                              If None, will look for GOOGLE_SPREADSHEET_URL in environment variables.
             credentials_file: Path to the Google API credentials JSON file.
                               If None, will look for GOOGLE_CREDENTIALS_PATH in environment variables.
+            chunk_cells: Maximum cells written per batch_update request.
+                         If None, will look for GOOGLE_SHEETS_CHUNK_CELLS (default 20000).
+            workers: Chunks written at once.
+                     If None, will look for GOOGLE_SHEETS_WORKERS (default 4).
+            max_retries: Retries of a chunk that hit the quota or a server error.
+                         If None, will look for GOOGLE_SHEETS_MAX_RETRIES (default 4).
         """
         self.spreadsheet_url = spreadsheet_url or os.getenv("GOOGLE_SPREADSHEET_URL")
         self.credentials_file = credentials_file or os.getenv("GOOGLE_CREDENTIALS_PATH")
+        self.chunk_cells = int(chunk_cells or os.getenv("GOOGLE_SHEETS_CHUNK_CELLS", 20000))
+        self.workers = int(workers or os.getenv("GOOGLE_SHEETS_WORKERS", 4))
+        self.max_retries = int(max_retries if max_retries is not None else os.getenv("GOOGLE_SHEETS_MAX_RETRIES", 4))
+        self.backoff_factor = float(os.getenv("GOOGLE_SHEETS_BACKOFF", 1.0))
         self.scope = [
             'https://spreadsheets.google.com/feeds',
             'https://www.googleapis.com/auth/drive'
@@ -87,12 +106,128 @@ class GoogleSheetsExporter:
             print(f"Authentication error: {str(e)}")
             return False
     
+    def _rows(self, data):
+        """
+        Turn the data to export into flat rows.
+        
+        ResearchResult objects, and research results read back from JSON, become one
+        summary cell per section (ResearchResult.to_row()); other dicts are kept as they are.
+        """
+        if isinstance(data, str):
+            data = json.loads(data)
+        rows = []
+        for item in data:
+            if isinstance(item, dict) and all(name in item for name in SECTIONS):
+                item = ResearchResult.from_dict(item)
+            rows.append(item.to_row() if isinstance(item, ResearchResult) else item)
+        return rows
+    
+    def _table(self, rows, header=()):
+        """
+        Header row plus one list of cells per row.
+        
+        Columns follow header (an existing sheet's header row), then the keys of the
+        rows in first-seen order.
+        """
+        columns = list(dict.fromkeys([*header, *(key for row in rows for key in row)]))
+        return [columns] + [[_cell(row.get(column)) for column in columns] for row in rows]
+    
+    def _write_table(self, worksheet, table, start_row=1):
+        """
+        Write a table in batch_update chunks of at most chunk_cells cells, several at once.
+        
+        Args:
+            worksheet: Target worksheet, already large enough for the table
+            table: Lists of cells, all of the same width
+            start_row: Sheet row of the table's first row
+            
+        Returns:
+            Number of cells written
+        """
+        width = len(table[0]) if table else 0
+        if not width:
+            return 0
+        rows_per_chunk = max(1, self.chunk_cells // width)
+        chunks = [(start_row + i, table[i:i + rows_per_chunk]) for i in range(0, len(table), rows_per_chunk)]
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks)), thread_name_prefix="sheets-chunk") as executor:
+            list(executor.map(lambda chunk: self._write_chunk(worksheet, *chunk), chunks))
+        elapsed = time.perf_counter() - started
+        
+        cells = len(table) * width
+        print(f"Wrote {cells} cells to '{worksheet.title}' in {len(chunks)} chunks, "
+              f"{elapsed:.1f}s ({cells / max(elapsed, 0.001):.0f} cells/s)")
+        return cells
+    
+    def _write_chunk(self, worksheet, row, values):
+        cell_range = f"A{row}:{rowcol_to_a1(row + len(values) - 1, len(values[0]))}"
+        self._send(f"Writing {cell_range}", lambda: worksheet.batch_update([{"range": cell_range, "values": values}]))
+    
+    def _append_rows(self, worksheet, rows):
+        """
+        Append rows after the sheet's table with the API's native append, in sequential
+        chunks of at most chunk_cells cells. Only the new rows are sent; nothing is read.
+        
+        Returns:
+            Number of cells appended
+        """
+        if not rows:
+            return 0
+        rows_per_chunk = max(1, self.chunk_cells // len(rows[0]))
+        started = time.perf_counter()
+        for i in range(0, len(rows), rows_per_chunk):
+            chunk = rows[i:i + rows_per_chunk]
+            # A timed-out append may still have been applied, so only rejected ones are retried
+            self._send(f"Appending {len(chunk)} rows",
+                       lambda: worksheet.append_rows(chunk, insert_data_option="INSERT_ROWS", table_range="A1"),
+                       idempotent=False)
+        elapsed = time.perf_counter() - started
+        
+        cells = len(rows) * len(rows[0])
+        print(f"Appended {len(rows)} rows ({cells} cells) to '{worksheet.title}', "
+              f"{elapsed:.1f}s ({cells / max(elapsed, 0.001):.0f} cells/s)")
+        return cells
+    
+    def _send(self, description, request, idempotent=True):
+        """
+        Send one write request, retrying quota and server errors with exponential backoff.
+        
+        Requests wait for the shared Sheets token bucket, which slows down on 429s.
+        Connection errors and timeouts are only retried for idempotent requests.
+        """
+        bucket = get_rate_limiter().bucket("sheets")
+        for attempt in range(self.max_retries + 1):
+            if bucket:
+                bucket.acquire()
+            try:
+                response = request()
+                if bucket:
+                    bucket.on_response(200)
+                return response
+            except gspread.exceptions.APIError as e:
+                if bucket:
+                    bucket.on_response(e.code, e.response.headers.get("Retry-After"))
+                if e.code not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+                error = e
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not idempotent or attempt == self.max_retries:
+                    raise
+                error = e
+            delay = self.backoff_factor * (2 ** attempt)
+            print(f"{description} failed ({str(error)}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+    
     def export_to_sheet(self, data, spreadsheet_name=None, worksheet_name=None):
         """
         Export data to a Google Sheet.
         
+        The worksheet is sized once to the exact shape of the data, which is then
+        written in parallel batch_update chunks (see _write_table).
+        
         Args:
-            data: JSON data or list of dictionaries to export
+            data: JSON data, list of dictionaries or ResearchResult objects to export
             spreadsheet_name: Name of the Google Spreadsheet (only used if not using direct URL)
             worksheet_name: Name of the worksheet (optional, defaults to current date)
             
@@ -124,21 +259,18 @@ class GoogleSheetsExporter:
                 worksheet_name = datetime.now().strftime("%Y-%m-%d")
             
         
+            table = self._table(self._rows(data))
+            rows, cols = len(table), max(len(table[0]), 1)
+        
             try:
                 worksheet = spreadsheet.worksheet(worksheet_name)
               
                 worksheet.clear()
+                worksheet.resize(rows=rows, cols=cols)
             except gspread.exceptions.WorksheetNotFound:
-                worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=1000, cols=20)
-            
-            if isinstance(data, str):
-               
-                data = json.loads(data)
-                
-            df = pd.DataFrame(data)
+                worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=rows, cols=cols)
             
-           
-            worksheet.update([df.columns.values.tolist()] + df.values.tolist())
+            self._write_table(worksheet, table)
             
             return spreadsheet.url
             
@@ -150,8 +282,12 @@ class GoogleSheetsExporter:
         """
         Append data to an existing Google Sheet.
         
+        Rows go through the API's native append, so the cost of an append grows with
+        the new rows only, not with the rows already in the sheet. Columns the sheet's
+        header does not have yet are added to it.
+        
         Args:
-            data: JSON data or list of dictionaries to append
+            data: JSON data, list of dictionaries or ResearchResult objects to append
             spreadsheet_name: Name of the Google Spreadsheet (only used if not using direct URL)
             worksheet_name: Name of the worksheet (optional, defaults to current date)
             
@@ -181,28 +317,38 @@ class GoogleSheetsExporter:
                 worksheet_name = datetime.now().strftime("%Y-%m-%d")
             
            
+            rows = self._rows(data)
+            
             try:
                 worksheet = spreadsheet.worksheet(worksheet_name)
             except gspread.exceptions.WorksheetNotFound:
                 
-                worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=1000, cols=20)
+                table = self._table(rows)
+                worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=len(table), cols=max(len(table[0]), 1))
+                self._write_table(worksheet, table)
+                return spreadsheet.url
             
+            # Only the header row is read, to line the new rows up with its columns
+            header = worksheet.row_values(1)
+            table = self._table(rows, header)
+            if table[0] != header:
+                if len(table[0]) > worksheet.col_count:
+                    worksheet.resize(cols=len(table[0]))
+                self._send("Writing the header", lambda: worksheet.update([table[0]], "A1"))
             
-            if isinstance(data, str):
-                data = json.loads(data)
-                
-            df = pd.DataFrame(data)
-                
-            existing_data = worksheet.get_all_values()
-            start_row = len(existing_data) + 1
-            
-            if not existing_data:
-                worksheet.update([df.columns.values.tolist()] + df.values.tolist())
-            else:
-                worksheet.update(f'A{start_row}', df.values.tolist())
+            self._append_rows(worksheet, table[1:])
             
             return spreadsheet.url
             
         except Exception as e:
             print(f"Error appending to Google Sheets: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+
+def _cell(value):
+    """Sheets value of a field: nested data as JSON, missing values as empty cells"""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value)
+    return value
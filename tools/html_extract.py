@@ -0,0 +1,164 @@
+import lxml.etree
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+
+FEATURE_CLASSES = {"feature", "features", "benefits", "services"}
+FEATURE_HEADINGS = {"h2", "h3", "h4"}
+MAX_LIST_FEATURES = 10
+MAX_SUMMARY_PARAGRAPHS = 3
+MAX_CONTENT_CHARS = 1000
+FALLBACK_CONTENT_PARAGRAPHS = 5
+
+
+def parse_html(html):
+    """
+    Parse an HTML document with lxml.
+
+    Returns:
+        Root element, or None for an empty document
+    """
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except lxml.etree.ParserError:
+        return None
+
+
+def extract_page(html, search_term=None):
+    """
+    Extract everything BrellaScraper needs from a page in one parse and one traversal.
+
+    Args:
+        html: Page HTML
+        search_term: Term used to pick relevant links and paragraphs (optional)
+
+    Returns:
+        Dict with:
+            title: Text of the first <title>, or None
+            description: Meta description, or "No description available"
+            features: Headings inside feature/benefit/service sections, falling back to
+                      the first list items, or ["No specific features extracted"]
+            links: hrefs whose link text or URL contains the search term
+            content_summary: Up to 3 paragraphs mentioning the search term, falling back
+                             to the first 3 non-empty paragraphs
+    """
+    term = (search_term or "").lower()
+    title = None
+    description = None
+    feature_sections = []
+    list_features = []
+    links = []
+    matching_paragraphs = []
+    leading_paragraphs = []
+    paragraph_count = 0
+
+    root = parse_html(html)
+    if root is not None:
+        open_sections = []
+        list_depth = 0
+        for event, element in lxml.etree.iterwalk(root, events=("start", "end")):
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+
+            if event == "end":
+                if _is_feature_section(element):
+                    open_sections.pop()
+                if tag in ("ul", "ol"):
+                    list_depth -= 1
+                continue
+
+            if tag in FEATURE_HEADINGS and open_sections:
+                # Every enclosing section lists the heading, matching one select() per section
+                text = element.text_content().strip()
+                for section in open_sections:
+                    section.append(text)
+            elif tag == "li" and list_depth and len(list_features) < MAX_LIST_FEATURES:
+                list_features.append(element.text_content().strip())
+            elif tag == "a":
+                href = element.get("href")
+                if href is not None:
+                    if term in element.text_content().strip().lower() or term in href.lower():
+                        links.append(href)
+            elif tag == "p":
+                text = element.text_content().strip()
+                if paragraph_count < MAX_SUMMARY_PARAGRAPHS and text:
+                    leading_paragraphs.append(text)
+                paragraph_count += 1
+                if search_term is not None and len(matching_paragraphs) < MAX_SUMMARY_PARAGRAPHS and term in text.lower():
+                    matching_paragraphs.append(text)
+            elif tag == "title" and title is None:
+                title = element.text_content()
+            elif tag == "meta" and description is None and element.get("name") == "description":
+                description = element.get("content", "")
+
+            if _is_feature_section(element):
+                feature_sections.append([])
+                open_sections.append(feature_sections[-1])
+            if tag in ("ul", "ol"):
+                list_depth += 1
+
+    features = [feature for section in feature_sections for feature in section] or list_features
+    return {
+        "title": title,
+        "description": description if description is not None else "No description available",
+        "features": features if features else ["No specific features extracted"],
+        "links": links,
+        "content_summary": matching_paragraphs or leading_paragraphs
+    }
+
+
+def _is_feature_section(element):
+    classes = element.get("class")
+    return bool(classes) and not FEATURE_CLASSES.isdisjoint(classes.split())
+
+
+class ContentStrainer(SoupStrainer):
+    """
+    Only build main, article, p, #content and .content elements (with their contents).
+
+    Everything else on the page (navigation, scripts, footers) is skipped while parsing.
+    """
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        if name in ("main", "article", "p"):
+            return True
+        attrs = attrs or {}
+        if attrs.get("id") == "content":
+            return True
+        classes = attrs.get("class") or ""
+        if isinstance(classes, str):
+            classes = classes.split()
+        return "content" in classes
+
+
+def extract_main_content(html):
+    """
+    Extract up to 1000 characters of main paragraph text from a page.
+
+    Paragraphs inside the first main/#content/.content/article element are used;
+    otherwise the first 5 paragraphs of the page.
+    """
+    soup = BeautifulSoup(html, "lxml", parse_only=ContentStrainer())
+
+    main_content = soup.select_one("main, #content, .content, article")
+
+    if main_content:
+        paragraphs = main_content.find_all("p")
+        content = "\n\n".join([p.text.strip() for p in paragraphs if p.text.strip()])
+
+        if content:
+            return _truncate(content)
+
+    paragraphs = soup.find_all("p", limit=FALLBACK_CONTENT_PARAGRAPHS)
+    content = "\n\n".join([p.text.strip() for p in paragraphs if p.text.strip()])
+
+    return _truncate(content)
+
+
+def _truncate(content):
+    return content[:MAX_CONTENT_CHARS] + "..." if len(content) > MAX_CONTENT_CHARS else content
@@ -0,0 +1,230 @@
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tools.rate_limiter import get_rate_limiter, parse_retry_after
+from tools.response_cache import CachedResponse, get_response_cache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Encoding of pages that do not declare one; streamed bodies cannot be sniffed afterwards
+DEFAULT_ENCODING = "utf-8"
+
+# Methods safe to send again after a connection error or a 5xx (urllib3's default)
+IDEMPOTENT_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+
+class HttpClient:
+    """
+    Shared, thread-safe HTTP client with per-host keep-alive connection pools.
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, max_retries=None,
+                 backoff_factor=None, timeout=None):
+        """
+        Initialize the HTTP client.
+
+        Args:
+            pool_connections: Number of per-host pools to keep.
+                              If None, will look for BRELLA_HTTP_POOL_CONNECTIONS (default 10).
+            pool_maxsize: Maximum keep-alive connections per host.
+                          If None, will look for BRELLA_HTTP_POOL_MAXSIZE (default 20).
+            max_retries: Retries on connection errors and 429/5xx responses. 429s are retried
+                         here rather than in urllib3 so the rate limiter sees them. Connection
+                         errors and 5xx are only retried for idempotent methods, so a login
+                         or a paid search POST is never sent twice.
+                         If None, will look for BRELLA_HTTP_RETRIES (default 3).
+            backoff_factor: Exponential backoff factor between retries.
+                            If None, will look for BRELLA_HTTP_BACKOFF (default 0.5).
+            timeout: Default request timeout in seconds.
+                     If None, will look for BRELLA_HTTP_TIMEOUT (default 10).
+        """
+        self.pool_connections = int(pool_connections or os.getenv("BRELLA_HTTP_POOL_CONNECTIONS", 10))
+        self.pool_maxsize = int(pool_maxsize or os.getenv("BRELLA_HTTP_POOL_MAXSIZE", 20))
+        self.max_retries = int(max_retries if max_retries is not None else os.getenv("BRELLA_HTTP_RETRIES", 3))
+        self.backoff_factor = float(backoff_factor if backoff_factor is not None else os.getenv("BRELLA_HTTP_BACKOFF", 0.5))
+        self.timeout = float(timeout or os.getenv("BRELLA_HTTP_TIMEOUT", 10))
+
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=[status for status in RETRY_STATUSES if status != 429],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+            pool_block=False
+        )
+        self.session = self.new_session()
+
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._error_count = 0
+
+    def new_session(self):
+        """
+        Create a session with its own cookie jar that shares this client's connection pools.
+        """
+        session = requests.Session()
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        return session
+
+    def request(self, method, url, session=None, **kwargs):
+        """
+        Send a request through the shared pools.
+
+        Requests to rate-limited upstreams (see tools.rate_limiter) wait for their
+        bucket first. A 429 response slows the bucket down and is retried.
+
+        Args:
+            method: HTTP method
+            url: Target URL
+            session: Optional session from new_session() (e.g. for authenticated cookies)
+            **kwargs: Passed through to requests
+
+        Returns:
+            requests.Response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        bucket = get_rate_limiter().bucket_for_url(url)
+        with self._lock:
+            self._request_count += 1
+        try:
+            for attempt in range(self.max_retries + 1):
+                if bucket:
+                    bucket.acquire()
+                response = (session or self.session).request(method, url, **kwargs)
+                if bucket:
+                    bucket.on_response(response.status_code, response.headers.get('Retry-After'))
+                if response.status_code != 429 or attempt == self.max_retries:
+                    return response
+                response.close()
+                if not bucket:
+                    delay = parse_retry_after(response.headers.get('Retry-After'))
+                    time.sleep(delay if delay is not None else self.backoff_factor * (2 ** attempt))
+        except Exception:
+            with self._lock:
+                self._error_count += 1
+            raise
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def download(self, url, max_bytes=None, **kwargs):
+        """
+        GET a URL, keeping at most max_bytes of the (decoded) body.
+
+        The connection is released as soon as the body is known to exceed the budget,
+        so memory per page stays bounded however large the page is. truncated is only
+        set when the body is longer than max_bytes.
+
+        Returns:
+            Tuple of (requests.Response, body bytes, truncated)
+        """
+        if not max_bytes:
+            response = self.get(url, **kwargs)
+            return response, response.content, False
+
+        response = self.get(url, stream=True, **kwargs)
+        chunks = []
+        size = 0
+        truncated = False
+        try:
+            for chunk in response.iter_content(chunk_size=16384):
+                chunks.append(chunk)
+                size += len(chunk)
+                # Read past the cap, so a body of exactly max_bytes is not reported as cut off
+                if size > max_bytes:
+                    truncated = True
+                    break
+        finally:
+            response.close()
+        return response, b"".join(chunks)[:max_bytes], truncated
+
+    def get_cached(self, url, max_bytes=None, **kwargs):
+        """
+        GET a public page through the on-disk response cache.
+
+        Fresh entries are returned without touching the network; stale ones are
+        revalidated with a conditional GET. With max_bytes the download is capped,
+        and capped bodies are not written to the cache.
+
+        Returns:
+            CachedResponse
+        """
+        cache = get_response_cache()
+        if cache is None:
+            response, content, _ = self.download(url, max_bytes, **kwargs)
+            return CachedResponse(url, response.status_code, content,
+                                  response.encoding or DEFAULT_ENCODING, dict(response.headers))
+
+        entry, fresh = cache.lookup(url)
+        if fresh:
+            cache.record_hit(url)
+            return entry
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(cache.conditional_headers(entry))
+        response, content, truncated = self.download(url, max_bytes, headers=headers, **kwargs)
+        return cache.resolve(url, entry, response.status_code, content,
+                             response.encoding or DEFAULT_ENCODING, response.headers,
+                             cacheable=not truncated)
+
+    def stats(self):
+        """
+        Return connection reuse counters aggregated over all per-host pools.
+        """
+        poolmanager = self.adapter.poolmanager
+        hosts = {}
+        for key in poolmanager.pools.keys():
+            pool = poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests
+            }
+
+        connections = sum(h["connections_opened"] for h in hosts.values())
+        pooled_requests = sum(h["requests"] for h in hosts.values())
+        with self._lock:
+            request_count = self._request_count
+            error_count = self._error_count
+
+        return {
+            "requests": request_count,
+            "errors": error_count,
+            "connections_opened": connections,
+            "connections_reused": max(pooled_requests - connections, 0),
+            "hosts": hosts
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Return the process-wide HttpClient, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,434 @@
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from tools.batch_plan import clean_term, row_identity
+from tools.cache_store import SqliteStore
+from tools.research_result import ResearchResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    row_key TEXT PRIMARY KEY,
+    row_index INTEGER NOT NULL,
+    search_term TEXT NOT NULL,
+    category TEXT NOT NULL,
+    attendee_type TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+# Normalized row identity and the run serving each row (see plan_runs), and the
+# version of the CSV that last listed the row (see csv_version); added to manifests
+# written by older versions on open
+RUN_COLUMNS = ("norm_term", "norm_category", "norm_attendee", "run_attendee", "csv_version")
+
+RUN_SCHEMA = """
+CREATE INDEX IF NOT EXISTS jobs_identity ON jobs (norm_term, norm_category, norm_attendee);
+CREATE INDEX IF NOT EXISTS jobs_run ON jobs (norm_term, norm_category, run_attendee);
+CREATE INDEX IF NOT EXISTS jobs_row_index ON jobs (row_index);
+CREATE TEMP TABLE IF NOT EXISTS ingest_counts (norm_term TEXT, norm_category TEXT, norm_attendee TEXT,
+                                               seen INTEGER NOT NULL,
+                                               PRIMARY KEY (norm_term, norm_category, norm_attendee));
+CREATE TEMP TABLE IF NOT EXISTS runs (run_id INTEGER PRIMARY KEY, norm_term TEXT, norm_category TEXT, run_attendee TEXT);
+CREATE TEMP TABLE IF NOT EXISTS plan (row_key TEXT PRIMARY KEY, run_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS temp.plan_run ON plan (run_id);
+"""
+
+# Rows of the current CSV that still have to run; parameters: 1 + max_retries
+RUNNABLE_SQL = ("row_index >= 0 AND (status IN ('pending', 'running') OR "
+                "(status = 'failed' AND attempts < ?))")
+
+STATUSES = ("pending", "running", "done", "failed")
+
+
+def manifest_path_for(output_file):
+    """Path of the job manifest kept next to an output file"""
+    return os.path.splitext(os.path.abspath(output_file))[0] + ".manifest.sqlite"
+
+
+def csv_version(csv_file, chunk_size=1 << 20):
+    """
+    Content hash of an input CSV, the same on every host that reads the file.
+
+    Workers sharing a manifest use it to tell rows of the CSV they are working on from
+    rows left over by an earlier CSV.
+    """
+    digest = hashlib.sha256()
+    with open(csv_file, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def worker_id():
+    """Identity of this worker process in leases: host name and process id"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def parse_shard(value):
+    """
+    Parse a "--shard i/n" value.
+
+    Returns:
+        Tuple (index, count) with 0 <= index < count
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/n such as 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{value}', expected 0 <= i < n")
+    return index, count
+
+
+def is_failed_result(result):
+    """
+    research_brella reports errors in every section instead of raising.
+
+    Accepts a stored ResearchResult dict, or a row written with raw section strings.
+    """
+    return ResearchResult.from_dict(result).failed
+
+
+class JobManifest:
+    """
+    Status of every row of a CSV batch run (pending, running, done or failed), kept in
+    SQLite next to the output file so an interrupted run can be resumed.
+
+    It doubles as a work queue: worker processes, on one host or on several hosts
+    sharing the file, claim rows under time-limited leases. A row whose lease runs out
+    (its worker died) can be claimed again by any worker.
+    """
+
+    def __init__(self, path):
+        """
+        Open (or create) a manifest.
+
+        Args:
+            path: SQLite file, usually manifest_path_for(output_file)
+        """
+        # Rollback journal instead of WAL, which does not work across hosts
+        self.store = SqliteStore(os.path.abspath(path), SCHEMA, journal_mode="DELETE")
+        columns = {row[1] for row in self.store.execute("PRAGMA table_info(jobs)")}
+        for column in RUN_COLUMNS:
+            if column not in columns:
+                try:
+                    self.store.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+                except sqlite3.OperationalError:
+                    pass  # added by another process opening the manifest at the same time
+        self.store.executescript(RUN_SCHEMA)
+
+    def reset(self):
+        """
+        Forget all rows, for a fresh (non-resumed) run.
+        """
+        self.store.execute("DELETE FROM jobs")
+
+    def detach_rows(self, keep_version=None):
+        """
+        Mark rows as not part of the current CSV until add_rows() sees them again.
+
+        Rows missing from an edited CSV are then neither run nor written to the output,
+        but their results are kept in case they come back.
+
+        Args:
+            keep_version: Leave rows already added for this csv_version attached, so
+                workers sharing the manifest do not detach each other's rows
+        """
+        self.store.execute("UPDATE jobs SET row_index = -1 WHERE csv_version IS NOT ?", (keep_version,))
+
+    def add_rows(self, search_items, start=0, version=None):
+        """
+        Register rows that are not in the manifest yet as pending.
+
+        A large CSV can be added in consecutive chunks: start is the CSV position of the
+        chunk's first row, and start=0 begins a new CSV. version (see csv_version) is
+        recorded on every row so detach_rows() can keep the rows of that CSV.
+
+        Rows are identified by content rather than position: their normalized search
+        term, category and attendee type plus an occurrence number among identical
+        rows, so editing other rows of the CSV between runs does not change a row's
+        identity. Occurrences are counted in a temporary table, so they continue across
+        chunks without keeping the rows in memory.
+
+        Returns:
+            Row keys of search_items, in order
+        """
+        now = time.time()
+        keys = []
+        rows = []
+        with self.store.transaction() as conn:
+            if start == 0:
+                conn.execute("DELETE FROM temp.ingest_counts")
+            for index, (term, category, attendee_type) in enumerate(search_items, start):
+                identity = row_identity(term, category, attendee_type)
+                seen = conn.execute(
+                    "INSERT INTO temp.ingest_counts VALUES (?, ?, ?, 1) ON CONFLICT DO UPDATE SET seen = seen + 1 "
+                    "RETURNING seen", identity
+                ).fetchone()[0]
+                key = json.dumps(list(identity) + [seen])
+                keys.append(key)
+                rows.append((key, index, term, category, attendee_type) + identity)
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (row_key, row_index, search_term, category, attendee_type, "
+                "norm_term, norm_category, norm_attendee, run_attendee, csv_version, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [row + (row[-1], version, now) for row in rows]
+            )
+            # Keep row_index in step with the current CSV
+            conn.executemany(
+                "UPDATE jobs SET row_index = ?, norm_term = ?, norm_category = ?, norm_attendee = ?, "
+                "run_attendee = ?, csv_version = ? WHERE row_key = ?",
+                [(row[1],) + row[5:] + (row[-1], version, row[0]) for row in rows]
+            )
+        return keys
+
+    def plan_runs(self, max_retries=0, shard=None):
+        """
+        Plan the crew runs for the rows of the current CSV that still have to run.
+
+        Rows with the same normalized identity share a run, and so do rows whose
+        attendee type is covered by an "all" row for the same term and category. The
+        plan is kept in temporary tables of this connection, and iter_runs() reads it
+        back in pages.
+
+        Args:
+            max_retries: Extra attempts allowed for failed rows
+            shard: Optional (index, count); only rows whose CSV position % count == index
+
+        Returns:
+            Tuple (rows, runs): rows to run and the crew runs they need
+        """
+        runnable_sql, params = RUNNABLE_SQL, (1 + max_retries,)
+        if shard is not None:
+            runnable_sql, params = runnable_sql + " AND row_index % ? = ?", params + (shard[1], shard[0])
+        with self.store.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET run_attendee = CASE WHEN EXISTS (SELECT 1 FROM jobs AS cover "
+                "WHERE cover.row_index >= 0 AND cover.norm_term = jobs.norm_term AND "
+                "cover.norm_category = jobs.norm_category AND cover.norm_attendee = 'all') "
+                "THEN 'all' ELSE norm_attendee END WHERE row_index >= 0"
+            )
+            conn.execute("DELETE FROM temp.plan")
+            conn.execute("DELETE FROM temp.runs")
+            conn.execute(
+                "INSERT INTO temp.runs (norm_term, norm_category, run_attendee) "
+                f"SELECT norm_term, norm_category, run_attendee FROM jobs WHERE {runnable_sql} "
+                "GROUP BY norm_term, norm_category, run_attendee ORDER BY MIN(row_index)", params
+            )
+            conn.execute(
+                "INSERT INTO temp.plan (row_key, run_id) SELECT jobs.row_key, runs.run_id FROM jobs "
+                "JOIN temp.runs AS runs USING (norm_term, norm_category, run_attendee) "
+                f"WHERE {runnable_sql}", params
+            )
+            rows = conn.execute("SELECT COUNT(*) FROM temp.plan").fetchone()[0]
+            runs = conn.execute("SELECT COUNT(*) FROM temp.runs").fetchone()[0]
+        return rows, runs
+
+    def iter_runs(self, page_size=200):
+        """
+        Iterate the runs planned by plan_runs(), reading page_size runs at a time.
+
+        Yields:
+            Tuples (item, rows): the (search_term, category, attendee_type) to research
+            and the (row_key, search_term, category, attendee_type) rows it serves
+        """
+        last = 0
+        while True:
+            page = self.store.execute(
+                "SELECT plan.run_id, runs.norm_category, runs.run_attendee, jobs.row_key, jobs.search_term, "
+                "jobs.category, jobs.attendee_type FROM temp.plan AS plan "
+                "JOIN temp.runs AS runs USING (run_id) JOIN jobs USING (row_key) "
+                "WHERE plan.run_id > ? AND plan.run_id <= ? ORDER BY plan.run_id, jobs.row_index",
+                (last, last + page_size)
+            )
+            if not page:
+                return
+            current, rows = None, []
+            for run_id, category, attendee_type, *row in page:
+                if run_id != current:
+                    if rows:
+                        yield item, rows
+                    current, rows = run_id, []
+                    item = (clean_term(row[1]), category, attendee_type)
+                rows.append(tuple(row))
+            yield item, rows
+            last += page_size
+
+    def run_for(self, key):
+        """
+        Return the run serving one row, for workers that claim rows one at a time.
+
+        Returns:
+            Tuple (run_key, item): the run's normalized identity and the
+            (search_term, category, attendee_type) to research
+        """
+        term, category, attendee_type = self.store.execute(
+            "SELECT norm_term, norm_category, run_attendee FROM jobs WHERE row_key = ?", (key,)
+        )[0]
+        first = self.store.execute(
+            "SELECT search_term FROM jobs WHERE norm_term = ? AND norm_category = ? AND run_attendee = ? "
+            "AND row_index >= 0 ORDER BY row_index LIMIT 1", (term, category, attendee_type)
+        )
+        return (term, category, attendee_type), (clean_term(first[0][0]), category, attendee_type)
+
+    def claim(self, owner, lease_seconds, max_retries=0, shard=None):
+        """
+        Atomically take the next row to run, across all processes sharing the manifest.
+
+        Claimable rows of the current CSV are pending rows, failed rows with attempts
+        left, and running rows whose lease has expired.
+
+        Args:
+            owner: Worker identity, see worker_id()
+            lease_seconds: How long the row is reserved unless renewed
+            max_retries: Extra attempts allowed for failed rows
+            shard: Optional (index, count) restricting which rows are claimed
+
+        Returns:
+            Tuple (row_key, search_term, category, attendee_type), or None when nothing is left
+        """
+        now = time.time()
+        shard_sql, shard_params = ("", ())
+        if shard is not None:
+            shard_sql, shard_params = " AND row_index % ? = ?", (shard[1], shard[0])
+        with self.store.transaction() as conn:
+            row = conn.execute(
+                "SELECT row_key, search_term, category, attendee_type FROM jobs WHERE row_index >= 0 AND "
+                "(status = 'pending' OR (status = 'failed' AND attempts < ?) "
+                "OR (status = 'running' AND (lease_expires IS NULL OR lease_expires < ?)))"
+                + shard_sql + " ORDER BY row_index LIMIT 1",
+                (1 + max_retries, now) + shard_params
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE row_key = ?",
+                (owner, now + lease_seconds, now, row[0])
+            )
+        return row
+
+    def renew(self, key, owner, lease_seconds):
+        """
+        Extend a lease this worker still holds.
+
+        Returns:
+            False if the lease was lost (expired and claimed by another worker)
+        """
+        now = time.time()
+        with self.store.transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE row_key = ? AND lease_owner = ? AND status = 'running'",
+                (now + lease_seconds, now, key, owner)
+            ).rowcount
+        return updated == 1
+
+    @contextmanager
+    def hold_lease(self, key, owner, lease_seconds):
+        """
+        Keep renewing a lease in the background while the row is being worked on.
+        """
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(lease_seconds / 3):
+                if not self.renew(key, owner, lease_seconds):
+                    print(f"Lost lease on row {key}")
+                    return
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def unfinished(self):
+        """
+        Number of rows of the current CSV still pending or running in any worker.
+        """
+        return self.store.execute(
+            "SELECT COUNT(*) FROM jobs WHERE row_index >= 0 AND status IN ('pending', 'running')"
+        )[0][0]
+
+    def mark_running(self, key, owner=None, lease_seconds=None):
+        """
+        Mark a planned row as running, leased to owner so queue workers sharing the
+        manifest do not claim it (see hold_lease to keep the lease).
+        """
+        now = time.time()
+        self.store.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+            "updated_at = ? WHERE row_key = ?",
+            (owner, now + lease_seconds if lease_seconds else None, now, key)
+        )
+
+    def mark_finished(self, key, result, owner=None):
+        """
+        Record a row's result as done, or failed when research_brella reported an error.
+
+        With owner, the result is only recorded while that worker still holds the lease.
+
+        Returns:
+            "done", "failed", or None if the lease was lost
+        """
+        status = "failed" if is_failed_result(result) else "done"
+        with self.store.transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE row_key = ? AND (? IS NULL OR lease_owner = ?)",
+                (status, json.dumps(result), time.time(), key, owner, owner)
+            ).rowcount
+        return status if updated else None
+
+    def mark_failed(self, key, owner=None):
+        """
+        Record a row whose research raised instead of returning a result.
+        """
+        self.store.execute(
+            "UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE row_key = ? AND (? IS NULL OR lease_owner = ?)",
+            (time.time(), key, owner, owner)
+        )
+
+    def iter_results(self, page_size=500):
+        """
+        Iterate the latest result of every finished row of the current CSV, in CSV
+        order, reading page_size rows at a time.
+        """
+        last = (-1, 0)
+        while True:
+            page = self.store.execute(
+                "SELECT row_index, rowid, result FROM jobs WHERE result IS NOT NULL AND row_index >= 0 "
+                "AND (row_index, rowid) > (?, ?) ORDER BY row_index, rowid LIMIT ?",
+                last + (page_size,)
+            )
+            for row_index, rowid, result in page:
+                yield json.loads(result)
+            if len(page) < page_size:
+                return
+            last = page[-1][:2]
+
+    def counts(self):
+        """
+        Row counts of the current CSV by status.
+        """
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(self.store.execute("SELECT status, COUNT(*) FROM jobs WHERE row_index >= 0 GROUP BY status"))
+        return counts
+
+    def close(self):
+        self.store.close()
@@ -0,0 +1,103 @@
+import json
+import os
+import textwrap
+import threading
+import time
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class JsonlWriter:
+    """
+    Append-only writer that stores one JSON object per line.
+
+    Each row is written with a single write() of a complete line and flushed, so
+    a crash can at most leave a partial last line. How often the file is fsynced
+    to disk is set by the fsync policy.
+    """
+
+    def __init__(self, path, fsync=None, fsync_interval=None, append=False):
+        """
+        Open the output file.
+
+        Args:
+            path: JSONL file to write
+            fsync: "always" (after every row), "interval" (at most every fsync_interval
+                   seconds, and on close) or "never" (leave it to the OS).
+                   If None, will look for BRELLA_JSONL_FSYNC (default "always").
+            fsync_interval: Seconds between fsyncs for the "interval" policy.
+                            If None, will look for BRELLA_JSONL_FSYNC_INTERVAL (default 1.0).
+            append: Keep existing rows instead of starting a new file
+        """
+        self.path = path
+        self.fsync = (fsync or os.getenv("BRELLA_JSONL_FSYNC", "always")).lower()
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{self.fsync}', expected one of {', '.join(FSYNC_POLICIES)}")
+        self.fsync_interval = float(fsync_interval if fsync_interval is not None
+                                    else os.getenv("BRELLA_JSONL_FSYNC_INTERVAL", 1.0))
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._last_sync = time.monotonic()
+        self.rows = 0
+
+    def write(self, row):
+        """
+        Append one row.
+        """
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.rows += 1
+            if self.fsync == "always" or (
+                self.fsync == "interval" and time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            if self.fsync != "never":
+                self._sync()
+            self._file.close()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_json_array(rows, json_path, indent=2):
+    """
+    Write rows as a JSON array.
+
+    rows may be any iterable; it is written one row at a time, so a generator reading
+    from disk keeps memory flat. The array is written to a temporary file, fsynced and
+    moved into place, so json_path always holds either the previous or the complete
+    new array. The layout is the same as json.dump(list(rows), f, indent=indent).
+
+    Returns:
+        Number of rows written
+    """
+    tmp_path = f"{json_path}.{os.getpid()}.tmp"
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(",\n" if count else "[\n")
+            f.write(textwrap.indent(json.dumps(row, indent=indent), " " * indent))
+            count += 1
+        f.write("\n]" if count else "[]")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, json_path)
+    return count
@@ -0,0 +1,180 @@
+import asyncio
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Upstream buckets: (env prefix, default requests per second, default burst, hosts served).
+# A None burst is one second's worth. Sheets allows 60 writes per minute per user, so
+# its bucket refills at 1/s but lets a third of a minute's quota go out at once.
+UPSTREAMS = {
+    "openai": ("BRELLA_RATE_OPENAI", 8.0, None, ("api.openai.com",)),
+    "serper": ("BRELLA_RATE_SERPER", 5.0, None, ("google.serper.dev",)),
+    "brella": ("BRELLA_RATE_BRELLA", 4.0, None, ("brella.io",)),
+    "sheets": ("BRELLA_RATE_SHEETS", 1.0, 20, ("sheets.googleapis.com",)),
+}
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header (delay in seconds or an HTTP date).
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for one upstream, shared by sync and async callers.
+
+    Callers reserve a token under the lock and sleep outside it, so waiting threads
+    are served in arrival order. The rate adapts to the upstream: every 429 halves
+    it and blocks the bucket until Retry-After has passed; callers queued during the
+    block are then released one token at a time, not all at once. Each successful response
+    then raises it by a twentieth of the configured rate, up to that configured rate.
+    """
+
+    def __init__(self, name, rate, burst=None, min_rate=None):
+        """
+        Initialize the bucket.
+
+        Args:
+            name: Upstream name used in stats
+            rate: Requests per second allowed when the upstream is healthy
+            burst: Tokens that can accumulate while idle (default: one second's worth)
+            min_rate: Floor for the adaptive rate (default: rate / 16)
+        """
+        self.name = name
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.burst = float(burst) if burst else max(self.max_rate, 1.0)
+        self.min_rate = float(min_rate) if min_rate else self.max_rate / 16
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._stats = {"requests": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    def _reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            # During a Retry-After block _updated is its end: no tokens accrue until then,
+            # and token debt is paid from there, spacing out the callers queued meanwhile
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            wait = self._updated - now + max(-self._tokens, 0.0) / self.rate
+            self._stats["requests"] += 1
+            self._stats["waited_seconds"] += wait
+            return wait
+
+    def acquire(self):
+        """
+        Block until a request may be sent.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self):
+        """
+        Async version of acquire().
+        """
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_response(self, status_code, retry_after=None):
+        """
+        Adapt the rate to a response from the upstream.
+
+        Args:
+            status_code: HTTP status of the response
+            retry_after: Raw Retry-After header value, if any
+        """
+        with self._lock:
+            if status_code == 429:
+                now = time.monotonic()
+                self._stats["throttled"] += 1
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = min(self._tokens, 0.0)
+                delay = parse_retry_after(retry_after)
+                self._updated = max(self._updated, now + (delay if delay is not None else 1 / self.rate))
+            elif self.rate < self.max_rate and status_code < 500:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["rate"] = round(self.rate, 3)
+            return stats
+
+
+class RateLimiter:
+    """
+    Process-wide registry of token buckets, one per upstream (OpenAI, Serper, brella.io,
+    Google Sheets).
+
+    Each upstream is configured with BRELLA_RATE_<NAME> in requests per second (0
+    disables limiting for it) and BRELLA_RATE_<NAME>_BURST.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self._hosts = []
+        for name, (env, default_rate, default_burst, hosts) in UPSTREAMS.items():
+            rate = float(os.getenv(env, default_rate))
+            if rate <= 0:
+                continue
+            self.buckets[name] = TokenBucket(name, rate, os.getenv(f"{env}_BURST", default_burst))
+            self._hosts.extend((host, name) for host in hosts)
+
+    def bucket(self, name):
+        return self.buckets.get(name)
+
+    def bucket_for_url(self, url):
+        """
+        Return the bucket of the upstream serving url, or None for other hosts.
+        """
+        host = (urlparse(str(url)).hostname or "").lower()
+        for suffix, name in self._hosts:
+            if host == suffix or host.endswith("." + suffix):
+                return self.buckets[name]
+        return None
+
+    def stats(self):
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    Return the process-wide RateLimiter, creating it on first use.
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
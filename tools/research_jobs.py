@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from tools.serper_cache import normalize_query
+
+
+# Jobs that are waiting for a worker or running, and not finished yet
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class ResearchJob:
+    """
+    One research call running in the background, filled in section by section.
+
+    A job is queued until a worker of the pool starts it.
+    """
+
+    def __init__(self, job_id, params):
+        self.id = job_id
+        self.params = params
+        self.status = "queued"
+        self.sections = {}
+        self.result = None
+        self.error = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self.status = "running"
+            self.started_at = time.time()
+
+    def set_section(self, name, value):
+        """
+        Record a parsed Section as soon as its task finishes (called from crew threads).
+        """
+        with self._lock:
+            self.sections[name] = value
+
+    def finish(self, result=None, error=None):
+        with self._lock:
+            if result is not None:
+                self.result = result
+                self.sections.update(result.sections())
+            self.error = error
+            self.status = "failed" if error else "done"
+            self.finished_at = time.time()
+
+    def snapshot(self):
+        """
+        Consistent copy of the job's state for display.
+
+        Returns:
+            Dict with id, params, status (queued, running, done or failed), sections,
+            result, error and elapsed seconds (queued for, or running for once started)
+        """
+        with self._lock:
+            return {
+                "id": self.id,
+                "params": dict(self.params),
+                "status": self.status,
+                "sections": dict(self.sections),
+                "result": self.result,
+                "error": self.error,
+                "elapsed": int((self.finished_at or time.time()) - (self.started_at or self.queued_at))
+            }
+
+
+class ResearchJobs:
+    """
+    Registry of background research jobs shared by all sessions of the Streamlit app.
+
+    Jobs run on a bounded thread pool and are looked up by id, so a rerun or a browser
+    refresh can reattach to a running job. Submitting the same research while it is
+    still queued or running returns that job instead of starting another one; a forced
+    refresh only reattaches to a running refresh, never to a run that may be served
+    from the result cache. Finished jobs are forgotten after a TTL.
+    """
+
+    def __init__(self, runner, max_workers=None, ttl=None):
+        """
+        Initialize the registry.
+
+        Args:
+            runner: research_brella or a callable with the same signature, returning a
+                    ResearchResult and accepting an on_section(name, section) keyword argument
+            max_workers: Jobs running at once.
+                         If None, will look for BRELLA_APP_JOB_WORKERS (default 2).
+            ttl: Seconds a finished job stays available.
+                 If None, will look for BRELLA_APP_JOB_TTL (default 3600).
+        """
+        self.runner = runner
+        self.ttl = float(ttl if ttl is not None else os.getenv("BRELLA_APP_JOB_TTL", 3600))
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(max_workers or os.getenv("BRELLA_APP_JOB_WORKERS", 2)),
+            thread_name_prefix="research-job"
+        )
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def submit(self, search_term, category="all", attendee_type="founders", refresh=False, mode="full"):
+        """
+        Queue a research job, or return the queued or running job for the same research.
+
+        Returns:
+            The ResearchJob
+        """
+        params = {"search_term": search_term, "category": category, "attendee_type": attendee_type,
+                  "refresh": refresh, "mode": mode}
+        key = self._key(params)
+        with self._lock:
+            self._prune()
+            for job in self._jobs.values():
+                if job.status in ACTIVE_STATUSES and self._key(job.params) == key:
+                    return job
+            job = ResearchJob(uuid.uuid4().hex[:12], params)
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        """
+        Return a job by id, or None if it is unknown or expired.
+        """
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def _run(self, job):
+        job.start()
+        try:
+            job.finish(result=self.runner(**job.params, on_section=job.set_section))
+        except Exception as e:
+            print(f"Research job {job.id} failed: {str(e)}")
+            job.finish(error=str(e))
+
+    def _key(self, params):
+        return (normalize_query(params["search_term"]), params["category"], params["attendee_type"], params["mode"],
+                params["refresh"])
+
+    def _prune(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
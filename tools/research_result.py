@@ -0,0 +1,286 @@
+import json
+import re
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import Any, Dict, List
+
+SECTIONS = ("events", "companies", "networking", "founders", "attendees")
+
+NOT_AVAILABLE = "Not available"
+
+# Markdown code fences around JSON in task outputs
+FENCE = re.compile(r"```(?:json)?", re.IGNORECASE)
+
+# Share of an output's non-whitespace characters that may sit outside its JSON for
+# the JSON to be read as the section's records
+JSON_SLACK = 0.1
+
+
+@dataclass(slots=True)
+class EventRecord:
+    name: str = ""
+    date: str = ""
+    location: str = ""
+    description: str = ""
+    url: str = ""
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def label(self):
+        details = ", ".join(value for value in (self.date, self.location) if value)
+        return f"{self.name} ({details})" if details else self.name
+
+
+@dataclass(slots=True)
+class CompanyRecord:
+    name: str = ""
+    description: str = ""
+    industry: str = ""
+    website: str = ""
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def label(self):
+        return f"{self.name} ({self.industry})" if self.industry else self.name
+
+
+@dataclass(slots=True)
+class PersonRecord:
+    name: str = ""
+    company: str = ""
+    role: str = ""
+    business_field: str = ""
+    event: str = ""
+    contact: str = ""
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def label(self):
+        details = ", ".join(value for value in (self.role, self.company) if value)
+        return f"{self.name} ({details})" if details else self.name
+
+
+# Record type of each section; networking is free text
+RECORD_TYPES = {
+    "events": EventRecord,
+    "companies": CompanyRecord,
+    "founders": PersonRecord,
+    "attendees": PersonRecord,
+}
+
+# Keys the agents use for each record field, most common first
+ALIASES = {
+    "name": ("name", "event_name", "company_name", "full_name", "title", "person"),
+    "date": ("date", "dates", "start_date", "when"),
+    "location": ("location", "city", "venue", "place"),
+    "description": ("description", "summary", "about", "details", "profile"),
+    "url": ("url", "link", "event_url", "website"),
+    "industry": ("industry", "business_field", "field", "sector", "category"),
+    "website": ("website", "url", "link", "company_url"),
+    "company": ("company", "company_name", "organization", "startup"),
+    "role": ("role", "title", "position", "job_title"),
+    "business_field": ("business_field", "field", "industry", "sector"),
+    "event": ("event", "event_name", "events", "event_participation"),
+    "contact": ("contact", "contact_information", "email", "linkedin", "profile_url"),
+}
+
+
+@dataclass(slots=True)
+class Section:
+    """
+    One parsed section of a research result.
+
+    status is "found", "not_available" or "error"; errors are only ever set explicitly
+    (see error_result), never guessed from the output. text always holds the task's
+    raw output. When that output is JSON records, they are also kept as typed records.
+    """
+    status: str = "not_available"
+    records: List[Any] = field(default_factory=list)
+    text: str = ""
+
+    @property
+    def found(self):
+        return self.status == "found"
+
+    def summary(self):
+        """Short single-cell text: record labels, the text, or the status"""
+        if self.records:
+            return "; ".join(record.label() for record in self.records)
+        if self.status == "not_available":
+            return NOT_AVAILABLE
+        return self.text
+
+    def to_dict(self):
+        data = {"status": self.status}
+        if self.records:
+            data["records"] = [asdict(record) for record in self.records]
+        if self.text:
+            data["text"] = self.text
+        return data
+
+
+@dataclass(slots=True)
+class ResearchResult:
+    """
+    Result of one research call, parsed once from the crew's task outputs.
+
+    to_dict() gives the JSON form stored in caches, manifests and output files, and
+    from_dict() reads it back (or a result written with raw section strings).
+    """
+    search_term: str
+    category: str = "all"
+    attendee_type: str = "founders"
+    events: Section = field(default_factory=Section)
+    companies: Section = field(default_factory=Section)
+    networking: Section = field(default_factory=Section)
+    founders: Section = field(default_factory=Section)
+    attendees: Section = field(default_factory=Section)
+    mode: str = "full"
+    deduplicated_calls: int = 0
+    timestamp: str = ""
+    cached: bool = False
+    cache_age_seconds: int = 0
+
+    def sections(self):
+        """Sections by name, in display order"""
+        return {name: getattr(self, name) for name in SECTIONS}
+
+    @property
+    def failed(self):
+        """research_brella reports errors in every section instead of raising"""
+        return all(section.status == "error" for section in self.sections().values())
+
+    def for_row(self, search_term, category, attendee_type):
+        """Copy of this result for another CSV row served by the same run"""
+        return replace(self, search_term=search_term, category=category, attendee_type=attendee_type)
+
+    def to_dict(self):
+        data = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            data[f.name] = value.to_dict() if isinstance(value, Section) else value
+        return data
+
+    def to_row(self):
+        """Flat row for spreadsheets: one summary cell per section"""
+        row = {"search_term": self.search_term, "category": self.category, "attendee_type": self.attendee_type}
+        row.update({name: section.summary() for name, section in self.sections().items()})
+        row.update({"mode": self.mode, "timestamp": self.timestamp, "cached": self.cached})
+        return row
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {f.name for f in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known and key not in SECTIONS}
+        raw = [data.get(name) for name in SECTIONS]
+        if len(set(map(str, raw))) == 1 and isinstance(raw[0], str) and raw[0].startswith("Error: "):
+            # Failed result written before sections were typed: the error in every section
+            values.update({name: Section("error", text=raw[0]) for name in SECTIONS})
+        else:
+            values.update({name: load_section(name, value) for name, value in zip(SECTIONS, raw)})
+        return cls(**values)
+
+
+def load_section(name, value):
+    """
+    Read a section back from to_dict() form, or parse it if it is a raw task output.
+    """
+    if isinstance(value, dict) and "status" in value:
+        record_type = RECORD_TYPES.get(name)
+        records = [record_type(**record) for record in value.get("records", [])] if record_type else []
+        return Section(value["status"], records, value.get("text", ""))
+    return parse_section(name, value)
+
+
+def parse_section(name, output):
+    """
+    Parse one task output into a Section.
+
+    Args:
+        name: Section name (events, companies, networking, founders or attendees)
+        output: Raw task output, or JSON data already decoded from it
+
+    Returns:
+        Section with the output as text, plus typed records when the output is (nearly)
+        nothing but JSON records and the section has a record type
+    """
+    if output is None or (isinstance(output, str) and output.strip() in ("", NOT_AVAILABLE)):
+        return Section()
+
+    text = output.strip() if isinstance(output, str) else json.dumps(output)
+    record_type = RECORD_TYPES.get(name)
+    data = _decode_json(text) if isinstance(output, str) else output
+    items = _record_items(name, data) if record_type and data is not None else None
+    if items is None:
+        return Section("found", text=text)
+
+    records = [_to_record(record_type, item) for item in items if item not in (None, "", {}, [])]
+    return Section("found" if records else "not_available", records, text)
+
+
+def _decode_json(text):
+    """
+    JSON object or array making up all of a task output, apart from code fences and
+    a little surrounding prose (see JSON_SLACK); None for anything else.
+    """
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    if end < start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    rest = FENCE.sub("", text[:start] + text[end + 1:])
+    if len("".join(rest.split())) > JSON_SLACK * len("".join(text.split())):
+        return None
+    return data
+
+
+def _record_items(name, data):
+    """
+    Records in decoded JSON: a list, a single-key wrapper such as {"events": [...]}, or
+    one flat object. Objects mixing record lists with other keys are not split up, so
+    nothing in them is dropped; those sections keep only their text.
+    """
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return None
+    if len(data) == 1 and isinstance(next(iter(data.values())), list):
+        return next(iter(data.values()))
+    if any(isinstance(value, list) and value and isinstance(value[0], dict) for value in data.values()):
+        return None
+    return [data]
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return str(value).strip()
+
+
+def _to_record(record_type, item):
+    if not isinstance(item, dict):
+        return record_type(name=_text(item))
+    lowered = {str(key).strip().lower().replace(" ", "_"): key for key in item}
+    values, used = {}, set()
+    for f in fields(record_type):
+        if f.name == "extra":
+            continue
+        for alias in ALIASES.get(f.name, (f.name,)):
+            if alias in lowered and lowered[alias] not in used:
+                values[f.name] = _text(item[lowered[alias]])
+                used.add(lowered[alias])
+                break
+    values["extra"] = {key: value for key, value in item.items() if key not in used}
+    return record_type(**values)
+
+
+def error_result(search_term, category, attendee_type, mode, message, timestamp):
+    """Result reporting the same error in every section"""
+    sections = {name: Section("error", text=f"Error: {message}") for name in SECTIONS}
+    return ResearchResult(search_term, category, attendee_type, mode=mode, timestamp=timestamp, **sections)
@@ -0,0 +1,216 @@
+import os
+import threading
+import time
+from tools.cache_store import SqliteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    encoding TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class CachedResponse:
+    """
+    Minimal response object returned by cached page fetches.
+    """
+
+    __slots__ = ("url", "status_code", "content", "encoding", "headers", "from_cache")
+
+    def __init__(self, url, status_code, content, encoding=None, headers=None, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache for page fetches, keyed on the URL.
+
+    Entries younger than the TTL are served without any network I/O. Older entries
+    that carry an ETag or Last-Modified validator are revalidated with a conditional
+    GET; older entries without validators are treated as misses. The total body size
+    is capped and the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path=None, ttl=None, max_bytes=None):
+        """
+        Initialize the response cache.
+
+        Args:
+            path: SQLite file. If None, will use responses.sqlite in BRELLA_CACHE_DIR.
+            ttl: Seconds an entry is served without revalidation.
+                 If None, will look for BRELLA_HTTP_CACHE_TTL (default 3600).
+            max_bytes: Maximum total size of cached bodies.
+                       If None, will look for BRELLA_HTTP_CACHE_MAX_MB (default 200 MB).
+        """
+        self.ttl = float(ttl if ttl is not None else os.getenv("BRELLA_HTTP_CACHE_TTL", 3600))
+        self.max_bytes = int(max_bytes if max_bytes is not None
+                             else float(os.getenv("BRELLA_HTTP_CACHE_MAX_MB", 200)) * 1024 * 1024)
+        self.store = SqliteStore(path or "responses.sqlite", SCHEMA)
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+
+    def lookup(self, url):
+        """
+        Look up a URL.
+
+        Returns:
+            Tuple of (CachedResponse or None, is_fresh)
+        """
+        rows = self.store.execute(
+            "SELECT status, body, encoding, etag, last_modified, stored_at FROM responses WHERE url = ?",
+            (url,)
+        )
+        if not rows:
+            return None, False
+
+        status, body, encoding, etag, last_modified, stored_at = rows[0]
+        headers = {}
+        if etag:
+            headers["ETag"] = etag
+        if last_modified:
+            headers["Last-Modified"] = last_modified
+        entry = CachedResponse(url, status, bytes(body), encoding, headers, from_cache=True)
+        return entry, time.time() - stored_at < self.ttl
+
+    def conditional_headers(self, entry):
+        """
+        Return If-None-Match / If-Modified-Since headers for revalidating an entry.
+        """
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.headers.get("ETag"):
+            headers["If-None-Match"] = entry.headers["ETag"]
+        if entry.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        return headers
+
+    def resolve(self, url, entry, status_code, content, encoding, headers, cacheable=True):
+        """
+        Fold a network response for url into the cache.
+
+        Args:
+            url: Requested URL
+            entry: Stale entry that was revalidated, or None
+            status_code, content, encoding, headers: The network response
+            cacheable: False to return the response without storing it (e.g. a capped body)
+
+        Returns:
+            CachedResponse to hand back to the caller
+        """
+        if status_code == 304 and entry is not None:
+            self.mark_revalidated(url)
+            return entry
+
+        self.record_miss()
+        if cacheable and status_code == 200 and "no-store" not in headers.get("Cache-Control", "").lower():
+            self.store_response(url, status_code, content, encoding, headers)
+        return CachedResponse(url, status_code, content, encoding, dict(headers))
+
+    def store_response(self, url, status_code, content, encoding, headers):
+        """
+        Store a successful response and evict least recently used entries over the size limit.
+        """
+        now = time.time()
+        self.store.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(url, status, body, encoding, etag, last_modified, stored_at, accessed_at, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, status_code, content, encoding, headers.get("ETag"), headers.get("Last-Modified"),
+             now, now, len(content))
+        )
+        self._count("stored")
+        self._evict()
+
+    def mark_revalidated(self, url):
+        """
+        Restart the TTL of an entry after the server answered 304 Not Modified.
+        """
+        now = time.time()
+        self.store.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+        self._count("revalidated")
+
+    def record_hit(self, url):
+        self.store.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        self._count("hits")
+
+    def record_miss(self):
+        self._count("misses")
+
+    def prune(self):
+        """
+        Drop expired entries that cannot be revalidated, then enforce the size limit.
+        """
+        cutoff = time.time() - self.ttl
+        self.store.execute(
+            "DELETE FROM responses WHERE stored_at < ? AND etag IS NULL AND last_modified IS NULL",
+            (cutoff,)
+        )
+        self._evict()
+
+    def _evict(self):
+        with self.store.transaction() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for url, size in conn.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC"):
+                if total <= self.max_bytes:
+                    break
+                evicted.append((url,))
+                total -= size
+            conn.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        self._count("evicted", len(evicted))
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def stats(self):
+        """
+        Return hit/miss counters for this process plus the current cache size.
+        """
+        entries, size = self.store.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses")[0]
+        with self._lock:
+            stats = dict(self._stats)
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Return the process-wide ResponseCache, or None when BRELLA_HTTP_CACHE=0.
+    """
+    global _cache
+    if os.getenv("BRELLA_HTTP_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+                _cache.prune()
+    return _cache
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+from tools.cache_store import SqliteStore
+from tools.serper_cache import normalize_query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_results (
+    search_term TEXT NOT NULL,
+    category TEXT NOT NULL,
+    attendee_type TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    result TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (search_term, category, attendee_type, mode)
+);
+"""
+
+
+class ResultCache:
+    """
+    Persistent store of research_brella results keyed on (search term, category, attendee type, mode).
+
+    Lets the CLI and the Streamlit app reuse a crew run for the same research within the TTL.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        """
+        Initialize the result cache.
+
+        Args:
+            path: SQLite file. If None, will use results.sqlite in BRELLA_CACHE_DIR.
+            ttl: Seconds a result is reused.
+                 If None, will look for BRELLA_RESULT_CACHE_TTL (default 86400).
+        """
+        self.ttl = float(ttl if ttl is not None else os.getenv("BRELLA_RESULT_CACHE_TTL", 86400))
+        self.store = SqliteStore(path or "results.sqlite", SCHEMA)
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, search_term, category, attendee_type, mode="full"):
+        """
+        Return a cached result younger than the TTL.
+
+        Returns:
+            Tuple of (result dict, age in seconds), or (None, None) on a miss
+        """
+        rows = self.store.execute(
+            "SELECT result, stored_at FROM research_results "
+            "WHERE search_term = ? AND category = ? AND attendee_type = ? AND mode = ?",
+            self._key(search_term, category, attendee_type, mode)
+        )
+        age = time.time() - rows[0][1] if rows else None
+        if age is None or age >= self.ttl:
+            self._count("misses")
+            return None, None
+
+        self._count("hits")
+        return json.loads(rows[0][0]), age
+
+    def put(self, search_term, category, attendee_type, result, mode="full"):
+        """
+        Store a result, replacing any earlier one for the same research.
+        """
+        self.store.execute(
+            "INSERT OR REPLACE INTO research_results "
+            "(search_term, category, attendee_type, mode, result, stored_at) VALUES (?, ?, ?, ?, ?, ?)",
+            self._key(search_term, category, attendee_type, mode) + (json.dumps(result), time.time())
+        )
+
+    def prune(self):
+        """
+        Drop results older than the TTL.
+        """
+        self.store.execute("DELETE FROM research_results WHERE stored_at < ?", (time.time() - self.ttl,))
+
+    def _key(self, search_term, category, attendee_type, mode):
+        return (normalize_query(search_term), (category or "all").lower(),
+                (attendee_type or "founders").lower(), mode or "full")
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        entries = self.store.execute("SELECT COUNT(*) FROM research_results")[0][0]
+        with self._lock:
+            stats = dict(self._stats)
+        stats["entries"] = entries
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """
+    Return the process-wide ResultCache, or None when BRELLA_RESULT_CACHE=0.
+    """
+    global _cache
+    if os.getenv("BRELLA_RESULT_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+                _cache.prune()
+    return _cache
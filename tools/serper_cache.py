@@ -0,0 +1,123 @@
+import json
+import os
+import re
+import threading
+import time
+from tools.cache_store import SqliteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS serper_queries (
+    query TEXT NOT NULL,
+    category TEXT NOT NULL,
+    response TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (query, category)
+);
+CREATE INDEX IF NOT EXISTS serper_queries_accessed_at ON serper_queries (accessed_at);
+"""
+
+CATEGORY_SUFFIX = re.compile(r"\(\s*category\s*:[^)]*\)", re.IGNORECASE)
+
+
+def normalize_query(search_term):
+    """
+    Normalize a search term for cache keys.
+
+    Drops the "(category: ...)" suffix that research_brella appends, case-folds and
+    collapses whitespace, so "Mashup  2025 (category: people)" and "mashup 2025" match.
+    """
+    search_term = CATEGORY_SUFFIX.sub(" ", search_term or "")
+    return " ".join(search_term.casefold().split())
+
+
+class SerperCache:
+    """
+    Persistent cache of Serper search responses keyed on (normalized query, category).
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        """
+        Initialize the Serper cache.
+
+        Args:
+            path: SQLite file. If None, will use serper.sqlite in BRELLA_CACHE_DIR.
+            ttl: Seconds a response stays valid.
+                 If None, will look for BRELLA_SERPER_CACHE_TTL (default 86400).
+            max_entries: Maximum number of cached queries; least recently used are dropped first.
+                         If None, will look for BRELLA_SERPER_CACHE_MAX_ENTRIES (default 5000).
+        """
+        self.ttl = float(ttl if ttl is not None else os.getenv("BRELLA_SERPER_CACHE_TTL", 86400))
+        self.max_entries = int(max_entries if max_entries is not None
+                               else os.getenv("BRELLA_SERPER_CACHE_MAX_ENTRIES", 5000))
+        self.store = SqliteStore(path or "serper.sqlite", SCHEMA)
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, search_term, category):
+        """
+        Return the cached Serper response for a query, or None.
+        """
+        key = (normalize_query(search_term), category)
+        now = time.time()
+        rows = self.store.execute(
+            "SELECT response, stored_at FROM serper_queries WHERE query = ? AND category = ?", key
+        )
+        if not rows or now - rows[0][1] >= self.ttl:
+            if rows:
+                self.store.execute("DELETE FROM serper_queries WHERE query = ? AND category = ?", key)
+            self._count("misses")
+            return None
+
+        self.store.execute(
+            "UPDATE serper_queries SET accessed_at = ? WHERE query = ? AND category = ?", (now,) + key
+        )
+        self._count("hits")
+        return json.loads(rows[0][0])
+
+    def put(self, search_term, category, data):
+        """
+        Store a Serper response, dropping the least recently used queries over the entry limit.
+        """
+        now = time.time()
+        with self.store.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO serper_queries (query, category, response, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(search_term), category, json.dumps(data), now, now)
+            )
+            conn.execute(
+                "DELETE FROM serper_queries WHERE rowid IN ("
+                "SELECT rowid FROM serper_queries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        entries = self.store.execute("SELECT COUNT(*) FROM serper_queries")[0][0]
+        with self._lock:
+            stats = dict(self._stats)
+        stats["entries"] = entries
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_serper_cache():
+    """
+    Return the process-wide SerperCache, or None when BRELLA_SERPER_CACHE=0.
+    """
+    global _cache
+    if os.getenv("BRELLA_SERPER_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SerperCache()
+    return _cache
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from tools.cache_store import get_cache_dir
+from tools.http_client import get_http_client
+
+try:
+    import fcntl
+except ImportError:  # Windows: logins are still serialized within the process
+    fcntl = None
+
+
+class SessionExpired(Exception):
+    """Raised when the portal answers a request with an authentication failure."""
+
+
+class _Account:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.session = None
+        self.saved_at = None
+        self.stale_saved_at = 0.0
+
+
+class SessionStore:
+    """
+    Authenticated portal sessions shared across threads, processes and runs.
+
+    Cookies are kept on disk in a file only the current user can read. A login
+    happens only when no valid cookies exist, under a per-account lock (a thread
+    lock plus a file lock across processes), so one account is never logged in
+    twice in parallel.
+    """
+
+    def __init__(self, directory=None):
+        """
+        Initialize the session store.
+
+        Args:
+            directory: Where cookie files are kept. If None, uses sessions/ in BRELLA_CACHE_DIR.
+        """
+        self.directory = directory or os.path.join(get_cache_dir(), "sessions")
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self._accounts = {}
+        self._accounts_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"logins": 0, "restored": 0, "reused": 0, "expired": 0}
+
+    def get_session(self, email, login):
+        """
+        Return an authenticated requests session for an account.
+
+        Args:
+            email: Account identifier
+            login: Callable taking a fresh session and returning True once logged in
+
+        Returns:
+            Tuple of (session or None if login failed, version token for invalidate())
+        """
+        account = self._account(email)
+        with account.lock:
+            if account.session is None:
+                with self._file_lock(email):
+                    stored = self._load(email)
+                    if stored and stored["saved_at"] > account.stale_saved_at:
+                        self._count("restored")
+                        account.session = self._session_from(stored["cookies"])
+                        account.saved_at = stored["saved_at"]
+                    else:
+                        session = get_http_client().new_session()
+                        self._count("logins")
+                        if not login(session):
+                            return None, None
+                        account.session = session
+                        account.saved_at = time.time()
+                        self._save(email, session, account.saved_at)
+            else:
+                self._count("reused")
+            return account.session, account.saved_at
+
+    def invalidate(self, email, version):
+        """
+        Drop a session after an auth failure so the next get_session() logs in again.
+
+        Sessions newer than version (already renewed by another thread) are kept.
+        """
+        account = self._account(email)
+        with account.lock:
+            if account.saved_at == version:
+                self._count("expired")
+                account.session = None
+                account.stale_saved_at = max(account.stale_saved_at, version or 0.0)
+
+    def update_cookies(self, email, version, cookies):
+        """
+        Merge cookies refreshed outside the stored session (e.g. by an async crawl) and save them.
+
+        Ignored if the session was invalidated or renewed since version was handed out.
+        """
+        account = self._account(email)
+        with account.lock:
+            if account.session is None or account.saved_at != version:
+                return
+            for cookie in cookies:
+                account.session.cookies.set_cookie(cookie)
+            with self._file_lock(email):
+                self._save(email, account.session, account.saved_at)
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _account(self, email):
+        with self._accounts_lock:
+            return self._accounts.setdefault(email, _Account())
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _path(self, email):
+        digest = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.directory, digest)
+
+    @contextmanager
+    def _file_lock(self, email):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self._path(email) + ".lock", os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _load(self, email):
+        try:
+            with open(self._path(email) + ".json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, email, session, saved_at):
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure
+            }
+            for cookie in session.cookies
+        ]
+        path = self._path(email) + ".json"
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": saved_at, "cookies": cookies}, f)
+        os.replace(tmp_path, path)
+
+    def _session_from(self, cookies):
+        session = get_http_client().new_session()
+        for cookie in cookies:
+            session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie["domain"], path=cookie["path"],
+                expires=cookie["expires"], secure=cookie["secure"]
+            )
+        return session
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """
+    Return the process-wide SessionStore, creating it on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+    return _store
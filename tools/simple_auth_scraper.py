@@ -1,8 +1,8 @@
-import requests
 import json
 from bs4 import BeautifulSoup
 import os
 from dotenv import load_dotenv
+from tools.http_client import get_http_client
 
 load_dotenv()
 
@@ -11,7 +11,8 @@ def scrape_brella_authenticated(query: str) -> str:
     Simple authenticated scraper for Brella portal
     """
     try:
-        session = requests.Session()
+        http = get_http_client()
+        session = http.new_session()
         base_url = "https://next.brella.io"
         
         # Get credentials
@@ -28,12 +29,12 @@ def scrape_brella_authenticated(query: str) -> str:
             'password': password
         }
         
-        response = session.post(login_url, data=login_data)
+        response = http.post(login_url, session=session, data=login_data)
         
         if response.status_code == 200:
             # Try to access events
             events_url = f"{base_url}/dashboard"
-            events_response = session.get(events_url)
+            events_response = http.get(events_url, session=session)
             
             if events_response.status_code == 200:
                 soup = BeautifulSoup(events_response.content, 'html.parser')